@@ -1,29 +1,59 @@
+import argparse  # opções de linha de comando (modo em lote)
 # Importa o módulo random para gerar números aleatórios
 import random  # gera números para agencia/conta
 
-# Lista global que armazenará todas as contas (dados salvos em sequência)
-contalista = []  # formato: [agencia, numero_conta, titular, agencia2, ...] (listas planas)
-
-# Lista global que armazenará todos os usuários (dados salvos em sequência)
-usuarios = []  # formato: [nome, cpf, dta, endereco, nome2, cpf2, ...]
-
-# Lista global que armazenará todos os CPFs cadastrados
-cpfcliente = []  # formato: ['12345678900', '98765432100', ...]
+from banco.alocador_contas import AlocadorContas  # números de conta únicos sem sorteio/colisão
+from banco.dinheiro import formatar, para_centavos  # dinheiro em centavos inteiros
+from banco.eventos import DestinoConsole, DestinoNulo, emitir, eventos  # mensagens das operações como eventos
+from banco.extrato_conta import DEPOSITO, SAQUE, Extrato  # extrato com lançamentos em colunas
+from banco.importador_clientes import (  # importação em massa de clientes (CSV em streaming)
+    MOTIVO_CONTA_EXISTENTE,
+    MOTIVO_CONTA_INVALIDA,
+    importar_clientes,
+)
+from banco.limitador_saques import JANELA_DIARIA, LimitadorSaques  # limite de saques por janela de tempo
+from banco.metricas import (  # motivos de recusa padronizados (campo 'motivo' dos eventos)
+    MOTIVO_ACIMA_LIMITE,
+    MOTIVO_LIMITE_SAQUES,
+    MOTIVO_SALDO_INSUFICIENTE,
+    MOTIVO_VALOR_INVALIDO,
+)
+from banco.lote_transacoes import ler_transacoes, processar_transacoes  # modo em lote (sem menu)
+from banco.registro_clientes import RegistroClientes, Usuario  # registro de clientes indexado por CPF
+from banco.tabela_contas import TabelaContas  # tabela colunar de contas
+
+# Tabela global que armazenará todas as contas (colunas de agência, número e titular)
+contalista = TabelaContas()  # formato: linhas (agencia, numero_conta, titular) indexadas por (agencia, numero_conta)
+
+# Alocador dos números de conta (sequência embaralhada por agência; marca d'água salva em arquivo)
+alocador_contas = AlocadorContas("alocador_contas.json", digitos=4)
+
+# Registro global de usuários indexado por CPF (busca em tempo constante)
+usuarios = RegistroClientes()  # formato: {'12345678900': Usuario(nome, cpf, dta, endereco), ...}
 
 # Saldo do cliente (variável global única neste script)
-saldo = 0.0  # float para operações financeiras
+saldo = 0  # em centavos inteiros (contas exatas, sem arredondamento de float)
 
 # Limite individual por saque
-limite = 500  # valor máximo por saque permitido
+limite = para_centavos(500)  # valor máximo por saque permitido (R$ 500,00 em centavos)
+
+# Extrato da conta (lançamentos acrescentados em O(1), texto montado só ao exibir)
+extrato = Extrato()  # armazena as movimentações
 
-# Histórico simples de extrato (string acumulada)
-extrato = ''  # armazena linhas de movimentação
+# Quantidade de lançamentos exibidos na confirmação de depósito e por página do extrato
+LANCAMENTOS_CONFIRMACAO = 5
+LANCAMENTOS_POR_PAGINA = 20
 
-# Contador de saques realizados (para controlar número máximo por período)
+# Contador de saques realizados (total; o limite por período fica no limitador abaixo)
 numero_saques = 0  # começa em zero
 
-# Limite máximo de saques permitidos (por exemplo, por dia)
-LIMITE_SAQUES = 3  # máximo de saques permitidos
+# Limite máximo de saques permitidos por janela de tempo (por exemplo, por dia)
+LIMITE_SAQUES = 3  # máximo de saques permitidos na janela
+JANELA_SAQUES = JANELA_DIARIA  # segundos; a permissão volta aos poucos (1 saque a cada janela/limite)
+
+# Limitador de saques por janela (tabela compartilhada; este script tem uma conta só)
+limitador_saques = LimitadorSaques()
+posicao_saques = limitador_saques.nova_conta()
 
 # Opção escolhida no menu (string)
 opcao = ""  # inicializada vazia; atualizada pela função menu()
@@ -56,21 +86,26 @@ def depositor(valor):
     global saldo  # modifica a variável global 'saldo'
     global extrato  # modifica a variável global 'extrato'
     try:
-        valor = float(valor)  # tenta converter a entrada para float (pode lançar ValueError)
+        valor = para_centavos(valor)  # converte a entrada para centavos (pode lançar ValueError)
     except (ValueError, TypeError):
         # caso a conversão falhe, informa usuário e retorna sem alterar nada
-        print("Valor inválido! Digite um número.")
+        emitir("valor_invalido", "Valor inválido! Digite um número.", valor=valor)
         return
 
     if valor > 0:
         saldo += valor  # soma o depósito ao saldo global
-        extrato += f"Depósito de {valor:.2f} RS\n"  # registra no extrato com formatação 2 casas decimais
-        print(f"Saldo Atualizado! Valor {saldo:.2f}")  # mostra o saldo atualizado
-        print(extrato)  # imprime o extrato atual
+        extrato.adicionar(DEPOSITO, valor)  # registra no extrato (O(1), sem copiar o extrato)
+        # saldo atualizado e últimos lançamentos (o texto só é montado se houver quem o exiba)
+        emitir("deposito", mensagem_deposito, valor=valor, saldo=saldo)
         return saldo, extrato  # retorna valores atualizados opcionalmente
     else:
         # valor não positivo é inválido para depósito
-        print("Valor inválido para depósito.")
+        emitir("deposito_recusado", "Valor inválido para depósito.", valor=valor, motivo=MOTIVO_VALOR_INVALIDO)
+
+
+# Mensagem do depósito aceito (montada só quando algum destino exibe o evento)
+def mensagem_deposito(dados):
+    return f"Saldo Atualizado! Valor {formatar(dados['saldo'])}\n{extrato.ultimos(LANCAMENTOS_CONFIRMACAO)}"
 
 
 # Função para realizar saque
@@ -80,46 +115,60 @@ def sacar(valor):
     global numero_saques  # necessário para incrementar o contador de saques sem erro
 
     try:
-        valor = float(valor)  # tenta converter o valor informado para float
+        valor = para_centavos(valor)  # converte o valor informado para centavos
     except (ValueError, TypeError):
         # se falhar, informa e retorna sem alterações
-        print("Valor inválido! Digite um número.")
+        emitir("valor_invalido", "Valor inválido! Digite um número.", valor=valor)
         return
 
     excedeu_saldo = valor > saldo  # verifica se o valor é maior que o saldo disponível
-    excedeu_limite = numero_saques >= LIMITE_SAQUES  # verifica se já atingiu o limite de saques
+    # verifica se já atingiu o limite de saques da janela (O(1), a janela expira sozinha)
+    excedeu_limite = not limitador_saques.permitido(posicao_saques, LIMITE_SAQUES, JANELA_SAQUES)
     excedeu_valor_saque = valor > limite  # verifica se o valor excede o limite por saque
 
     if excedeu_limite:
         # caso tenha atingido limite de saques, bloqueia operação
-        print("OPERAÇAO FALHOU. LIMITE DE SAQUES ATINGIDO.")
+        espera = limitador_saques.proximo_em(posicao_saques, LIMITE_SAQUES, JANELA_SAQUES)
+        emitir("saque_recusado", "OPERAÇAO FALHOU. LIMITE DE SAQUES ATINGIDO.\n"
+               "Próximo saque liberado em {minutos:.0f} minuto(s).",
+               valor=valor, motivo=MOTIVO_LIMITE_SAQUES, minutos=espera / 60)
     elif excedeu_saldo:
         # caso saldo insuficiente
-        print("OPERAÇAO FALHOU. SALDO INSUFICIENTE.")
+        emitir("saque_recusado", "OPERAÇAO FALHOU. SALDO INSUFICIENTE.", valor=valor, motivo=MOTIVO_SALDO_INSUFICIENTE)
     elif excedeu_valor_saque:
         # caso valor maior que limite por saque
-        print("OPERAÇAO FALHOU. VALOR ACIMA DO LIMITE.")
+        emitir("saque_recusado", "OPERAÇAO FALHOU. VALOR ACIMA DO LIMITE.", valor=valor, motivo=MOTIVO_ACIMA_LIMITE)
     else:
         if valor > 0:
             saldo -= valor  # subtrai o valor do saldo
             numero_saques += 1  # incrementa o contador de saques (por isso precisa do global)
-            extrato += f"Saque de {valor:.2f} RS\n"  # registra no extrato
-            print(f"SAQUE REALIZADO COM SUCESSO NO VALOR DE {valor:.2f}")  # confirma saque
-            print(f"Saldo atual: {saldo:.2f}")  # mostra saldo atualizado
+            limitador_saques.consumir(posicao_saques, LIMITE_SAQUES, JANELA_SAQUES)  # ocupa um saque da janela
+            extrato.adicionar(SAQUE, valor)  # registra no extrato
+            # confirma o saque e mostra o saldo atualizado
+            emitir("saque", "SAQUE REALIZADO COM SUCESSO NO VALOR DE {valor:R}\nSaldo atual: {saldo:R}",
+                   valor=valor, saldo=saldo)
             return saldo, extrato  # retorna os valores atualizados
         else:
             # proteção contra valores não positivos
-            print("Valor inválido para saque.")
+            emitir("saque_recusado", "Valor inválido para saque.", valor=valor, motivo=MOTIVO_VALOR_INVALIDO)
 
 
-# Função que mostra o extrato atual e o saldo
-def mostrar_extrato():
+# Função que mostra uma página do extrato (por padrão a mais recente) e o saldo
+def mostrar_extrato(pagina=None):
     global extrato, saldo  # usa as variáveis globais 'extrato' e 'saldo'
     print("-----------------------")  # separador visual
     print("EXTRATO DO USUARIO:")  # título do extrato
-    # imprime o extrato se existir; caso contrário, avisa que não há movimentações
-    print(extrato if extrato else "Nenhuma movimentação registrada.")
-    print(f"SALDO ATUAL: {saldo:.2f} RS")  # exibe saldo formatado
+    if extrato:
+        total_paginas = extrato.total_paginas(LANCAMENTOS_POR_PAGINA)
+        if pagina is None or not 1 <= pagina <= total_paginas:
+            pagina = total_paginas  # página inexistente ou não informada: mostra a mais recente
+        # monta o texto apenas dos lançamentos da página pedida
+        print(extrato.pagina(pagina, LANCAMENTOS_POR_PAGINA), end="")
+        print(f"Página {pagina} de {total_paginas}")
+    else:
+        # caso não existam lançamentos, avisa que não há movimentações
+        print("Nenhuma movimentação registrada.")
+    print(f"SALDO ATUAL: {formatar(saldo)} RS")  # exibe saldo formatado
     print("-----------------------")  # separador final
 
 
@@ -130,70 +179,53 @@ def sair():
     print("VOLTE SEMPRE")  # mensagem final amistosa
 
 
-# Função para criar uma nova conta associada a um usuário (listas planas)
+# Função para criar uma nova conta associada a um usuário (tabela de contas)
 def criarconta(usuario):
     # 'usuario' é o nome do titular da conta (string esperada)
-    global contalista  # indica que vamos modificar a lista global de contas
-
-    numero_conta = "0"  # inicia número da conta com '0' (pode ser adaptado)
-    agencia = "1"  # inicia agência com '1' (pode ser adaptado)
+    global contalista  # indica que vamos modificar a tabela global de contas
 
-    # Gera 4 dígitos para agência e 4 para número da conta concatenando dígitos aleatórios
-    for a in range(0, 4):
-        numeros = random.randint(0, 9)  # gera um dígito aleatório de 0 a 9
-        agencia += str(numeros)  # concatena ao código da agência
+    # Sorteia a agência no formato '1XXXX' (4 dígitos aleatórios)
+    agencia = 10000 + random.randint(0, 9999)  # '1' seguido de 4 dígitos
+    # O número da conta ('0XXXX') vem do alocador: único na agência por construção, sem novas tentativas
+    # (as contas importadas com número escolhido já estão reservadas nele)
+    numero_conta = alocador_contas.alocar(agencia)
 
-        numeros2 = random.randint(0, 9)  # gera outro dígito para a conta
-        numero_conta += str(numeros2)  # concatena ao número da conta
-
-    # Armazena os dados da conta em sequência na lista plana contalista
-    contalista.append(agencia)  # acrescenta agência
-    contalista.append(numero_conta)  # acrescenta número da conta
-    contalista.append(usuario)  # acrescenta nome do titular da conta
+    # Armazena a conta como uma linha da tabela (agência, número e titular em colunas)
+    contalista.adicionar(agencia, numero_conta, usuario)
 
     # Confirmação ao usuário que a conta foi criada
-    print("Conta criada com sucesso!")
-    print(f"Agência: {agencia} | Conta: {numero_conta} | Titular: {usuario}")
+    agencia, numero_conta = contalista.formatar(agencia, numero_conta)  # texto com zeros à esquerda
+    emitir("conta_criada", "Conta criada com sucesso!\nAgência: {agencia} | Conta: {numero} | Titular: {titular}",
+           agencia=agencia, numero=numero_conta, titular=usuario)
+    return agencia, numero_conta
 
 
-# Função para criar um novo usuário (listas planas)
+# Função para criar um novo usuário (registro indexado por CPF)
 def criarusuario(nome='', cpf='', dta='', endereco=''):
-    global usuarios  # modificaremos a lista global 'usuarios'
-    global cpfcliente  # modificaremos a lista global 'cpfcliente' com o CPF novo
+    global usuarios  # modificaremos o registro global 'usuarios'
 
     # Mantém CPF como string para preservar zeros à esquerda e qualquer formatação que o usuário possa fornecer
-    if cpf in cpfcliente:
-        # se CPF já estiver cadastrado, informa e sai sem duplicar
-        print("USUÁRIO JÁ CADASTRADO!")
-        return
-
-    # Converte valores para string e prepara para inserir na lista plana 'usuarios'
-    nome_usuario = str(nome)  # converge nome para string
-    cpf_usuario = str(cpf)  # garante CPF como string
-    dta_usuario = str(dta)  # data como string
-    endereco_usuario = str(endereco)  # endereco como string
-
-    # Adiciona as informações do usuário na lista 'usuarios' em sequência (listas planas)
-    usuarios.append(nome_usuario)  # adiciona nome
-    usuarios.append(cpf_usuario)  # adiciona cpf
-    usuarios.append(dta_usuario)  # adiciona data de nascimento
-    usuarios.append(endereco_usuario)  # adiciona endereço
+    # Monta o registro estruturado (o construtor já converte todos os campos para string)
+    usuario = Usuario(nome, cpf, dta, endereco)
 
-    # Adiciona o CPF na lista de CPFs cadastrados para controle de duplicatas
-    cpfcliente.append(cpf_usuario)
+    # Insere no registro; a checagem de duplicata é uma consulta O(1) no dicionário
+    if not usuarios.inserir(usuario):
+        # se CPF já estiver cadastrado, informa e sai sem duplicar
+        emitir("usuario_duplicado", "USUÁRIO JÁ CADASTRADO!", cpf=usuario.cpf)
+        return False
 
-    # Confirmação visual para o usuário (mostra a lista completa de usuários)
-    print("Usuário cadastrado com sucesso!")
-    print(usuarios)
+    # Confirmação visual para o usuário (só o novo registro: imprimir o registro inteiro custaria O(n) por cadastro)
+    emitir("usuario_cadastrado", "Usuário cadastrado com sucesso!\n{usuario!r}", cpf=usuario.cpf, usuario=usuario)
+    return True
 
 
 # Função que verifica se o CPF já existe e, se não existir, cadastra novo usuário
 def filtrarusuario(numero):
-    global cpfcliente  # vamos consultar/modificar a lista de cpfs
+    global usuarios  # vamos consultar o registro de usuários
 
     numero = str(numero)  # converte a entrada para string para comparação consistente
 
-    if numero in cpfcliente:
+    if numero in usuarios:  # consulta O(1) pelo CPF
         # se já cadastrado, informa que o usuário existe
         print("VOCÊ JÁ ESTÁ CADASTRADO COMO USUÁRIO...")
     else:
@@ -215,17 +247,6 @@ def filtrarusuario(numero):
             print("ERRO AO CRIAR USUÁRIO:", erro)
 
 
-# === Observação: a chamada abaixo é um teste inicial que aparece antes do menu interativo ===
-# Se não quiser que o script peça dados ao iniciar, remova/comment essa linha.
-filtrarusuario("230")  # executa o filtro para o CPF "230" (vai pedir dados porque cpfcliente está vazio)
-
-# Exibe o estado atual das listas após o teste de cadastro inicial (debug)
-print("\n=== DADOS FINAIS ===")  # cabeçalho para saída de depuração
-print("CPFs:", cpfcliente)  # imprime todos os CPFs cadastrados
-print("Usuários:", usuarios)  # imprime a lista plana de usuários
-print("Contas:", contalista)  # imprime a lista plana de contas
-
-
 # Função principal de interação com o menu; mantém o loop até o usuário sair
 def interacao():
     while True:  # loop infinito que só quebra quando a opção 'q' é escolhida
@@ -240,7 +261,11 @@ def interacao():
             sacar(valor)  # chama função de saque
 
         elif opcao == 'e':  # opção extrato
-            mostrar_extrato()  # exibe o extrato atual
+            try:
+                pagina = int(input("PÁGINA DO EXTRATO (vazio = mais recente): "))
+            except ValueError:
+                pagina = None  # entrada vazia ou inválida: página mais recente
+            mostrar_extrato(pagina)  # exibe a página do extrato
 
         elif opcao == 'q':  # opção sair
             sair()  # exibe mensagem de saída
@@ -263,5 +288,85 @@ def interacao():
             print("OPÇÃO INVÁLIDA!")
 
 
-# Execução principal: inicia a interação com o usuário
-interacao()  # inicia o loop interativo (menu)
+# Operações aceitas no modo em lote: cada função recebe o dicionário de uma linha do arquivo
+# e retorna verdadeiro se a operação foi aceita pelas mesmas regras do menu
+OPERACOES_LOTE = {
+    "deposito": lambda t: depositor(t["valor"]) is not None,
+    "saque": lambda t: sacar(t["valor"]) is not None,
+    "criar_usuario": lambda t: criarusuario(t["nome"], t["cpf"], t.get("dta", ""), t.get("endereco", "")),
+    "criar_conta": lambda t: criarconta(t["titular"]) is not None,
+}
+
+
+# Checa a conta informada numa linha da importação (agência e número cabem na tabela e estão livres)
+def validar_conta_importada(agencia, numero):
+    if agencia >= 10 ** 5 or numero >= 10 ** 5:
+        return MOTIVO_CONTA_INVALIDA
+    if contalista.existe(agencia, numero):
+        return MOTIVO_CONTA_EXISTENTE
+    return None
+
+
+# Cria de uma vez os usuários e as contas de um lote da importação (contas sem agência/número são sorteadas)
+def inserir_lote_importado(clientes, contas):
+    titulares = {cpf: nome for nome, cpf, _, _ in clientes}
+    # reserva os números informados no arquivo antes de alocar os das contas sem número
+    alocador_contas.reservar_lote((agencia, numero) for _, agencia, numero in contas if agencia is not None)
+    faltando = sum(1 for _, agencia, _ in contas if agencia is None)
+    sorteadas = [10000 + sorteio for sorteio in random.choices(range(10000), k=faltando)]
+    novas = iter(zip(sorteadas, alocador_contas.alocar_lote(sorteadas)))  # uma gravação da marca d'água
+    linhas = []
+    for cpf, agencia, numero in contas:
+        if agencia is None:
+            agencia, numero = next(novas)
+        linhas.append((agencia, numero, titulares[cpf]))
+    usuarios.inserir_lote(Usuario(*campos) for campos in clientes)
+    contalista.adicionar_lote(linhas)
+
+
+# Importa um CSV de clientes (nome, cpf, data_nascimento, endereco[, agencia, numero]) em massa
+def importar_clientes_csv(caminho, rejeitadas=None):
+    resumo = importar_clientes(caminho, usuarios.__contains__, validar_conta_importada,
+                               inserir_lote_importado, rejeitadas)
+    print(resumo)
+    return resumo
+
+
+# Processa um arquivo de transações (CSV ou JSON lines) sem o menu e imprime só o resumo final
+def processar_lote(caminho):
+    resumo = processar_transacoes(ler_transacoes(caminho), OPERACOES_LOTE)
+    print(resumo)
+    print(f"Saldo final: {formatar(saldo)} RS | Usuários: {len(usuarios)} | Contas: {len(contalista)}")
+    return resumo
+
+
+# EXECUÇÃO PRINCIPAL (importar o módulo não executa nada)
+#   python Projeto00.py                    -> menu interativo
+#   python Projeto00.py --lote arquivo.csv -> processa o arquivo e imprime o resumo
+#   python Projeto00.py --importar clientes.csv [--rejeitadas recusadas.csv] -> importação em massa
+# ==========================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sistema bancário simples.")
+    parser.add_argument("--lote", help="arquivo de transações (CSV ou JSON lines) processado sem o menu")
+    parser.add_argument("--importar", help="CSV de clientes importado em massa (uma conta por cliente)")
+    parser.add_argument("--rejeitadas", help="CSV onde gravar as linhas recusadas na importação")
+    opcoes = parser.parse_args()
+
+    if opcoes.importar:
+        eventos.usar(DestinoNulo())
+        importar_clientes_csv(opcoes.importar, opcoes.rejeitadas)
+    elif opcoes.lote:
+        eventos.usar(DestinoNulo())  # lote: nenhuma mensagem por operação, só o resumo final
+        processar_lote(opcoes.lote)
+    else:
+        eventos.usar(DestinoConsole())  # menu: as mensagens das operações aparecem no terminal
+        # === Observação: a chamada abaixo é um teste inicial que aparece antes do menu interativo ===
+        filtrarusuario("230")  # executa o filtro para o CPF "230" (pede os dados se o CPF "230" ainda não estiver no registro de usuários)
+
+        # Exibe o estado atual das listas após o teste de cadastro inicial (debug)
+        print("\n=== DADOS FINAIS ===")  # cabeçalho para saída de depuração
+        print("CPFs:", list(usuarios.cpfs()))  # imprime todos os CPFs cadastrados
+        print("Usuários:", usuarios)  # imprime os registros de usuários
+        print("Contas:", list(contalista.linhas_formatadas()))  # imprime as contas cadastradas
+
+        interacao()  # inicia o loop interativo (menu)
@@ -9,40 +9,190 @@
 #       criação de contas e geração de logs.
 #   - Usa listas planas para armazenamento temporário.
 #   - Salva logs de operações em um arquivo "log.txt".
+#   - Toda alteração de estado passa por 'efetivar': é validada, vai
+#     para o WAL em 'dados/' e só então é aplicada; ao iniciar, o último snapshot é
+#     carregado e apenas o final do WAL é reaplicado.
 # ==========================================================
 
+import argparse  # opções de linha de comando (modo em lote)
+import atexit  # fecha o WAL (com snapshot final) no encerramento
+import functools  # preserva os metadados das funções decoradas com 'log'
+import itertools  # encadeia as linhas dos segmentos antigos com as do log ativo
 # Importa o módulo random para gerar números aleatórios
 import random  # gera números para agencia/conta
+import time  # horário epoch dos lançamentos gravados no WAL
 from datetime import datetime
 
-# Lista global que armazenará todas as contas (dados salvos em sequência)
-contalista = []  # formato: [agencia, numero_conta, titular, agencia2, ...] (listas planas)
-
-# Lista global que armazenará todos os usuários (dados salvos em sequência)
-usuarios = []  # formato: [nome, cpf, dta, endereco, nome2, cpf2, ...]
-
-# Lista global que armazenará todos os CPFs cadastrados
-cpfcliente = []  # formato: ['12345678900', '98765432100', ...]
+from banco.alocador_contas import AlocadorContas  # números de conta únicos sem sorteio/colisão
+from banco.dinheiro import CENTAVOS_MAXIMO, formatar, para_centavos, para_reais, reais_ou_nan  # dinheiro em centavos inteiros
+from banco.eventos import DestinoConsole, DestinoNulo, emitir, eventos  # mensagens das operações como eventos
+from banco.extrato_conta import DEPOSITO, SAQUE, Extrato  # extrato com lançamentos em colunas
+from banco.importador_clientes import (  # importação em massa de clientes (CSV em streaming)
+    MOTIVO_CONTA_EXISTENTE,
+    MOTIVO_CONTA_INVALIDA,
+    importar_clientes,
+)
+from banco.limitador_saques import JANELA_DIARIA, LimitadorSaques  # limite de saques por janela de tempo
+from banco.metricas import (  # contadores, motivos de falha e latência por operação
+    MOTIVO_ACIMA_LIMITE,
+    MOTIVO_LIMITE_SAQUES,
+    MOTIVO_SALDO_INSUFICIENTE,
+    MOTIVO_VALOR_INVALIDO,
+    instrumentar,
+    metricas,
+    registrar_falha,
+)
+from banco.lote_transacoes import ler_transacoes, processar_transacoes  # modo em lote (sem menu)
+from banco.registro_clientes import RegistroClientes, Usuario  # registro de clientes indexado por CPF
+from banco.rotacao_log import RotacaoLog  # segmentos do log comprimidos, com manifesto
+from banco.escritor_log import EscritorLog  # grava o log em lotes numa thread de fundo
+from banco.indice_log import IndiceLog  # índice lateral do log para os relatórios
+from banco.persistencia import Armazenamento  # WAL + snapshots para recuperar o estado após uma queda
+from banco.tabela_contas import TabelaContas  # tabela colunar de contas
+from banco.varredura_log import varrer_log  # varredura paralela do log (busca por texto livre)
+
+# Tabela global que armazenará todas as contas (colunas de agência, número e titular)
+contalista = TabelaContas()  # formato: linhas (agencia, numero_conta, titular) indexadas por (agencia, numero_conta)
+
+# Alocador dos números de conta (sequência embaralhada por agência; marca d'água salva em arquivo)
+alocador_contas = AlocadorContas("alocador_contas.json", digitos=4)
+
+# Registro global de usuários indexado por CPF (busca em tempo constante)
+usuarios = RegistroClientes()  # formato: {'12345678900': Usuario(nome, cpf, dta, endereco), ...}
 
 # Saldo do cliente (variável global única neste script)
-saldo = 0.0  # float para operações financeiras
+saldo = 0  # em centavos inteiros (contas exatas, sem arredondamento de float)
 
 # Limite individual por saque
-limite = 500  # valor máximo por saque permitido
+limite = para_centavos(500)  # valor máximo por saque permitido (R$ 500,00 em centavos)
+
+# Extrato da conta (lançamentos acrescentados em O(1), texto montado só ao exibir)
+extrato = Extrato()  # armazena as movimentações
 
-# Histórico simples de extrato (string acumulada)
-extrato = ''  # armazena linhas de movimentação
+# Quantidade de lançamentos exibidos na confirmação de depósito e por página do extrato
+LANCAMENTOS_CONFIRMACAO = 5
+LANCAMENTOS_POR_PAGINA = 20
+CONTAS_POR_PAGINA = 20  # contas por página na opção [i]
 
-# Contador de saques realizados (para controlar número máximo por período)
+# Contador de saques realizados (total; o limite por período fica no limitador abaixo)
 numero_saques = 0  # começa em zero
 
-# Limite máximo de saques permitidos (por exemplo, por dia)
-LIMITE_SAQUES = 3  # máximo de saques permitidos
+# Limite máximo de saques permitidos por janela de tempo (por exemplo, por dia)
+LIMITE_SAQUES = 3  # máximo de saques permitidos na janela
+JANELA_SAQUES = JANELA_DIARIA  # segundos; a permissão volta aos poucos (1 saque a cada janela/limite)
+
+# Limitador de saques por janela (tabela compartilhada; este script tem uma conta só)
+limitador_saques = LimitadorSaques()
+posicao_saques = limitador_saques.nova_conta()
 
 # Opção escolhida no menu (string)
 opcao = ""  # inicializada vazia; atualizada pela função menu()
 
 
+# Diretório do WAL e dos snapshots (usuários, contas, saldo e extrato)
+DIRETORIO_DADOS = "dados"
+
+# Armazenamento durável; aberto por abrir_armazenamento() (None = só em memória)
+armazenamento = None
+
+
+# Estado inteiro do script para o snapshot (colunas array viram bytes compactos no pickle)
+def capturar_estado():
+    return {
+        "usuarios": usuarios.capturar(),
+        "contas": contalista.capturar(),
+        "saldo": saldo,
+        "numero_saques": numero_saques,
+        "limite_saques": limitador_saques.estado(posicao_saques),
+        "extrato": extrato.capturar(),
+    }
+
+
+# Substitui o estado em memória pelo de um snapshot
+def restaurar_estado(estado):
+    global saldo, numero_saques
+    usuarios.restaurar(estado["usuarios"])
+    contalista.restaurar(estado["contas"])
+    alocador_contas.reservar_lote((agencia, numero) for agencia, numero, _ in contalista)  # números em uso
+    saldo = estado["saldo"]
+    numero_saques = estado["numero_saques"]
+    limitador_saques.restaurar_estado(posicao_saques, estado.get("limite_saques", 0.0))
+    extrato.restaurar(estado["extrato"])
+
+
+# Aplica uma alteração já validada; a mesma função serve à operação normal e à recuperação pelo WAL
+#   ("deposito", centavos, epoch)   ("saque", centavos, epoch)
+#   ("usuario", nome, cpf, dta, endereco)   ("conta", agencia, numero, titular)
+#   ("usuarios_lote", [(nome, cpf, dta, endereco), ...])   ("contas_lote", [(agencia, numero, titular), ...])
+def aplicar_mutacao(registro):
+    global saldo, numero_saques
+    operacao = registro[0]
+    if operacao == "deposito":
+        _, valor, tempo = registro
+        saldo += valor
+        extrato.adicionar(DEPOSITO, valor, tempo)
+    elif operacao == "saque":
+        _, valor, tempo = registro
+        saldo -= valor
+        numero_saques += 1
+        limitador_saques.consumir(posicao_saques, LIMITE_SAQUES, JANELA_SAQUES, tempo)
+        extrato.adicionar(SAQUE, valor, tempo)
+    elif operacao == "usuario":
+        usuarios.inserir(Usuario(*registro[1:]))
+    elif operacao == "conta":
+        contalista.adicionar(*registro[1:])
+        alocador_contas.reservar(registro[1], registro[2])  # não falha: só marca o número como em uso
+    elif operacao == "usuarios_lote":
+        usuarios.inserir_lote(Usuario(*campos) for campos in registro[1])
+    elif operacao == "contas_lote":
+        contalista.adicionar_lote(registro[1])
+        alocador_contas.reservar_lote((agencia, numero) for agencia, numero, _ in registro[1])
+    else:
+        raise ValueError(f"Registro desconhecido no WAL: {operacao}")
+
+
+# Confere, antes de o registro ir para o WAL, tudo o que faria 'aplicar_mutacao' falhar;
+# lança ValueError (um registro gravado que falhasse ao aplicar quebraria a recuperação)
+def validar_mutacao(registro):
+    operacao = registro[0]
+    if operacao in ("deposito", "saque"):
+        _, valor, _ = registro
+        if type(valor) is not int or not 0 < valor <= CENTAVOS_MAXIMO:
+            raise ValueError(f"Valor fora do intervalo aceito: {valor!r}")
+        if operacao == "saque" and valor > saldo:
+            raise ValueError("Saldo insuficiente.")
+    elif operacao in ("usuario", "usuarios_lote"):
+        for campos in ([registro[1:]] if operacao == "usuario" else registro[1]):
+            if len(campos) != 4:  # (nome, cpf, dta, endereco)
+                raise ValueError(f"Usuário com campos inválidos: {campos!r}")
+    elif operacao == "conta":
+        contalista.conferir([registro[1:]])
+    elif operacao == "contas_lote":
+        contalista.conferir(registro[1])
+    else:
+        raise ValueError(f"Registro desconhecido: {operacao}")
+
+
+# Valida, grava a alteração no WAL (quando aberto) e só então a aplica em memória; o snapshot,
+# quando é a hora, só é tirado depois de aplicada (senão ele descartaria o WAL sem conter a alteração)
+def efetivar(registro):
+    validar_mutacao(registro)
+    if armazenamento is not None:
+        armazenamento.registrar(registro)
+    aplicar_mutacao(registro)
+    if armazenamento is not None:
+        armazenamento.talvez_snapshot()
+
+
+# Abre o WAL, recupera o estado (snapshot + final do WAL) e retorna quantos registros foram reaplicados
+def abrir_armazenamento(diretorio=DIRETORIO_DADOS, modo="grupo"):
+    global armazenamento
+    armazenamento = Armazenamento(diretorio, capturar_estado, restaurar_estado, aplicar_mutacao, modo=modo)
+    reaplicados = armazenamento.recuperar()
+    atexit.register(armazenamento.fechar)  # snapshot final no encerramento normal
+    return reaplicados
+
+
 # Função que exibe o menu e lê a opção escolhida pelo usuário
 def menu():
     global opcao  # usa/atualiza a variável global 'opcao'
@@ -57,6 +207,7 @@ def menu():
         [cc] Cria Conta
         [i] Iterar Conta
         [g] Gerador Relatorio
+        [m] Métricas
 
         => """
     )
@@ -67,130 +218,165 @@ def menu():
         print("VOCE ERROU NA DIGITAÇAO", erro)
 
 
+# Modo de durabilidade do log: "por_operacao", "grupo" ou "assincrono"
+MODO_LOG = "assincrono"
+
+# Índice do log por operação, horário e valor (salvo em 'log.txt.indice/', carregado no primeiro uso)
+indice_log = IndiceLog("log.txt")
+
+# Rotação do log: o arquivo ativo vira um segmento (comprimido em segundo plano) ao passar de
+# 64 MB ou de um dia aberto; o manifesto em 'log.txt.segmentos/' resume cada segmento
+rotacao_log = RotacaoLog("log.txt", tamanho_maximo=64 * 1024 * 1024, duracao_maxima=86400)
+
+# Escritor compartilhado: mantém o log.txt aberto e grava em lotes (fecha sozinho no atexit)
+escritor_log = EscritorLog("log.txt", modo=MODO_LOG, indice=indice_log, rotacao=rotacao_log)
+
 
 def log(function):
+    @functools.wraps(function)  # mantém nome e '__wrapped__' (a função sem log, usada nos benchmarks)
     def wrapper(*args,**kwargs):
         resultado = function(*args,**kwargs)
-        data_hora_transaçao = datetime.now().strftime("%H:%M:%S")
+        agora = datetime.now()
+        data_hora_transaçao = agora.strftime("%H:%M:%S")
+
+        # valor da operação para o índice, em reais, lido como nos menus ("1.234,56" inclusive;
+        # NaN quando o argumento não é dinheiro)
+        valor = reais_ou_nan(args[0]) if args else float("nan")
 
-        with open("log.txt", "a",encoding="utf-8") as arquivo:
-         arquivo.write( 
+        # entrega a linha ao escritor; a gravação no arquivo acontece em lote
+        escritor_log.escrever(
                         f"[{data_hora_transaçao}]"
                         f" Operação {function.__name__}"
                         f" com argumentos {args} {kwargs}."
-                        f" Retornou o resultado {resultado}\n")
+                        f" Retornou o resultado {resultado}\n",
+                        (agora.timestamp(), function.__name__, valor))
 
         return resultado
     return wrapper
 
 
-def gerador_relatorio(tipo = None,valor_min = None): 
+# Gera o relatório a partir do índice do log: só as linhas que atendem aos filtros são lidas
+#   tipo:             nome da operação (ex: "sacar", "depositor")
+#   valor_min/max:    faixa do valor da operação (inclusiva)
+#   inicio/fim:       período como datetime (inclusivo)
+#   texto:            busca livre na linha; o índice não cobre, então o log inteiro
+#                     é varrido em paralelo (inicio/fim não se aplicam nesse modo)
+# Os segmentos já rodados vêm antes: o manifesto descarta os que não podem ter linhas do
+# relatório e só os demais são descomprimidos (em paralelo)
+def gerador_relatorio(tipo = None,valor_min = None,valor_max = None,inicio = None,fim = None,texto = None):
+    escritor_log.descarregar()  # garante que as linhas em buffer já estejam no arquivo e no índice
     try:
-        with open("log.txt",'r',encoding ="utf-8") as arquivo:
-            for linha in arquivo:
-                linha = linha.strip()
-
-                if tipo and tipo not in linha:
-                    continue
-
-                if valor_min is not None:
-                    partes = linha.split("resultado")
-                    if len(partes) > 1:
-                        trecho = partes[-1].replace("(","").replace(")","").replace(",","")
-                        palavras = trecho.split()
-                        for p in palavras:
-                            try:
-                                valor = float(p)
-                                if valor < valor_min:
-                                    linha = None
-                                break
-                            except ValueError as erro:
-                                print("ERRO DE VALOR",erro)
-                                continue
-
-                if linha :
-                    print(linha)
+        if texto:
+            segmentos = rotacao_log.consultar(texto=texto, operacao=tipo, valor_min=valor_min, valor_max=valor_max)
+            ativo = varrer_log("log.txt", texto=texto, operacao=tipo, valor_min=valor_min, valor_max=valor_max)
+        else:
+            periodo = {"inicio": inicio.timestamp() if inicio else None, "fim": fim.timestamp() if fim else None}
+            segmentos = rotacao_log.consultar(operacao=tipo, valor_min=valor_min, valor_max=valor_max, **periodo)
+            encontrados = indice_log.consultar(operacao=tipo, valor_min=valor_min, valor_max=valor_max, **periodo)
+            ativo = indice_log.linhas(encontrados)
+        linhas = itertools.chain(segmentos, ativo)
+        for linha in linhas:
+            print(linha)
     except Exception as erro:
         print(f"Erro ao gerar relatório: {erro}")
 
 
-
-                
-
-
-
 # Função para depositar valor — removi '/' para compatibilidade com < Python 3.8
 @log
+@instrumentar("depositor")
 def depositor(valor):
     global saldo  # modifica a variável global 'saldo'
     global extrato  # modifica a variável global 'extrato'
     try:
-        valor = float(valor)  # tenta converter a entrada para float (pode lançar ValueError)
+        valor = para_centavos(valor)  # converte a entrada para centavos (pode lançar ValueError)
     except (ValueError, TypeError):
         # caso a conversão falhe, informa usuário e retorna sem alterar nada
-        print("Valor inválido! Digite um número.")
+        emitir("valor_invalido", "Valor inválido! Digite um número.", valor=valor)
+        registrar_falha(MOTIVO_VALOR_INVALIDO)
         return
 
     if valor > 0:
-        saldo += valor  # soma o depósito ao saldo global
-        extrato += f"Depósito de {valor:.2f} RS\n"  # registra no extrato com formatação 2 casas decimais
-        print(f"Saldo Atualizado! Valor {saldo:.2f}")  # mostra o saldo atualizado
-        print(extrato)  # imprime o extrato atual
+        efetivar(("deposito", valor, time.time()))  # WAL, depois saldo + extrato (O(1), sem copiar o extrato)
+        # saldo atualizado e últimos lançamentos (o texto só é montado se houver quem o exiba)
+        emitir("deposito", mensagem_deposito, valor=valor, saldo=saldo)
         return saldo, extrato  # retorna valores atualizados opcionalmente
     else:
         # valor não positivo é inválido para depósito
-        print("Valor inválido para depósito.")
+        emitir("deposito_recusado", "Valor inválido para depósito.", valor=valor, motivo=MOTIVO_VALOR_INVALIDO)
+        registrar_falha(MOTIVO_VALOR_INVALIDO)
+
+
 
+# Mensagem do depósito aceito (montada só quando algum destino exibe o evento)
+def mensagem_deposito(dados):
+    return f"Saldo Atualizado! Valor {formatar(dados['saldo'])}\n{extrato.ultimos(LANCAMENTOS_CONFIRMACAO)}"
 
 
 # Função para realizar saque
 @log
+@instrumentar("sacar")
 def sacar(valor):
     global extrato  # modifica o extrato global
     global saldo  # modifica o saldo global
     global numero_saques  # necessário para incrementar o contador de saques sem erro
 
     try:
-        valor = float(valor)  # tenta converter o valor informado para float
+        valor = para_centavos(valor)  # converte o valor informado para centavos
     except (ValueError, TypeError):
         # se falhar, informa e retorna sem alterações
-        print("Valor inválido! Digite um número.")
+        emitir("valor_invalido", "Valor inválido! Digite um número.", valor=valor)
+        registrar_falha(MOTIVO_VALOR_INVALIDO)
         return
 
     excedeu_saldo = valor > saldo  # verifica se o valor é maior que o saldo disponível
-    excedeu_limite = numero_saques >= LIMITE_SAQUES  # verifica se já atingiu o limite de saques
+    # verifica se já atingiu o limite de saques da janela (O(1), a janela expira sozinha)
+    excedeu_limite = not limitador_saques.permitido(posicao_saques, LIMITE_SAQUES, JANELA_SAQUES)
     excedeu_valor_saque = valor > limite  # verifica se o valor excede o limite por saque
 
     if excedeu_limite:
         # caso tenha atingido limite de saques, bloqueia operação
-        print("OPERAÇAO FALHOU. LIMITE DE SAQUES ATINGIDO.")
+        espera = limitador_saques.proximo_em(posicao_saques, LIMITE_SAQUES, JANELA_SAQUES)
+        emitir("saque_recusado", "OPERAÇAO FALHOU. LIMITE DE SAQUES ATINGIDO.\n"
+               "Próximo saque liberado em {minutos:.0f} minuto(s).",
+               valor=valor, motivo=MOTIVO_LIMITE_SAQUES, minutos=espera / 60)
+        registrar_falha(MOTIVO_LIMITE_SAQUES)
     elif excedeu_saldo:
         # caso saldo insuficiente
-        print("OPERAÇAO FALHOU. SALDO INSUFICIENTE.")
+        emitir("saque_recusado", "OPERAÇAO FALHOU. SALDO INSUFICIENTE.", valor=valor, motivo=MOTIVO_SALDO_INSUFICIENTE)
+        registrar_falha(MOTIVO_SALDO_INSUFICIENTE)
     elif excedeu_valor_saque:
         # caso valor maior que limite por saque
-        print("OPERAÇAO FALHOU. VALOR ACIMA DO LIMITE.")
+        emitir("saque_recusado", "OPERAÇAO FALHOU. VALOR ACIMA DO LIMITE.", valor=valor, motivo=MOTIVO_ACIMA_LIMITE)
+        registrar_falha(MOTIVO_ACIMA_LIMITE)
     else:
         if valor > 0:
-            saldo -= valor  # subtrai o valor do saldo
-            numero_saques += 1  # incrementa o contador de saques (por isso precisa do global)
-            extrato += f"Saque de {valor:.2f} RS\n"  # registra no extrato
-            print(f"SAQUE REALIZADO COM SUCESSO NO VALOR DE {valor:.2f}")  # confirma saque
-            print(f"Saldo atual: {saldo:.2f}")  # mostra saldo atualizado
+            efetivar(("saque", valor, time.time()))  # WAL, depois saldo, janela de saques e extrato
+            # confirma o saque e mostra o saldo atualizado
+            emitir("saque", "SAQUE REALIZADO COM SUCESSO NO VALOR DE {valor:R}\nSaldo atual: {saldo:R}",
+                   valor=valor, saldo=saldo)
             return saldo, extrato  # retorna os valores atualizados
         else:
             # proteção contra valores não positivos
-            print("Valor inválido para saque.")
+            emitir("saque_recusado", "Valor inválido para saque.", valor=valor, motivo=MOTIVO_VALOR_INVALIDO)
+            registrar_falha(MOTIVO_VALOR_INVALIDO)
 
 
-# Função que mostra o extrato atual e o saldo
-def mostrar_extrato():
+# Função que mostra uma página do extrato (por padrão a mais recente) e o saldo
+def mostrar_extrato(pagina=None):
     global extrato, saldo  # usa as variáveis globais 'extrato' e 'saldo'
     print("-----------------------")  # separador visual
     print("EXTRATO DO USUARIO:")  # título do extrato
-    # imprime o extrato se existir; caso contrário, avisa que não há movimentações
-    print(extrato if extrato else "Nenhuma movimentação registrada.")
-    print(f"SALDO ATUAL: {saldo:.2f} RS")  # exibe sald o formatado
+    if extrato:
+        total_paginas = extrato.total_paginas(LANCAMENTOS_POR_PAGINA)
+        if pagina is None or not 1 <= pagina <= total_paginas:
+            pagina = total_paginas  # página inexistente ou não informada: mostra a mais recente
+        # monta o texto apenas dos lançamentos da página pedida
+        print(extrato.pagina(pagina, LANCAMENTOS_POR_PAGINA), end="")
+        print(f"Página {pagina} de {total_paginas}")
+    else:
+        # caso não existam lançamentos, avisa que não há movimentações
+        print("Nenhuma movimentação registrada.")
+    print(f"SALDO ATUAL: {formatar(saldo)} RS")  # exibe sald o formatado
     print("-----------------------")  # separador final
 
 
@@ -201,83 +387,73 @@ def sair():
     print("VOLTE SEMPRE")  # mensagem final amistosa
 
 
-# Função para criar uma nova conta associada a um usuário (listas planas)
+# Função para criar uma nova conta associada a um usuário (tabela de contas)
 def criarconta(usuario):
     # 'usuario' é o nome do titular da conta (string esperada)
-    global contalista  # indica que vamos modificar a lista global de contas
-
-    numero_conta = "0"  # inicia número da conta com '0' 
-    agencia = "1"  # inicia agência com '1' 
-
-    # Gera 4 dígitos para agência e 4 para número da conta concatenando dígitos aleatórios
-    for a in range(0, 4):
-        numeros = random.randint(0, 9)  # gera um dígito aleatório de 0 a 9
-        agencia += str(numeros)  # concatena ao código da agência
+    global contalista  # indica que vamos modificar a tabela global de contas
 
-        numeros2 = random.randint(0, 9)  # gera outro dígito para a conta
-        numero_conta += str(numeros2)  # concatena ao número da conta
+    # Sorteia a agência no formato '1XXXX' (4 dígitos aleatórios)
+    agencia = 10000 + random.randint(0, 9999)  # '1' seguido de 4 dígitos
+    # O número da conta ('0XXXX') vem do alocador: único na agência por construção, sem novas tentativas
+    # (as contas importadas com número escolhido já estão reservadas nele)
+    numero_conta = alocador_contas.alocar(agencia)
 
-    # Armazena os dados da conta em sequência na lista plana contalista
-    contalista.append(agencia)  # acrescenta agência
-    contalista.append(numero_conta)  # acrescenta número da conta
-    contalista.append(usuario)  # acrescenta nome do titular da conta
+    # Armazena a conta como uma linha da tabela (agência, número e titular em colunas), passando pelo WAL
+    efetivar(("conta", agencia, numero_conta, str(usuario)))
 
     # Confirmação ao usuário que a conta foi criada
-    print("Conta criada com sucesso!")
-    print(f"Agência: {agencia} | Conta: {numero_conta} | Titular: {usuario}")
+    agencia, numero_conta = contalista.formatar(agencia, numero_conta)  # texto com zeros à esquerda
+    emitir("conta_criada", "Conta criada com sucesso!\nAgência: {agencia} | Conta: {numero} | Titular: {titular}",
+           agencia=agencia, numero=numero_conta, titular=usuario)
+    return agencia, numero_conta
 
 
-# Função para criar um novo usuário (listas planas)
+# Função para criar um novo usuário (registro indexado por CPF)
 def criarusuario(nome='', cpf='', dta='', endereco=''):
-    global usuarios  # modificaremos a lista global 'usuarios'
-    global cpfcliente  # modificaremos a lista global 'cpfcliente' com o CPF novo
+    global usuarios  # modificaremos o registro global 'usuarios'
 
     # Mantém CPF como string para preservar zeros à esquerda e qualquer formatação que o usuário possa fornecer
-    if cpf in cpfcliente:
-        # se CPF já estiver cadastrado, informa e sai sem duplicar
-        print("USUÁRIO JÁ CADASTRADO!")
-        return
-
-    # Converte valores para string e prepara para inserir na lista plana 'usuarios'
-    nome_usuario = str(nome)  # converge nome para string
-    cpf_usuario = str(cpf)  # garante CPF como string
-    dta_usuario = str(dta)  # data como string
-    endereco_usuario = str(endereco)  # endereco como string
+    # Monta o registro estruturado (o construtor já converte todos os campos para string)
+    usuario = Usuario(nome, cpf, dta, endereco)
 
-    # Adiciona as informações do usuário na lista 'usuarios' em sequência (listas planas)
-    usuarios.append(nome_usuario)  # adiciona nome
-    usuarios.append(cpf_usuario)  # adiciona cpf
-    usuarios.append(dta_usuario)  # adiciona data de nascimento
-    usuarios.append(endereco_usuario)  # adiciona endereço
-
-    # Adiciona o CPF na lista de CPFs cadastrados para controle de duplicatas
-    cpfcliente.append(cpf_usuario)
+    # A checagem de duplicata é uma consulta O(1) no dicionário
+    if usuario.cpf in usuarios:
+        # se CPF já estiver cadastrado, informa e sai sem duplicar
+        emitir("usuario_duplicado", "USUÁRIO JÁ CADASTRADO!", cpf=usuario.cpf)
+        return False
+    efetivar(("usuario",) + usuario.como_tupla())  # grava no WAL e insere no registro
 
-    # Confirmação visual para o usuário (mostra a lista completa de usuários)
-    print("Usuário cadastrado com sucesso!")
-    print(usuarios)
+    # Confirmação visual para o usuário (só o novo registro: imprimir o registro inteiro custaria O(n) por cadastro)
+    emitir("usuario_cadastrado", "Usuário cadastrado com sucesso!\n{usuario!r}", cpf=usuario.cpf, usuario=usuario)
+    return True
 
 
 
-def conta_iterador(lista):
+# Lista as contas: todas (pagina=None) ou só a página pedida, sem percorrer as anteriores
+def conta_iterador(lista, pagina=None, tamanho=CONTAS_POR_PAGINA):
     if not lista:
         print("Nenhum Conta Cadastrada")
         return
+    elif pagina is None:
+        # percorre a tabela linha a linha (sem depender do alinhamento de triplas)
+        for agencia, num_conta, titula_conta in lista.linhas_formatadas():
+            print(f"AGENCIA {agencia} Com Numero De Conta {num_conta} Com O Titula {titula_conta}")
     else:
-        for a in range(0,len(lista),3):
-            agencia = lista[a]
-            num_conta = lista[a+1]
-            titula_conta = lista[a+2]
+        total_paginas = lista.total_paginas(tamanho)
+        pagina = min(max(1, pagina), total_paginas)  # página fora do intervalo: a mais próxima
+        for agencia, num_conta, titula_conta in lista.pagina_numero(pagina, tamanho):
+            agencia, num_conta = lista.formatar(agencia, num_conta)  # texto com zeros à esquerda
             print(f"AGENCIA {agencia} Com Numero De Conta {num_conta} Com O Titula {titula_conta}")
+        print(f"Página {pagina} de {total_paginas}")
 
 
 # Função que verifica se o CPF já existe e, se não existir, cadastra novo usuário
 def filtrarusuario(numero):
-    global cpfcliente  # vamos consultar/modificar a lista de cpfs
+    global usuarios  # vamos consultar o registro de usuários
 
     numero = str(numero)  # converte a entrada para string para comparação consistente
 
-    if numero in cpfcliente:
+    if numero in usuarios:  # consulta O(1) pelo CPF
         # se já cadastrado, informa que o usuário existe
         print("VOCÊ JÁ ESTÁ CADASTRADO COMO USUÁRIO...")
     else:
@@ -299,17 +475,6 @@ def filtrarusuario(numero):
             print("ERRO AO CRIAR USUÁRIO:", erro)
 
 
-# === Observação: a chamada abaixo é um teste inicial que aparece antes do menu interativo ===
-# Se não quiser que o script peça dados ao iniciar, remova/comment essa linha.
-filtrarusuario("230")  # executa o filtro para o CPF "230" (vai pedir dados porque cpfcliente está vazio)
-
-# Exibe o estado atual das listas após o teste de cadastro inicial (debug)
-print("\n=== DADOS FINAIS ===")  # cabeçalho para saída de depuração
-print("CPFs:", cpfcliente)  # imprime todos os CPFs cadastrados
-print("Usuários:", usuarios)  # imprime a lista plana de usuários
-print("Contas:", contalista)  # imprime a lista plana de contas
-
-
 # Função principal de interação com o menu; mantém o loop até o usuário sair
 def interacao():
     while True:  # loop infinito que só quebra quando a opção 'q' é escolhida
@@ -324,7 +489,11 @@ def interacao():
             sacar(valor)  # chama função de saque
 
         elif opcao == 'e':  # opção extrato
-            mostrar_extrato()  # exibe o extrato atual
+            try:
+                pagina = int(input("PÁGINA DO EXTRATO (vazio = mais recente): "))
+            except ValueError:
+                pagina = None  # entrada vazia ou inválida: página mais recente
+            mostrar_extrato(pagina)  # exibe a página do extrato
 
         elif opcao == 'q':  # opção sair
             sair()  # exibe mensagem de saída
@@ -343,26 +512,122 @@ def interacao():
             criarconta(nome)  # cria a conta associada ao nome informado
 
         elif opcao == 'i':
-            conta_iterador(contalista)
+            try:
+                pagina = int(input("PÁGINA DAS CONTAS (vazio = primeira): "))
+            except ValueError:
+                pagina = 1  # entrada vazia ou inválida: primeira página
+            conta_iterador(contalista, pagina)  # só a página pedida, mesmo com milhões de contas
 
 
 
         elif opcao == 'g':
             tipo = input("Filtrar por tipo de transação (ex: sacar, depositor): ").strip()
             try:
-                valor_procura = float(input("Valor mínimo para filtrar: "))
-            except ValueError:
+                valor_procura = para_reais(para_centavos(input("Valor mínimo para filtrar: ")))
+            except (ValueError, TypeError):
                 valor_procura = None
-            gerador_relatorio(tipo or None, valor_procura)
+            try:
+                valor_maximo = para_reais(para_centavos(input("Valor máximo para filtrar: ")))
+            except (ValueError, TypeError):
+                valor_maximo = None
+            texto = input("Texto livre para buscar (vazio = usar o índice): ").strip()
+            gerador_relatorio(tipo or None, valor_procura, valor_maximo, texto=texto or None)
 
 
+        elif opcao == 'm':
+            print(metricas.texto())  # chamadas, falhas por motivo e latência de depositor/sacar
+
         else:
             # qualquer opção inválida cai aqui
             print("OPÇÃO INVÁLIDA!")
 
 
-# EXECUÇÃO PRINCIPAL
+# Operações aceitas no modo em lote: cada função recebe o dicionário de uma linha do arquivo
+# e retorna verdadeiro se a operação foi aceita pelas mesmas regras do menu
+OPERACOES_LOTE = {
+    "deposito": lambda t: depositor(t["valor"]) is not None,
+    "saque": lambda t: sacar(t["valor"]) is not None,
+    "criar_usuario": lambda t: criarusuario(t["nome"], t["cpf"], t.get("dta", ""), t.get("endereco", "")),
+    "criar_conta": lambda t: criarconta(t["titular"]) is not None,
+}
+
+
+# Checa a conta informada numa linha da importação (agência e número cabem na tabela e estão livres)
+def validar_conta_importada(agencia, numero):
+    if agencia >= 10 ** 5 or numero >= 10 ** 5:
+        return MOTIVO_CONTA_INVALIDA
+    if contalista.existe(agencia, numero):
+        return MOTIVO_CONTA_EXISTENTE
+    return None
+
+
+# Cria de uma vez os usuários e as contas de um lote da importação (contas sem agência/número são sorteadas)
+def inserir_lote_importado(clientes, contas):
+    titulares = {cpf: nome for nome, cpf, _, _ in clientes}
+    # reserva os números informados no arquivo antes de alocar os das contas sem número
+    alocador_contas.reservar_lote((agencia, numero) for _, agencia, numero in contas if agencia is not None)
+    faltando = sum(1 for _, agencia, _ in contas if agencia is None)
+    sorteadas = [10000 + sorteio for sorteio in random.choices(range(10000), k=faltando)]
+    novas = iter(zip(sorteadas, alocador_contas.alocar_lote(sorteadas)))  # uma gravação da marca d'água
+    linhas = []
+    for cpf, agencia, numero in contas:
+        if agencia is None:
+            agencia, numero = next(novas)
+        linhas.append((agencia, numero, titulares[cpf]))
+    efetivar(("usuarios_lote", clientes))  # um registro no WAL por lote
+    efetivar(("contas_lote", linhas))
+
+
+# Importa um CSV de clientes (nome, cpf, data_nascimento, endereco[, agencia, numero]) em massa
+def importar_clientes_csv(caminho, rejeitadas=None):
+    resumo = importar_clientes(caminho, usuarios.__contains__, validar_conta_importada,
+                               inserir_lote_importado, rejeitadas)
+    print(resumo)
+    return resumo
+
+
+# Processa um arquivo de transações (CSV ou JSON lines) sem o menu e imprime só o resumo final
+def processar_lote(caminho):
+    resumo = processar_transacoes(ler_transacoes(caminho), OPERACOES_LOTE)
+    print(resumo)
+    print(f"Saldo final: {formatar(saldo)} RS | Usuários: {len(usuarios)} | Contas: {len(contalista)}")
+    return resumo
+
+
+# EXECUÇÃO PRINCIPAL (importar o módulo não executa nada)
+#   python Projeto01.py                    -> menu interativo
+#   python Projeto01.py --lote arquivo.csv -> processa o arquivo e imprime o resumo
+#   python Projeto01.py --importar clientes.csv [--rejeitadas recusadas.csv] -> importação em massa
 # ==========================================================
 if __name__ == "__main__":
-    # Executa o sistema bancário
-    interacao()
+    parser = argparse.ArgumentParser(description="Sistema bancário simples.")
+    parser.add_argument("--lote", help="arquivo de transações (CSV ou JSON lines) processado sem o menu")
+    parser.add_argument("--importar", help="CSV de clientes importado em massa (uma conta por cliente)")
+    parser.add_argument("--rejeitadas", help="CSV onde gravar as linhas recusadas na importação")
+    opcoes = parser.parse_args()
+
+    if opcoes.importar:
+        eventos.usar(DestinoNulo())
+        abrir_armazenamento(modo="assincrono")
+        importar_clientes_csv(opcoes.importar, opcoes.rejeitadas)
+    elif opcoes.lote:
+        eventos.usar(DestinoNulo())  # lote: nenhuma mensagem por operação, só o resumo final
+        # no lote o WAL grava em grupo sem esperar cada fsync; tudo está no disco ao final (atexit)
+        abrir_armazenamento(modo="assincrono")
+        processar_lote(opcoes.lote)
+    else:
+        eventos.usar(DestinoConsole())  # menu: as mensagens das operações aparecem no terminal
+        # Recupera o estado salvo antes de qualquer operação
+        abrir_armazenamento()
+
+        # === Observação: a chamada abaixo é um teste inicial que aparece antes do menu interativo ===
+        filtrarusuario("230")  # executa o filtro para o CPF "230" (pede os dados se o CPF "230" ainda não estiver no registro de usuários)
+
+        # Exibe o estado atual das listas após o teste de cadastro inicial (debug)
+        print("\n=== DADOS FINAIS ===")  # cabeçalho para saída de depuração
+        print("CPFs:", list(usuarios.cpfs()))  # imprime todos os CPFs cadastrados
+        print("Usuários:", usuarios)  # imprime os registros de usuários
+        print("Contas:", list(contalista.linhas_formatadas()))  # imprime as contas cadastradas
+
+        # Executa o sistema bancário
+        interacao()
@@ -0,0 +1,141 @@
+# ==========================================================
+# CLIENTE ASYNC DO SERVIDOR DE TRANSAÇÕES
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Biblioteca para falar com SistemBancarioPOO/servidor.py.
+#   - As requisições são enviadas sem esperar as anteriores
+#     (pipelining); uma tarefa lê as respostas e as entrega na
+#     mesma ordem em que as requisições foram feitas.
+#   - Rodando como script faz um teste de carga com várias conexões.
+#
+# Uso (a partir da raiz do repositório, com o servidor no ar):
+#   python -m SistemBancarioPOO.cliente_async --conexoes 1000 --requisicoes 100
+# ==========================================================
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+
+class ErroServidor(Exception):
+    """Resposta {"ok": false} do servidor."""
+
+
+class ClienteBancoAsync:
+    """Conexão com o servidor do banco com suporte a pipelining."""
+
+    def __init__(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self._leitor = leitor
+        self._escritor = escritor
+        self._aguardando = deque()  # futures na ordem em que as requisições foram enviadas
+        self._tarefa_leitura = asyncio.ensure_future(self._ler_respostas())
+
+    @classmethod
+    async def conectar(cls, host="127.0.0.1", porta=8765, unix=None):
+        if unix:
+            leitor, escritor = await asyncio.open_unix_connection(unix)
+        else:
+            leitor, escritor = await asyncio.open_connection(host, porta)
+        return cls(leitor, escritor)
+
+    async def _ler_respostas(self):
+        try:
+            while True:
+                linha = await self._leitor.readline()
+                if not linha:
+                    break
+                futuro = self._aguardando.popleft()
+                if not futuro.cancelled():
+                    futuro.set_result(json.loads(linha))
+        finally:
+            # conexão encerrada: quem ainda espera recebe erro
+            while self._aguardando:
+                futuro = self._aguardando.popleft()
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("Conexão com o servidor encerrada."))
+
+    def enviar(self, op: str, **campos) -> asyncio.Future:
+        """Envia a requisição sem esperar; retorna a future da resposta (dict)."""
+        campos["op"] = op
+        futuro = asyncio.get_running_loop().create_future()
+        self._aguardando.append(futuro)
+        self._escritor.write(json.dumps(campos).encode("utf-8") + b"\n")
+        return futuro
+
+    async def requisitar(self, op: str, **campos) -> dict:
+        """Envia a requisição e espera a resposta; lança ErroServidor se ok for false."""
+        resposta = await self.enviar(op, **campos)
+        if not resposta.get("ok"):
+            raise ErroServidor(resposta.get("erro"))
+        return resposta
+
+    # ================================
+    # Operações
+    # ================================
+    async def criar_cliente(self, cpf, nome, data_nascimento="", endereco=""):
+        return await self.requisitar("criar_cliente", cpf=cpf, nome=nome,
+                                     data_nascimento=data_nascimento, endereco=endereco)
+
+    async def criar_conta(self, cpf):
+        return await self.requisitar("criar_conta", cpf=cpf)
+
+    async def deposito(self, numero, valor):
+        return await self.requisitar("deposito", numero=numero, valor=valor)
+
+    async def saque(self, numero, valor):
+        return await self.requisitar("saque", numero=numero, valor=valor)
+
+    async def extrato(self, numero):
+        return await self.requisitar("extrato", numero=numero)
+
+    async def fechar(self):
+        self._escritor.close()
+        try:
+            await self._escritor.wait_closed()
+        except ConnectionError:
+            pass
+        await self._tarefa_leitura
+
+
+# ========================================
+# TESTE DE CARGA
+# ========================================
+async def teste_carga(conexoes=100, requisicoes=100, host="127.0.0.1", porta=8765, unix=None):
+    """Abre várias conexões, cada uma com uma conta, e envia depósitos em pipeline.
+
+    Retorna (total de requisições, segundos).
+    """
+    async def uma_conexao(indice):
+        cliente = await ClienteBancoAsync.conectar(host, porta, unix)
+        cpf = f"carga-{indice}-{time.monotonic_ns()}"
+        await cliente.criar_cliente(cpf, f"Cliente {indice}")
+        numero = (await cliente.criar_conta(cpf))["numero"]
+        # envia todas as requisições de uma vez e só depois espera as respostas
+        respostas = await asyncio.gather(*[cliente.enviar("deposito", numero=numero, valor=1.0)
+                                           for _ in range(requisicoes)])
+        await cliente.fechar()
+        return sum(1 for resposta in respostas if resposta["ok"])
+
+    inicio = time.perf_counter()
+    aceitas = await asyncio.gather(*[uma_conexao(i) for i in range(conexoes)])
+    duracao = time.perf_counter() - inicio
+    if sum(aceitas) != conexoes * requisicoes:
+        raise ErroServidor("Nem todos os depósitos foram aceitos.")
+    return conexoes * requisicoes, duracao
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor do banco.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--unix", help="caminho do socket Unix (em vez de TCP)")
+    parser.add_argument("--conexoes", type=int, default=100)
+    parser.add_argument("--requisicoes", type=int, default=100, help="requisições por conexão")
+    opcoes = parser.parse_args()
+    total, segundos = asyncio.run(teste_carga(opcoes.conexoes, opcoes.requisicoes,
+                                              opcoes.host, opcoes.porta, opcoes.unix))
+    print(f"{total} requisições em {segundos:.2f}s ({total / segundos:.0f} req/s)")
@@ -1,6 +1,134 @@
-import random
+import itertools
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from itertools import accumulate
+from operator import attrgetter
+
+from banco.agregados_saldo import AgregadosSaldo
+from banco.alocador_contas import AlocadorContas
+from banco.dinheiro import formatar, para_centavos, para_reais, somar, somar_por_codigo
+from banco.eventos import emitir
+from banco.limitador_saques import JANELA_DIARIA, LimitadorSaques
+from banco.paginacao import Pagina, gerar_token, ler_token, paginar, tamanho_pagina
+from banco.metricas import (
+    MOTIVO_ACIMA_LIMITE,
+    MOTIVO_CONTA_INVALIDA,
+    MOTIVO_LIMITE_SAQUES,
+    MOTIVO_MESMA_CONTA,
+    MOTIVO_SALDO_INSUFICIENTE,
+    MOTIVO_VALOR_INVALIDO,
+    instrumentar,
+    registrar_falha,
+)
+
+# ========================================
+# CÓDIGOS DE RESULTADO DAS OPERAÇÕES EM LOTE
+# ========================================
+RESULTADO_OK = 0
+RESULTADO_VALOR_INVALIDO = 1
+RESULTADO_SALDO_INSUFICIENTE = 2
+RESULTADO_ACIMA_LIMITE = 3
+RESULTADO_LIMITE_SAQUES = 4
+RESULTADO_TIPO_INVALIDO = 5
+RESULTADO_MESMA_CONTA = 6
+RESULTADO_CONTA_INVALIDA = 7
+
+
+# Alocador compartilhado dos números de conta (únicos por agência, sem colisão).
+# Usado só pelos setters de número/agência; o construtor não reserva nada nele:
+# quem cria a conta com um número escolhido reserva esse número no próprio alocador.
+alocador_contas = AlocadorContas(digitos=8)
+
+# Tabela compartilhada dos limites de saque por janela de tempo (uma posição por conta)
+limitador_saques = LimitadorSaques()
+
+# Saldos agregados por cliente, por agência e do banco (atualizados a cada alteração de saldo)
+agregados_saldo = AgregadosSaldo()
+
+
+def chave_cliente(cliente):
+    """Chave do cliente nos saldos agregados: o CPF, quando há um (os totais não prendem o objeto na memória)."""
+    return getattr(cliente, "_cpf", cliente)
+
+# Nomes das duas pontas de uma transferência no histórico
+OPERACAO_TRANSFERENCIA_ENVIADA = "TransferenciaEnviada"
+OPERACAO_TRANSFERENCIA_RECEBIDA = "TransferenciaRecebida"
+
+# Ordem global das travas de conta (a ordem de criação) e identificadores das transferências
+# (crescentes a partir do relógio na carga do módulo: não se repetem entre reinícios)
+_ordem_travas = itertools.count()
+_ids_transferencia = itertools.count(time.time_ns())
+
+
+# ========================================
+# TRAVA POR CONTA (COM ESTATÍSTICAS DE DISPUTA)
+# ========================================
+class TravaConta:
+    """Trava reentrante de uma conta que conta aquisições e disputas.
+
+    Cada conta tem a sua, então operações em contas diferentes nunca
+    esperam umas pelas outras. 'ordem' é a posição da trava na ordem
+    global usada por quem precisa de várias contas ao mesmo tempo.
+    """
+
+    __slots__ = ("_trava", "aquisicoes", "disputas", "ordem")
+
+    def __init__(self):
+        self._trava = threading.RLock()
+        self.aquisicoes = 0  # vezes que a trava foi obtida
+        self.disputas = 0  # vezes em que foi preciso esperar outra thread liberar
+        self.ordem = next(_ordem_travas)
+
+    def __enter__(self):
+        if self._trava.acquire(blocking=False):
+            self.aquisicoes += 1
+        else:
+            self._trava.acquire()
+            self.aquisicoes += 1
+            self.disputas += 1  # contadores só mudam com a trava obtida
+        return self
+
+    def __exit__(self, *excecao):
+        self._trava.release()
+
+    def estatisticas(self):
+        """Retorna as contagens de aquisições e disputas da trava."""
+        return {"aquisicoes": self.aquisicoes, "disputas": self.disputas}
+
+
+class travar_contas:
+    """Obtém as travas de várias contas sempre na ordem global (TravaConta.ordem).
+
+    Duas threads que travam contas em comum as pedem na mesma ordem, então
+    nenhuma fica esperando por uma trava que a outra só solta depois (sem deadlock).
+    Não usar com a trava de outra conta já obtida fora do bloco.
+    """
+
+    __slots__ = ("_travas",)
+
+    def __init__(self, *contas):
+        travas = {id(conta._trava): conta._trava for conta in contas}  # conta repetida: uma trava só
+        self._travas = sorted(travas.values(), key=attrgetter("ordem"))
+
+    def __enter__(self):
+        obtidas = []
+        try:
+            for trava in self._travas:
+                trava.__enter__()
+                obtidas.append(trava)
+        except BaseException:
+            for trava in reversed(obtidas):
+                trava.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, *excecao):
+        for trava in reversed(self._travas):
+            trava.__exit__(*excecao)
 
 
 # ========================================
@@ -32,11 +160,14 @@ class Deposito(Transacao):
     def valor(self, valor):
         self._valor = valor
 
+    @instrumentar("Deposito.registrar")
     def registrar(self, conta):
-        """Registra o depósito na conta e adiciona ao histórico."""
-        sucesso_transacao = conta.deposito(self._valor)
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+        """Registra o depósito na conta e adiciona ao histórico. Retorna True se foi aceito."""
+        with conta._trava:  # saldo e histórico mudam juntos
+            sucesso_transacao = conta.deposito(self._valor)
+            if sucesso_transacao is True:
+                conta.historico.adicionar_transacao(self)
+            return sucesso_transacao is True
 
 
 # ========================================
@@ -52,39 +183,245 @@ class Saque(Transacao):
     def valor(self):
         return self._valor
 
+    @instrumentar("Saque.registrar")
+    def registrar(self, conta):
+        """Registra o saque na conta e adiciona ao histórico. Retorna True se foi aceito."""
+        with conta._trava:  # saldo e histórico mudam juntos
+            sucesso_transacao = conta.sacar(self._valor)
+            if sucesso_transacao:
+                conta.historico.adicionar_transacao(self)
+            return sucesso_transacao
+
+
+# ========================================
+# CLASSE DE TRANSFERÊNCIA
+# ========================================
+class Transferencia(Transacao):
+    """Classe que representa uma transferência da conta que a registra para 'destino'.
+
+    O débito e o crédito acontecem juntos, com as duas contas travadas, e cada
+    histórico recebe uma entrada ligada à outra pelo mesmo identificador.
+    """
+
+    def __init__(self, valor, destino):
+        self._valor = valor
+        self.destino = destino
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @instrumentar("Transferencia.registrar")
     def registrar(self, conta):
-        """Registra o saque na conta e adiciona ao histórico."""
-        sucesso_transacao = conta.sacar(self._valor)
-        if sucesso_transacao:
-            conta.historico.adicionar_transacao(self)
+        """Transfere o valor da conta para o destino. Retorna True se foi aceita."""
+        return conta.transferir(self.destino, self._valor)
 
 
 # ========================================
 # CLASSE HISTÓRICO
 # ========================================
+class _TemposPorPosicao:
+    """Visão dos horários de uma lista de posições do histórico, para busca binária com o bisect."""
+
+    __slots__ = ("_posicoes", "_tempos")
+
+    def __init__(self, posicoes, tempos):
+        self._posicoes = posicoes
+        self._tempos = tempos
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def __getitem__(self, indice):
+        return self._tempos[self._posicoes[indice]]
+
+
+def _epoch(momento):
+    """Aceita um horário epoch ou um datetime e retorna o epoch."""
+    return momento.timestamp() if isinstance(momento, datetime) else momento
+
+
 class Historico:
-    """Classe responsável por armazenar e listar o histórico de transações."""
+    """Classe responsável por armazenar e listar o histórico de transações.
+
+    As transações ficam em colunas compactas (horário epoch, código da
+    operação e valor em centavos); a data só é formatada quando o histórico é exibido.
+    A coluna de horários é sempre crescente e cada operação tem a lista das suas
+    posições, então as consultas por período (e por operação) são buscas binárias.
+    As transferências guardam também, na sua posição, o identificador e a conta
+    do outro lado (o vínculo com a entrada correspondente no outro histórico).
+    """
+
+    # Tabela de operações compartilhada por todos os históricos: código -> nome
+    _nomes_operacoes = []
+    _codigos_operacoes = {}
 
     def __init__(self):
-        self._transacoes = []
+        self._tempos = array("d")  # horário da transação (epoch)
+        self._operacoes = array("B")  # código da operação
+        self._valores = array("q")  # valor da transação em centavos
+        self._posicoes = {}  # código da operação -> posições dela (crescentes)
+        self._vinculos = {}  # posição -> (identificador da transferência, agência, número da outra conta)
+        self._por_transferencia = {}  # identificador da transferência -> posição
+
+    @classmethod
+    def _codigo_operacao(cls, nome):
+        """Retorna o código da operação, cadastrando o nome se for novo."""
+        codigo = cls._codigos_operacoes.get(nome)
+        if codigo is None:
+            codigo = len(cls._nomes_operacoes)
+            cls._nomes_operacoes.append(nome)
+            cls._codigos_operacoes[nome] = codigo
+        return codigo
+
+    def _horario(self, tempo):
+        """Horário a gravar: nunca anterior ao último (mantém a coluna ordenada para as buscas)."""
+        tempo = time.time() if tempo is None else tempo
+        if self._tempos and tempo < self._tempos[-1]:
+            tempo = self._tempos[-1]
+        return tempo
+
+    def _posicoes_de(self, codigo):
+        posicoes = self._posicoes.get(codigo)
+        if posicoes is None:
+            posicoes = self._posicoes[codigo] = array("I")
+        return posicoes
 
     def adicionar_transacao(self, transacao):
         """Adiciona uma transação com data e valor ao histórico."""
-        self._transacoes.append({
-            "Operaçao": transacao.__class__.__name__,
-            "DATA": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
-            "VALOR": transacao.valor
-        })
+        codigo = self._codigo_operacao(transacao.__class__.__name__)
+        self._tempos.append(self._horario(None))
+        self._posicoes_de(codigo).append(len(self._operacoes))
+        self._operacoes.append(codigo)
+        self._valores.append(para_centavos(transacao.valor))
+
+    def adicionar_lote(self, codigos, valores, tempo=None, vinculos=None):
+        """Adiciona de uma vez várias transações (códigos de operação e centavos) com o mesmo horário.
+
+        'vinculos' (opcional) traz, para cada transação, o vínculo da transferência ou None.
+        """
+        tempo = self._horario(tempo)
+        posicao = len(self._operacoes)
+        if vinculos:
+            for deslocamento, vinculo in enumerate(vinculos):
+                if vinculo is not None:
+                    self._vinculos[posicao + deslocamento] = vinculo
+                    self._por_transferencia[vinculo[0]] = posicao + deslocamento
+        self._tempos.extend(array("d", [tempo]) * len(codigos))
+        for codigo in codigos:
+            self._posicoes_de(codigo).append(posicao)
+            posicao += 1
+        self._operacoes.extend(codigos)
+        self._valores.extend(valores)
+
+    def _registro(self, posicao):
+        """Monta o registro legível (com a data formatada) de uma posição."""
+        registro = {
+            "Operaçao": self._nomes_operacoes[self._operacoes[posicao]],
+            "DATA": datetime.fromtimestamp(self._tempos[posicao]).strftime("%d/%m/%Y %H:%M:%S"),
+            "TEMPO": self._tempos[posicao],  # epoch, ordenável
+            "VALOR": para_reais(self._valores[posicao])
+        }
+        vinculo = self._vinculos.get(posicao)
+        if vinculo is not None:
+            registro["TRANSFERENCIA"] = vinculo[0]
+            registro["CONTRAPARTE"] = (vinculo[1], vinculo[2])  # agência, número
+        return registro
+
+    def transferencia(self, identificador):
+        """Registro da entrada ligada à transferência 'identificador' (None se não estiver aqui), em O(1)."""
+        posicao = self._por_transferencia.get(identificador)
+        return None if posicao is None else self._registro(posicao)
 
     def listar_transacao(self):
-        """Retorna a lista de transações registradas."""
-        return self._transacoes
+        """Retorna a lista de transações registradas (para listas longas, use 'periodo' ou 'pagina')."""
+        return [self._registro(posicao) for posicao in range(len(self._valores))]
+
+    def __len__(self):
+        return len(self._valores)
+
+    # ================================
+    # Consultas por período
+    # ================================
+    def _faixa(self, inicio, fim, operacao):
+        """Posições (range ou fatia das posições da operação) entre 'inicio' e 'fim', inclusivos."""
+        if operacao is None:
+            tempos = self._tempos
+            total = len(tempos)
+        else:
+            codigo = self._codigos_operacoes.get(operacao)
+            posicoes = self._posicoes.get(codigo, array("I"))
+            tempos = _TemposPorPosicao(posicoes, self._tempos)
+            total = len(posicoes)
+        primeira = 0 if inicio is None else bisect_left(tempos, _epoch(inicio))
+        ultima = total if fim is None else bisect_right(tempos, _epoch(fim))
+        if operacao is None:
+            return range(primeira, ultima)
+        return posicoes[primeira:ultima]
+
+    def periodo(self, inicio=None, fim=None, operacao=None):
+        """Iterador (preguiçoso) das transações entre 'inicio' e 'fim' (epoch ou datetime, inclusivos).
+
+        'operacao' filtra pelo nome (ex: "Saque"). Custo O(log n) para achar o trecho + O(k) para percorrê-lo.
+        """
+        for posicao in self._faixa(inicio, fim, operacao):
+            yield self._registro(posicao)
+
+    def pagina(self, tamanho: int = None, token: str = None, inicio=None, fim=None, operacao=None):
+        """Página das transações do período (e da operação) e o token da seguinte.
+
+        O token guarda a posição da próxima transação; a página é achada por busca
+        binária, então custa O(log n + tamanho) em qualquer ponto do histórico.
+        """
+        filtros = ("historico", _epoch(inicio), _epoch(fim), operacao)
+        faixa = self._faixa(inicio, fim, operacao)
+        primeira = bisect_left(faixa, ler_token(token, filtros))
+        itens = ((faixa[indice], self._registro(faixa[indice])) for indice in range(primeira, len(faixa)))
+        return paginar(itens, tamanho, filtros)
+
+    def contar(self, inicio=None, fim=None, operacao=None) -> int:
+        """Quantas transações há no período (e na operação), em O(log n)."""
+        return len(self._faixa(inicio, fim, operacao))
+
+    def total(self, operacao=None) -> int:
+        """Soma exata (em centavos) das transações, ou só das de uma operação (ex: "Saque")."""
+        if operacao is None:
+            return somar(self._valores)
+        codigo = self._codigos_operacoes.get(operacao)
+        if codigo is None:
+            return 0
+        return somar_por_codigo(self._operacoes, self._valores, codigo)
+
+    def capturar(self):
+        """Retorna cópias das colunas (e os nomes das operações e os vínculos das transferências) para um snapshot."""
+        return (self._tempos[:], self._operacoes[:], self._valores[:], list(self._nomes_operacoes),
+                dict(self._vinculos))
+
+    def restaurar(self, estado):
+        """Substitui as transações pelas de um snapshot (os anteriores às transferências não têm vínculos)."""
+        tempos, operacoes, valores, nomes, *vinculos = estado
+        # os códigos dependem da ordem em que as operações apareceram no processo que salvou
+        traducao = [self._codigo_operacao(nome) for nome in nomes]
+        if traducao != list(range(len(nomes))):
+            operacoes = [traducao[codigo] for codigo in operacoes]
+        self._tempos = array("d", accumulate(tempos, max))  # garante a ordem exigida pelas buscas
+        self._operacoes = array("B", operacoes)
+        self._valores = array("q", valores)
+        self._posicoes = {}
+        for posicao, codigo in enumerate(self._operacoes):
+            self._posicoes_de(codigo).append(posicao)
+        self._vinculos = dict(vinculos[0]) if vinculos else {}
+        self._por_transferencia = {vinculo[0]: posicao for posicao, vinculo in self._vinculos.items()}
 
     def __str__(self):
         """Exibe o histórico em formato legível."""
         linhas = []
-        for a in self._transacoes:
-            linhas.append(f"{a['DATA']} | {a['Operaçao']} | {a['VALOR']:.2F}")
+        for posicao in range(len(self._valores)):
+            a = self._registro(posicao)
+            linha = f"{a['DATA']} | {a['Operaçao']} | {formatar(self._valores[posicao])}"
+            if "CONTRAPARTE" in a:
+                linha += f" | conta {a['CONTRAPARTE'][0]}/{a['CONTRAPARTE'][1]}"
+            linhas.append(linha)
         return "\n".join(linhas) if linhas else "Nenhum Transaçao Realizada"
 
 
@@ -94,36 +431,86 @@ class Historico:
 class Conta:
     """Classe que representa uma conta bancária genérica."""
 
+    # Limites de saque do tipo de conta: valor máximo por saque (reais) e saques
+    # por JANELA_SAQUES (s). None = sem limite; ContaConrente define os seus.
+    limite = None
+    LIMITE_SAQUE = None
+    JANELA_SAQUES = JANELA_DIARIA
+
+    # Quantas vezes alguma conta mudou de agência (invalida os índices por agência dos clientes)
+    _mudancas_agencia = 0
+
     def __init__(self, cliente, numero: int, agencia: str = "0001"):
-        self._saldo = 0.0
+        self._saldo = 0  # em centavos
+        self._numero_saques = 0  # total de saques (o limite por janela fica no limitador)
+        self._posicao_saques = limitador_saques.nova_conta()
         self._numero = numero
         self._agencia = agencia
         self._cliente = cliente
+        self._chave_cliente = chave_cliente(cliente)  # chave nos saldos agregados
         self.historico = Historico()
+        self._trava = TravaConta()  # protege saldo, contador de saques e histórico
+        agregados_saldo.registrar_conta(self._chave_cliente, agencia)
+
+    @classmethod
+    def criar_lote(cls, contas):
+        """Cria de uma vez as contas (cliente, número, agência), com saldo zero.
+
+        Equivale a chamar o construtor para cada uma, mas reserva as posições no
+        limitador de saques e inclui as contas nos saldos agregados numa única vez.
+        """
+        contas = list(contas)
+        posicoes = limitador_saques.novas_contas(len(contas))
+        criadas = []
+        for (cliente, numero, agencia), posicao in zip(contas, posicoes):
+            conta = cls.__new__(cls)
+            conta._saldo = 0
+            conta._numero_saques = 0
+            conta._posicao_saques = posicao
+            conta._numero = numero
+            conta._agencia = agencia
+            conta._cliente = cliente
+            conta._chave_cliente = chave_cliente(cliente)
+            conta.historico = Historico()
+            conta._trava = TravaConta()
+            criadas.append(conta)
+        agregados_saldo.registrar_contas((conta._chave_cliente, conta._agencia) for conta in criadas)
+        return criadas
 
     # ================================
     # Propriedades e Setters
     # ================================
     @property
     def saldo(self):
-        """Retorna o saldo atual."""
-        return self._saldo
+        """Retorna o saldo atual em reais."""
+        return para_reais(self._saldo)
 
     @saldo.setter
     def saldo(self, valor):
         """Define o saldo, impedindo valores negativos."""
-        if valor > 0:
-            self._saldo = valor
+        centavos = para_centavos(valor)
+        if centavos > 0:
+            with self._trava:
+                self._variar_saldo(centavos - self._saldo)
         else:
             raise ValueError('ERRO! Não pode ter saldo negativo')
 
+    @property
+    def saldo_centavos(self):
+        """Retorna o saldo atual exato, em centavos."""
+        return self._saldo
+
     @property
     def cliente(self):
         return self._cliente
 
     @cliente.setter
     def cliente(self, nome):
-        self._cliente = nome
+        chave = chave_cliente(nome)
+        with self._trava:
+            agregados_saldo.mover(self._chave_cliente, self._agencia, chave, self._agencia, self._saldo)
+            self._cliente = nome
+            self._chave_cliente = chave
 
     @property
     def numero(self):
@@ -131,93 +518,256 @@ class Conta:
 
     @numero.setter
     def numero(self, novo_numero=None):
-        """Gera um novo número de conta aleatório."""
-        b = random.randint(0, 10)
-        novo_numero = b
-        self._numero = novo_numero
+        """Gera um novo número de conta, único na agência da conta."""
+        self._numero = alocador_contas.alocar(self._agencia)
 
     @property
     def agencia(self):
         return self._agencia
 
     @agencia.setter
-    def agencia(self, a=None):
-        """Define uma nova agência aleatória."""
-        a = random.randint(0, 10)
-        try:
-            a = str(a)
-        except (TypeError, ValueError) as erro:
-            return f'HOUVE UM ERRO {erro}'
-        self._agencia = a
+    def agencia(self, a):
+        """Move a conta para a agência 'a' com um número livre nela (o antigo pode já existir lá)."""
+        a = str(a)
+        numero = alocador_contas.alocar(a)
+        with self._trava:
+            agregados_saldo.mover(self._chave_cliente, self._agencia, self._chave_cliente, a, self._saldo)
+            self._agencia = a
+            self._numero = numero
+            Conta._mudancas_agencia += 1
+
+    def _variar_saldo(self, diferenca: int):
+        """Altera o saldo (centavos) e os totais agregados juntos; chamar com a trava da conta."""
+        self._saldo += diferenca
+        agregados_saldo.variar(self._chave_cliente, self._agencia, diferenca)
+
+    def estatisticas_trava(self):
+        """Retorna quantas vezes a trava da conta foi obtida e quantas vezes houve disputa."""
+        return self._trava.estatisticas()
 
     # ================================
     # Métodos principais da conta
     # ================================
     def ver_saldo(self):
         """Retorna o saldo formatado."""
-        return f"O saldo atual é de R${self._saldo:.2f}"
+        return f"O saldo atual é de R${formatar(self._saldo)}"
 
+    @instrumentar("Conta.deposito", sucesso=lambda resultado: resultado is True)
     def deposito(self, valor) -> bool:
         """Realiza depósito e atualiza saldo."""
         try:
-            valor = float(valor)
+            centavos = para_centavos(valor)
         except (ValueError, TypeError) as erro:
+            registrar_falha(MOTIVO_VALOR_INVALIDO)
             return f'ERRO NA DIGITAÇÃO DO VALOR {erro}'
 
-        if valor > 0:
-            self._saldo += valor
-            print(f"Saldo atualizado! Valor R${self._saldo:.2f}")
-            return True
-        else:
-            print("Valor inválido para depósito.")
-            return False
-
-    def sacar(self, valor_sacar: float, LIMITE_SAQUES=None, limite=None) -> bool:
-        """Realiza saque, verificando limites e saldo."""
-        if not hasattr(self, "_numero_saques"):
-            self._numero_saques = 0
-
-        # Caso sem limites definidos
-        if limite is None or LIMITE_SAQUES is None:
-            if valor_sacar > 0:
-                if valor_sacar > self._saldo:
-                    print("Operação falhou. Saldo insuficiente.")
-                    return False
-                self._saldo -= valor_sacar
-                self._numero_saques += 1
-                print(f"Saque realizado com sucesso no valor de R${valor_sacar:.2f}")
+        # leitura e escrita do saldo sob a trava da própria conta
+        with self._trava:
+            if centavos > 0:
+                self._variar_saldo(centavos)
+                emitir("conta.deposito", "Saldo atualizado! Valor R${saldo:R}",
+                       agencia=self._agencia, numero=self._numero, valor=centavos, saldo=self._saldo)
                 return True
             else:
-                print("Valor inválido para saque.")
+                emitir("conta.deposito_recusado", "Valor inválido para depósito.",
+                       agencia=self._agencia, numero=self._numero, motivo=MOTIVO_VALOR_INVALIDO)
+                registrar_falha(MOTIVO_VALOR_INVALIDO)
                 return False
 
-        # Caso com limites definidos
-        else:
-            if isinstance(valor_sacar, float):
-                excedeu_saldo = valor_sacar > self._saldo
-                excedeu_valor_saque = valor_sacar > limite
-                excedeu_saques = self._numero_saques >= LIMITE_SAQUES
-
-                if excedeu_saldo:
-                    print("Operação falhou. Saldo insuficiente.")
-                    return False
-                elif excedeu_valor_saque:
-                    print("Operação falhou. Valor acima do limite de saque.")
-                    return False
-                elif excedeu_saques:
-                    print("Operação falhou. Limite de saques excedido.")
-                    return False
-                elif valor_sacar > 0:
-                    self._saldo -= valor_sacar
-                    self._numero_saques += 1
-                    print(f"Saque realizado com sucesso no valor de R${valor_sacar:.2f}")
-                    return True
-                else:
-                    print("Valor inválido para saque.")
-                    return False
+    def _recusar_saque(self, motivo, mensagem):
+        """Emite o evento da recusa e informa o motivo às métricas."""
+        emitir("conta.saque_recusado", mensagem, agencia=self._agencia, numero=self._numero, motivo=motivo)
+        registrar_falha(motivo)
+
+    @instrumentar("Conta.sacar")
+    def sacar(self, valor_sacar) -> bool:
+        """Realiza saque, verificando saldo e os limites do tipo de conta (limite e LIMITE_SAQUE)."""
+        # saldo e limite de saques são lidos e alterados sob a trava da própria conta
+        with self._trava:
+            agora = time.time()
+            resultado, centavos = self.verificar("saque", valor_sacar, agora)
+            if resultado != RESULTADO_OK:
+                self._recusar_saque(*_RECUSAS_SAQUE[resultado])
+                return False
+            self._variar_saldo(-centavos)
+            self._numero_saques += 1
+            self._consumir_saque(agora)
+            emitir("conta.saque", "Saque realizado com sucesso no valor de R${valor:R}",
+                   agencia=self._agencia, numero=self._numero, valor=centavos, saldo=self._saldo)
+            return True
+
+    def _avaliar_saque(self, centavos: int, saldo: int, agora: float) -> int:
+        """RESULTADO_* de um saque de 'centavos' (já positivo) com o saldo dado e os limites do tipo de conta."""
+        if centavos > saldo:
+            return RESULTADO_SALDO_INSUFICIENTE
+        if self.limite is not None and self.LIMITE_SAQUE is not None:
+            if centavos > para_centavos(self.limite):
+                return RESULTADO_ACIMA_LIMITE
+            if not limitador_saques.permitido(self._posicao_saques, self.LIMITE_SAQUE, self.JANELA_SAQUES, agora):
+                return RESULTADO_LIMITE_SAQUES
+        return RESULTADO_OK
+
+    def _consumir_saque(self, agora: float):
+        """Ocupa um saque da janela, se o tipo de conta limita saques (mesma regra de '_avaliar_saque')."""
+        if self.limite is not None and self.LIMITE_SAQUE is not None:
+            limitador_saques.consumir(self._posicao_saques, self.LIMITE_SAQUE, self.JANELA_SAQUES, agora)
+
+    def aplicar_lote(self, transacoes, tempo=None):
+        """Aplica em ordem uma sequência de transações sem imprimir nada.
+
+        Aceita objetos Deposito/Saque ou tuplas (tipo, valor), onde tipo é
+        "deposito"/"saque" ou a própria classe. As regras são as mesmas de
+        'deposito' e 'sacar' (limites do tipo de conta). Retorna um array com um código RESULTADO_* por item.
+        'tempo' (epoch) é o horário registrado no histórico; padrão: agora.
+        O lote inteiro é lido e convertido antes de mexer na conta: um item
+        malformado (ValueError) não deixa saldo nem limite de saques alterados.
+        """
+        resultados = array("B")
+        codigos = array("B")  # transações aceitas, para o histórico
+        valores = array("q")  # em centavos
+        codigo_deposito = Historico._codigo_operacao("Deposito")
+        codigo_saque = Historico._codigo_operacao("Saque")
+
+        agora = time.time() if tempo is None else tempo
+
+        # 1ª passada: tipo e valor em centavos de cada item (None = valor inválido)
+        itens = []
+        for item in transacoes:
+            if isinstance(item, Transacao):
+                tipo, valor = _TIPOS_LOTE.get(type(item)), item.valor
             else:
-                print("Tipo de valor inválido para saque.")
+                try:
+                    tipo, valor = item
+                except (ValueError, TypeError):
+                    raise ValueError(f"Item inválido no lote: {item!r} (esperado (tipo, valor)).") from None
+                tipo = _TIPOS_LOTE.get(tipo)
+            try:
+                valor = para_centavos(valor)
+            except (ValueError, TypeError):
+                valor = None
+            itens.append((tipo, valor))
+
+        # 2ª passada: o lote inteiro é aplicado com a conta travada (uma aquisição só)
+        with self._trava:
+            saldo = self._saldo
+            numero_saques = self._numero_saques
+
+            for tipo, valor in itens:
+                if tipo is Deposito:
+                    if valor is not None and valor > 0:
+                        saldo += valor
+                        codigos.append(codigo_deposito)
+                        valores.append(valor)
+                        resultados.append(RESULTADO_OK)
+                    else:
+                        resultados.append(RESULTADO_VALOR_INVALIDO)
+
+                elif tipo is Saque:
+                    if valor is None or valor <= 0:
+                        resultado = RESULTADO_VALOR_INVALIDO
+                    else:
+                        resultado = self._avaliar_saque(valor, saldo, agora)
+                    if resultado == RESULTADO_OK:
+                        saldo -= valor
+                        numero_saques += 1
+                        self._consumir_saque(agora)
+                        codigos.append(codigo_saque)
+                        valores.append(valor)
+                    resultados.append(resultado)
+
+                else:
+                    resultados.append(RESULTADO_TIPO_INVALIDO)
+
+            self._variar_saldo(saldo - self._saldo)
+            self._numero_saques = numero_saques
+            self.historico.adicionar_lote(codigos, valores, agora)
+            return resultados
+
+    def verificar(self, tipo, valor, agora=None):
+        """Resultado que a transação (tipo, valor) teria agora, sem aplicá-la: (RESULTADO_*, centavos).
+
+        Segue as regras de 'sacar' e 'aplicar_lote' (limites do tipo de conta).
+        Chamar com a trava da conta, para que o resultado ainda valha quando a
+        transação for aplicada com 'reaplicar' (o WAL grava entre as duas).
+        """
+        operacao = _TIPOS_LOTE.get(tipo)
+        if operacao is None:
+            return RESULTADO_TIPO_INVALIDO, 0
+        try:
+            centavos = para_centavos(valor)
+        except (ValueError, TypeError):
+            return RESULTADO_VALOR_INVALIDO, 0
+        if centavos <= 0:
+            return RESULTADO_VALOR_INVALIDO, centavos
+        if operacao is Saque:
+            return self._avaliar_saque(centavos, self._saldo, time.time() if agora is None else agora), centavos
+        return RESULTADO_OK, centavos
+
+    def _recusar_transferencia(self, motivo, mensagem):
+        """Emite o evento da recusa e informa o motivo às métricas."""
+        emitir("conta.transferencia_recusada", mensagem, agencia=self._agencia, numero=self._numero, motivo=motivo)
+        registrar_falha(motivo)
+
+    @instrumentar("Conta.transferir")
+    def transferir(self, destino, valor) -> bool:
+        """Transfere 'valor' desta conta para 'destino': débito, crédito e históricos mudam juntos.
+
+        As duas contas são travadas na ordem global, então transferências
+        simultâneas em sentidos opostos não travam uma à outra.
+        """
+        if not isinstance(destino, Conta):
+            self._recusar_transferencia(MOTIVO_CONTA_INVALIDA, "Conta de destino inválida.")
+            return False
+        if destino is self:
+            self._recusar_transferencia(MOTIVO_MESMA_CONTA, "Não é possível transferir para a própria conta.")
+            return False
+        try:
+            centavos = para_centavos(valor)
+        except (ValueError, TypeError):
+            centavos = 0
+        if centavos <= 0:
+            self._recusar_transferencia(MOTIVO_VALOR_INVALIDO, "Valor inválido para transferência.")
+            return False
+
+        with travar_contas(self, destino):
+            if centavos > self._saldo:
+                self._recusar_transferencia(MOTIVO_SALDO_INSUFICIENTE, "Operação falhou. Saldo insuficiente.")
                 return False
+            identificador = novo_id_transferencia()
+            _efetivar_transferencia(self, destino, centavos, time.time(), identificador)
+            emitir("conta.transferencia",
+                   "Transferência de R${valor:R} para a conta {destino_numero} realizada com sucesso.",
+                   agencia=self._agencia, numero=self._numero, destino_agencia=destino._agencia,
+                   destino_numero=destino._numero, valor=centavos, saldo=self._saldo, transferencia=identificador)
+            return True
+
+    def reaplicar(self, tipo, centavos: int, tempo: float):
+        """Reaplica um depósito/saque já aceito antes (recuperação pelo WAL), sem validar de novo."""
+        operacao = _TIPOS_LOTE[tipo]
+        with self._trava:
+            if operacao is Deposito:
+                self._variar_saldo(centavos)
+            else:
+                self._variar_saldo(-centavos)
+                self._numero_saques += 1
+                self._consumir_saque(tempo)
+            codigo = Historico._codigo_operacao(operacao.__name__)
+            self.historico.adicionar_lote(array("B", [codigo]), array("q", [centavos]), tempo)
+
+    def capturar(self):
+        """Retorna saldo, contadores de saque e histórico para um snapshot."""
+        with self._trava:
+            return (self._saldo, self._numero_saques, self.historico.capturar(),
+                    limitador_saques.estado(self._posicao_saques))
+
+    def restaurar(self, estado):
+        """Substitui saldo, contadores de saque e histórico pelos de um snapshot."""
+        saldo, numero_saques, historico, janela_saques = estado
+        with self._trava:
+            self._variar_saldo(saldo - self._saldo)
+            self._numero_saques = numero_saques
+            limitador_saques.restaurar_estado(self._posicao_saques, janela_saques)
+            self.historico.restaurar(historico)
 
     @classmethod
     def adicionar_conta(cls, cliente, numero: int):
@@ -225,17 +775,156 @@ class Conta:
         return cls(cliente, numero)
 
 
+# Tipos aceitos nas tuplas (tipo, valor) de Conta.aplicar_lote
+_TIPOS_LOTE = {
+    "deposito": Deposito,
+    "saque": Saque,
+    Deposito: Deposito,
+    Saque: Saque,
+}
+
+# Motivo e mensagem de cada recusa de Conta.sacar
+_RECUSAS_SAQUE = {
+    RESULTADO_VALOR_INVALIDO: (MOTIVO_VALOR_INVALIDO, "Valor inválido para saque."),
+    RESULTADO_SALDO_INSUFICIENTE: (MOTIVO_SALDO_INSUFICIENTE, "Operação falhou. Saldo insuficiente."),
+    RESULTADO_ACIMA_LIMITE: (MOTIVO_ACIMA_LIMITE, "Operação falhou. Valor acima do limite de saque."),
+    RESULTADO_LIMITE_SAQUES: (MOTIVO_LIMITE_SAQUES, "Operação falhou. Limite de saques excedido."),
+}
+
+
+# ========================================
+# TRANSFERÊNCIAS ENTRE CONTAS
+# ========================================
+def novo_id_transferencia() -> int:
+    """Reserva o identificador de uma transferência (para gravá-lo no WAL antes de aplicá-la)."""
+    return next(_ids_transferencia)
+
+
+def _efetivar_transferencia(origem, destino, centavos, tempo, identificador):
+    """Debita, credita e registra as duas entradas ligadas; chamar com as duas contas travadas."""
+    origem._variar_saldo(-centavos)
+    destino._variar_saldo(centavos)
+    origem.historico.adicionar_lote(array("B", [Historico._codigo_operacao(OPERACAO_TRANSFERENCIA_ENVIADA)]),
+                                    array("q", [centavos]), tempo,
+                                    [(identificador, destino._agencia, destino._numero)])
+    destino.historico.adicionar_lote(array("B", [Historico._codigo_operacao(OPERACAO_TRANSFERENCIA_RECEBIDA)]),
+                                     array("q", [centavos]), tempo,
+                                     [(identificador, origem._agencia, origem._numero)])
+
+
+def transferir_lote(transferencias, tempo=None):
+    """Aplica em ordem transferências (origem, destino, valor) sem imprimir nada.
+
+    Todas as contas envolvidas são travadas uma vez só (na ordem global) e o lote
+    inteiro aparece de uma vez para as outras threads; cada conta recebe suas
+    entradas no histórico num único acréscimo. As regras são as de 'Conta.transferir'.
+    Retorna um array com um código RESULTADO_* por transferência.
+    """
+    transferencias = list(transferencias)
+    contas = {}
+    for origem, destino, _ in transferencias:
+        for conta in (origem, destino):
+            if isinstance(conta, Conta):
+                contas[id(conta)] = conta
+
+    resultados = array("B")
+    entradas = {}  # id da conta -> (códigos, centavos, vínculos) a acrescentar no histórico
+    codigo_enviada = Historico._codigo_operacao(OPERACAO_TRANSFERENCIA_ENVIADA)
+    codigo_recebida = Historico._codigo_operacao(OPERACAO_TRANSFERENCIA_RECEBIDA)
+    agora = time.time() if tempo is None else tempo
+
+    with travar_contas(*contas.values()):
+        saldos = {chave: conta._saldo for chave, conta in contas.items()}
+        for origem, destino, valor in transferencias:
+            if not (isinstance(origem, Conta) and isinstance(destino, Conta)):
+                resultados.append(RESULTADO_CONTA_INVALIDA)
+                continue
+            if origem is destino:
+                resultados.append(RESULTADO_MESMA_CONTA)
+                continue
+            try:
+                centavos = para_centavos(valor)
+            except (ValueError, TypeError):
+                centavos = 0
+            chave_origem, chave_destino = id(origem), id(destino)
+            if centavos <= 0:
+                resultados.append(RESULTADO_VALOR_INVALIDO)
+                continue
+            if centavos > saldos[chave_origem]:
+                resultados.append(RESULTADO_SALDO_INSUFICIENTE)
+                continue
+
+            saldos[chave_origem] -= centavos
+            saldos[chave_destino] += centavos
+            identificador = novo_id_transferencia()
+            for chave, codigo, outra in ((chave_origem, codigo_enviada, destino),
+                                         (chave_destino, codigo_recebida, origem)):
+                codigos, valores, vinculos = entradas.get(chave) or entradas.setdefault(
+                    chave, (array("B"), array("q"), []))
+                codigos.append(codigo)
+                valores.append(centavos)
+                vinculos.append((identificador, outra._agencia, outra._numero))
+            resultados.append(RESULTADO_OK)
+
+        for chave, (codigos, valores, vinculos) in entradas.items():
+            conta = contas[chave]
+            conta._variar_saldo(saldos[chave] - conta._saldo)
+            conta.historico.adicionar_lote(codigos, valores, agora, vinculos)
+    return resultados
+
+
+def verificar_transferencia(origem, destino, valor):
+    """Resultado que a transferência teria agora, sem aplicá-la: (RESULTADO_*, centavos).
+
+    Chamar com as duas contas travadas ('travar_contas'), para que o resultado ainda
+    valha quando ela for aplicada com 'reaplicar_transferencia'.
+    """
+    if not (isinstance(origem, Conta) and isinstance(destino, Conta)):
+        return RESULTADO_CONTA_INVALIDA, 0
+    if origem is destino:
+        return RESULTADO_MESMA_CONTA, 0
+    try:
+        centavos = para_centavos(valor)
+    except (ValueError, TypeError):
+        return RESULTADO_VALOR_INVALIDO, 0
+    if centavos <= 0:
+        return RESULTADO_VALOR_INVALIDO, centavos
+    if centavos > origem._saldo:
+        return RESULTADO_SALDO_INSUFICIENTE, centavos
+    return RESULTADO_OK, centavos
+
+
+def reaplicar_transferencia(origem, destino, centavos: int, tempo: float, identificador: int = None):
+    """Reaplica uma transferência já aceita antes (recuperação pelo WAL), sem validar de novo.
+
+    'identificador' é o gravado no WAL (o mesmo da operação original); sem ele, um novo é reservado.
+    """
+    if identificador is None:
+        identificador = novo_id_transferencia()
+    with travar_contas(origem, destino):
+        _efetivar_transferencia(origem, destino, centavos, tempo, identificador)
+
+
 # ========================================
 # CLASSE CONTA CORRENTE (HERDA DE CONTA)
 # ========================================
 class ContaConrente(Conta):
-    """Classe que representa uma conta corrente com limites."""
+    """Classe que representa uma conta corrente com limites (LIMITE_SAQUE saques por JANELA_SAQUES)."""
 
-    def __init__(self, cliente, numero: int, limite: float = 500, LIMITE_SAQUE: int = 3):
-        super().__init__(cliente, numero)
+    def __init__(self, cliente, numero: int, limite: float = 500, LIMITE_SAQUE: int = 3, agencia: str = "0001"):
+        super().__init__(cliente, numero, agencia)
         self.limite = limite
         self.LIMITE_SAQUE = LIMITE_SAQUE
 
+    @classmethod
+    def criar_lote(cls, contas, limite: float = 500, LIMITE_SAQUE: int = 3):
+        """Cria de uma vez as contas correntes (cliente, número, agência), todas com os mesmos limites."""
+        criadas = super().criar_lote(contas)
+        for conta in criadas:
+            conta.limite = limite
+            conta.LIMITE_SAQUE = LIMITE_SAQUE
+        return criadas
+
 
 # ========================================
 # CLASSE CLIENTE
@@ -246,12 +935,17 @@ class Cliente:
     def __init__(self, endereco):
         self.endereco = endereco
         self._contas = []
+        # Índice agência -> posições (crescentes) em _contas, completado na consulta
+        # (as contas também são acrescentadas direto em _contas, ex: pelo servidor)
+        self._por_agencia = {}
+        self._indexadas = None  # (lista indexada, quantas contas dela, _mudancas_agencia de então)
 
     def adicionar_conta(self, conta):
         """Adiciona uma conta ao cliente."""
         if isinstance(conta, Conta):
             self._contas.append(conta)
-            print("Conta adicionada com sucesso ao cliente.")
+            emitir("cliente.conta_adicionada", "Conta adicionada com sucesso ao cliente.",
+                   agencia=conta.agencia, numero=conta.numero)
         else:
             return 'Erro ao adicionar a conta'
 
@@ -260,13 +954,76 @@ class Cliente:
         if isinstance(conta, Conta):
             transacao.registrar(conta)
 
-    def listar_contas(self):
-        """Lista todas as contas associadas ao cliente."""
-        if not self._contas:
-            print("Nenhuma conta associada ao cliente.")
+    def realizar_transacoes(self, conta, transacoes):
+        """Executa em lote uma sequência de transações em uma conta (com os limites do tipo dela).
+
+        Retorna o array de códigos RESULTADO_* (um por transação) ou None se a conta for inválida.
+        """
+        if isinstance(conta, Conta):
+            return conta.aplicar_lote(transacoes)
+
+    @property
+    def saldo_total(self):
+        """Soma dos saldos de todas as contas do cliente, em reais (como Conta.saldo), em O(1)."""
+        return para_reais(agregados_saldo.saldo_cliente(chave_cliente(self)))
+
+    @property
+    def saldo_total_centavos(self):
+        """Soma exata (em centavos) dos saldos de todas as contas do cliente, em O(1)."""
+        return agregados_saldo.saldo_cliente(chave_cliente(self))
+
+    def iterar_contas(self, agencia=None):
+        """Itera (preguiçosamente) sobre as contas do cliente, opcionalmente só as de uma agência."""
+        for conta in self._contas:
+            if agencia is None or conta.agencia == agencia:
+                yield conta
+
+    def _posicoes_da_agencia(self, agencia):
+        """Posições (crescentes) em _contas das contas da agência, indexando antes as acrescentadas depois."""
+        contas = self._contas
+        lista, quantidade, mudancas = self._indexadas or (None, 0, None)
+        if lista is not contas or mudancas != Conta._mudancas_agencia:
+            self._por_agencia, quantidade = {}, 0  # lista trocada ou conta mudou de agência: refaz
+        mudancas = Conta._mudancas_agencia
+        for posicao in range(quantidade, len(contas)):
+            posicoes = self._por_agencia.get(contas[posicao].agencia)
+            if posicoes is None:
+                posicoes = self._por_agencia[contas[posicao].agencia] = array("I")
+            posicoes.append(posicao)
+        self._indexadas = (contas, len(contas), mudancas)
+        return self._por_agencia.get(agencia, ())
+
+    def contas(self, tamanho: int = None, token: str = None, agencia=None):
+        """Página de contas do cliente (na ordem em que foram adicionadas) e o token da seguinte.
+
+        Com 'agencia', a página sai do índice por agência (busca binária pelo token), sem percorrer as outras contas.
+        """
+        filtros = ("contas_cliente", agencia)
+        inicio = ler_token(token, filtros)
+        contas = self._contas
+        if agencia is None:
+            posicoes = range(inicio, len(contas))
         else:
-            for conta in self._contas:
-                print(f"Agência: {conta.agencia} | Número: {conta.numero} | Saldo: R${conta.saldo:.2f}")
+            indice = self._posicoes_da_agencia(agencia)
+            posicoes = (indice[i] for i in range(bisect_left(indice, inicio), len(indice)))
+        return paginar(((posicao, contas[posicao]) for posicao in posicoes), tamanho, filtros)
+
+    def total_paginas(self, tamanho: int = None) -> int:
+        tamanho = tamanho_pagina(tamanho)
+        return (len(self._contas) + tamanho - 1) // tamanho
+
+    def listar_contas(self, pagina: int = None, tamanho: int = None) -> Pagina:
+        """Contas do cliente: todas ou só a página 'pagina' (começando em 1), sem imprimir nada.
+
+        Lança ValueError se a página não existe (a página 1 sempre existe, mesmo vazia).
+        """
+        if pagina is None:
+            return Pagina(list(self._contas))
+        tamanho = tamanho_pagina(tamanho)
+        total = self.total_paginas(tamanho)
+        if not 1 <= pagina <= max(1, total):
+            raise ValueError(f"Página {pagina} não existe: o cliente tem {total} página(s) de contas.")
+        return self.contas(tamanho, gerar_token((pagina - 1) * tamanho, ("contas_cliente", None)))
 
 
 # ========================================
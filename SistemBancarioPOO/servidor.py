@@ -0,0 +1,417 @@
+# ==========================================================
+# SERVIDOR DE TRANSAÇÕES (asyncio)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Expõe as classes Conta/Cliente/Historico por TCP local ou
+#     socket Unix, atendendo milhares de conexões num único event loop.
+#   - Protocolo: uma requisição JSON por linha, uma resposta JSON por
+#     linha, na mesma ordem. O cliente pode mandar várias requisições
+#     sem esperar as respostas (pipelining).
+#
+#   Requisições ("op" + campos):
+#     criar_cliente  cpf, nome, data_nascimento, endereco
+#     criar_conta    cpf [, agencia, numero] -> numero, agencia
+#                    (sem número, o alocador escolhe um livre)
+#     deposito       numero, valor       -> saldo
+#     saque          numero, valor       -> saldo
+#     transferencia  origem, destino, valor -> saldo (da origem), transferencia
+#                    (identificador que liga as entradas dos dois extratos)
+#     extrato        numero [, inicio, fim, operacao, limite, token] -> saldo, transacoes
+#                    (inicio/fim em epoch: só o período, por busca binária;
+#                    com limite/token, uma página e o token "proximo")
+#     listar_contas  cpf [, agencia, limite, token] -> contas, proximo
+#   Respostas: {"ok": true, ...} ou {"ok": false, "erro": "..."}; um erro
+#   inesperado vira "Erro interno do servidor." (com o traceback no stderr)
+#   e a conexão continua atendendo as requisições seguintes.
+#
+#   Com --dados, cada alteração aceita vai para um WAL (group commit
+#   assíncrono, para não bloquear o event loop esperando o fsync) e o
+#   estado é recuperado do último snapshot + final do WAL ao reiniciar.
+#   Toda operação segue a mesma ordem: validar, gravar no WAL, aplicar e
+#   responder. O snapshot periódico só copia o estado no event loop; a
+#   serialização e o fsync dele acontecem numa thread de fundo.
+#
+# Uso (a partir da raiz do repositório):
+#   python -m SistemBancarioPOO.servidor --porta 8765
+#   python -m SistemBancarioPOO.servidor --unix /tmp/banco.sock
+#   python -m SistemBancarioPOO.servidor --dados dados_servidor
+#   python -m SistemBancarioPOO.servidor --dados dados_servidor --importar parceiro.csv
+#     (importa a base de clientes em massa antes de começar a atender)
+# ==========================================================
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import traceback
+
+from banco.alocador_contas import AlocadorContas
+from banco.eventos import DestinoNulo, emitir, eventos
+from banco.importador_clientes import MOTIVO_CONTA_EXISTENTE, importar_clientes
+from banco.persistencia import Armazenamento
+
+from SistemBancarioPOO.modelos.Conta import (
+    RESULTADO_ACIMA_LIMITE,
+    RESULTADO_CONTA_INVALIDA,
+    RESULTADO_LIMITE_SAQUES,
+    RESULTADO_MESMA_CONTA,
+    RESULTADO_OK,
+    RESULTADO_SALDO_INSUFICIENTE,
+    RESULTADO_TIPO_INVALIDO,
+    RESULTADO_VALOR_INVALIDO,
+    ContaConrente,
+    PessoaFisica,
+    alocador_contas,
+    novo_id_transferencia,
+    reaplicar_transferencia,
+    travar_contas,
+    verificar_transferencia,
+)
+
+# Mensagem devolvida para cada código de resultado das operações
+MENSAGENS_RESULTADO = {
+    RESULTADO_VALOR_INVALIDO: "Valor inválido.",
+    RESULTADO_SALDO_INSUFICIENTE: "Saldo insuficiente.",
+    RESULTADO_ACIMA_LIMITE: "Valor acima do limite de saque.",
+    RESULTADO_LIMITE_SAQUES: "Limite de saques excedido.",
+    RESULTADO_TIPO_INVALIDO: "Tipo de transação inválido.",
+    RESULTADO_MESMA_CONTA: "Não é possível transferir para a própria conta.",
+    RESULTADO_CONTA_INVALIDA: "Conta inválida.",
+}
+
+
+class ErroRequisicao(Exception):
+    """Erro de uma requisição; a mensagem volta para o cliente."""
+
+
+class BancoServidor:
+    """Estado do banco (clientes e contas) e tratamento das requisições."""
+
+    AGENCIA = "0001"
+
+    def __init__(self, diretorio_dados=None, registros_por_snapshot=100_000):
+        self.clientes = {}  # cpf -> PessoaFisica
+        self.contas = {}  # numero -> ContaConrente (agência AGENCIA, salvo as importadas ou abertas em outra)
+        self.alocador = alocador_contas
+        self.armazenamento = None
+        if diretorio_dados:
+            os.makedirs(diretorio_dados, exist_ok=True)
+            # marca d'água própria: números entregues antes de reiniciar nunca voltam a ser usados
+            self.alocador = AlocadorContas(os.path.join(diretorio_dados, "alocador_contas.json"), digitos=8)
+            self.armazenamento = Armazenamento(
+                diretorio_dados, self.capturar, self.restaurar, self.aplicar,
+                modo="assincrono", registros_por_snapshot=registros_por_snapshot, snapshot_em_fundo=True,
+            )
+            self.armazenamento.recuperar()
+        self.operacoes = {
+            "criar_cliente": self.criar_cliente,
+            "criar_conta": self.criar_conta,
+            "deposito": self.deposito,
+            "saque": self.saque,
+            "transferencia": self.transferencia,
+            "extrato": self.extrato,
+            "listar_contas": self.listar_contas,
+        }
+
+    # ================================
+    # Persistência (WAL + snapshots)
+    # ================================
+    def _efetivar(self, registro):
+        """Grava no WAL o registro já validado e só então o aplica em memória.
+
+        Quem chama valida tudo o que poderia fazer 'aplicar' falhar antes de chegar aqui.
+        """
+        if self.armazenamento is not None:
+            self.armazenamento.registrar(registro)
+        self.aplicar(registro)
+
+    def _talvez_snapshot(self):
+        """Snapshot quando for a hora; chamar depois de aplicar, fora das travas das contas."""
+        if self.armazenamento is not None:
+            self.armazenamento.talvez_snapshot()
+
+    def _ignorar(self, registro, motivo):
+        """Avisa que um registro do WAL não pôde ser reaplicado (o resto da recuperação continua)."""
+        emitir("servidor.registro_ignorado", "Registro do WAL ignorado ({motivo}): {registro}",
+               motivo=motivo, registro=repr(registro))
+
+    def aplicar(self, registro):
+        """Reaplica um registro do WAL:
+        ("cliente", cpf, nome, data, endereco), ("conta", cpf, numero [, agencia]),
+        ("clientes_lote", [(nome, cpf, data, endereco), ...]),
+        ("contas_lote", [(cpf, numero, agencia), ...]),
+        ("transferencia", origem, destino, centavos, epoch, identificador) ou
+        ("deposito"/"saque", numero, centavos, epoch).
+        Um registro que cita cliente ou conta inexistente é ignorado com um evento
+        "servidor.registro_ignorado" em vez de interromper a recuperação.
+        """
+        operacao = registro[0]
+        clientes, contas = self.clientes, self.contas
+        if operacao == "cliente":
+            clientes[registro[1]] = PessoaFisica(registro[2], registro[1], registro[3], registro[4])
+        elif operacao == "conta":
+            cliente = clientes.get(registro[1])
+            if cliente is None:
+                return self._ignorar(registro, f"cliente {registro[1]} não encontrado")
+            self._abrir_conta(cliente, *registro[2:])
+        elif operacao == "clientes_lote":
+            for nome, cpf, data_nascimento, endereco in registro[1]:
+                clientes[cpf] = PessoaFisica(nome, cpf, data_nascimento, endereco)
+        elif operacao == "contas_lote":
+            linhas = [(clientes[cpf], numero, agencia) for cpf, numero, agencia in registro[1] if cpf in clientes]
+            if len(linhas) < len(registro[1]):
+                self._ignorar(("contas_lote", [linha for linha in registro[1] if linha[0] not in clientes]),
+                              "clientes não encontrados")
+            for conta in ContaConrente.criar_lote(linhas):
+                conta.cliente._contas.append(conta)
+                contas[conta.numero] = conta
+            self.alocador.reservar_lote((self.AGENCIA, numero) for _, numero, _ in linhas)
+        elif operacao == "transferencia":
+            _, origem, destino, centavos, tempo, *identificador = registro  # WALs antigos não têm o identificador
+            if origem not in contas or destino not in contas:
+                return self._ignorar(registro, "conta não encontrada")
+            reaplicar_transferencia(contas[origem], contas[destino], centavos, tempo, *identificador)
+        else:
+            _, numero, centavos, tempo = registro
+            conta = contas.get(numero)
+            if conta is None:
+                return self._ignorar(registro, f"conta {numero} não encontrada")
+            conta.reaplicar(operacao, centavos, tempo)
+
+    def capturar(self):
+        """Estado inteiro do banco para o snapshot."""
+        # contas fora da agência padrão (importadas) guardam o par (número, agência)
+        clientes = [(cpf, c._nome, c._data_nascimento, c.endereco,
+                     [conta.numero if conta.agencia == self.AGENCIA else (conta.numero, conta.agencia)
+                      for conta in c._contas])
+                    for cpf, c in self.clientes.items()]
+        contas = {numero: conta.capturar() for numero, conta in self.contas.items()}
+        return {"clientes": clientes, "contas": contas}
+
+    def restaurar(self, estado):
+        self.clientes = {}
+        self.contas = {}
+        for cpf, nome, data_nascimento, endereco, numeros in estado["clientes"]:
+            cliente = PessoaFisica(nome, cpf, data_nascimento, endereco)
+            self.clientes[cpf] = cliente
+            for numero in numeros:
+                numero, agencia = numero if isinstance(numero, tuple) else (numero, self.AGENCIA)
+                self._abrir_conta(cliente, numero, agencia).restaurar(estado["contas"][numero])
+
+    def fechar(self):
+        """Grava o que falta do WAL e tira um snapshot final."""
+        if self.armazenamento is not None:
+            self.armazenamento.fechar()
+
+    # ================================
+    # Operações
+    # ================================
+    def criar_cliente(self, cpf, nome, data_nascimento="", endereco=""):
+        cpf = str(cpf)
+        if cpf in self.clientes:
+            raise ErroRequisicao("Cliente já cadastrado.")
+        self._efetivar(("cliente", cpf, nome, data_nascimento, endereco))
+        self._talvez_snapshot()
+        return {}
+
+    def _abrir_conta(self, cliente, numero, agencia=AGENCIA):
+        conta = ContaConrente(cliente, numero, agencia=agencia)
+        cliente._contas.append(conta)
+        self.contas[numero] = conta
+        # o número é único no banco todo: reservado na agência onde o alocador entrega os números
+        self.alocador.reservar(self.AGENCIA, numero)
+        return conta
+
+    def criar_conta(self, cpf, agencia=None, numero=None):
+        cpf = str(cpf)
+        cliente = self.clientes.get(cpf)
+        if cliente is None:
+            raise ErroRequisicao("Cliente não encontrado.")
+        if numero is None:
+            numero = self.alocador.alocar(self.AGENCIA)  # as contas existentes estão reservadas nele
+        elif type(numero) is not int or numero < 0:
+            raise ErroRequisicao("Número de conta inválido.")  # validado aqui: o WAL só recebe contas que abrem
+        elif numero in self.contas:
+            raise ErroRequisicao("Conta já existe.")
+        if agencia is not None and not str(agencia).isdigit():
+            raise ErroRequisicao("Agência inválida.")
+        registro = ("conta", cpf, numero) if agencia in (None, self.AGENCIA) else ("conta", cpf, numero, str(agencia))
+        self._efetivar(registro)
+        self._talvez_snapshot()
+        return {"numero": numero, "agencia": self.contas[numero].agencia}
+
+    # ================================
+    # Importação em massa
+    # ================================
+    def _validar_conta_importada(self, agencia, numero):
+        # aqui as contas são identificadas só pelo número: ele não pode se repetir nem entre agências
+        if numero in self.contas or numero in self._numeros_do_lote:
+            return MOTIVO_CONTA_EXISTENTE
+        self._numeros_do_lote.add(numero)  # última checagem da linha: ela será importada
+        return None
+
+    def _inserir_lote(self, clientes, contas):
+        """Cria os clientes e as contas de um lote da importação (um registro no WAL para cada)."""
+        # os números informados no lote são reservados antes: o alocador não os entrega às outras linhas
+        self.alocador.reservar_lote((self.AGENCIA, numero) for numero in self._numeros_do_lote)
+        self._numeros_do_lote = set()
+        faltando = sum(1 for _, _, numero in contas if numero is None)
+        novos = iter(self.alocador.alocar_lote([self.AGENCIA] * faltando))
+        linhas = []
+        for cpf, agencia, numero in contas:
+            if numero is None:
+                numero = next(novos)
+                agencia = self.AGENCIA
+            else:
+                agencia = f"{agencia:04d}"
+            linhas.append((cpf, numero, agencia))
+        for registro in (("clientes_lote", clientes), ("contas_lote", linhas)):
+            self._efetivar(registro)
+        self._talvez_snapshot()
+
+    def importar_clientes(self, caminho, rejeitadas=None, tamanho_lote=20_000):
+        """Importa um CSV de clientes (uma conta corrente por cliente) e retorna o resumo."""
+        self._numeros_do_lote = set()
+        return importar_clientes(caminho, self.clientes.__contains__, self._validar_conta_importada,
+                                 self._inserir_lote, rejeitadas, tamanho_lote)
+
+    def _conta(self, numero):
+        conta = self.contas.get(numero)
+        if conta is None:
+            raise ErroRequisicao("Conta não encontrada.")
+        return conta
+
+    def _movimentar(self, tipo, numero, valor):
+        conta = self._conta(numero)
+        tempo = time.time()
+        # a conta fica travada da validação até a aplicação: o que foi validado é o que vai para o WAL
+        with conta._trava:
+            resultado, centavos = conta.verificar(tipo, valor, tempo)
+            if resultado != RESULTADO_OK:
+                raise ErroRequisicao(MENSAGENS_RESULTADO[resultado])
+            # só o efeito aceito vai para o WAL (a recuperação não valida de novo)
+            self._efetivar((tipo, numero, centavos, tempo))
+            saldo = conta.saldo
+        self._talvez_snapshot()
+        return {"saldo": saldo}
+
+    def deposito(self, numero, valor):
+        return self._movimentar("deposito", numero, valor)
+
+    def saque(self, numero, valor):
+        return self._movimentar("saque", numero, valor)
+
+    def transferencia(self, origem, destino, valor):
+        conta_origem, conta_destino = self._conta(origem), self._conta(destino)
+        tempo = time.time()
+        with travar_contas(conta_origem, conta_destino):
+            resultado, centavos = verificar_transferencia(conta_origem, conta_destino, valor)
+            if resultado != RESULTADO_OK:
+                raise ErroRequisicao(MENSAGENS_RESULTADO[resultado])
+            identificador = novo_id_transferencia()  # vai no WAL: a recuperação recria o mesmo vínculo
+            self._efetivar(("transferencia", origem, destino, centavos, tempo, identificador))
+            saldo = conta_origem.saldo
+        self._talvez_snapshot()
+        return {"saldo": saldo, "transferencia": identificador}
+
+    def extrato(self, numero, inicio=None, fim=None, operacao=None, limite=None, token=None):
+        conta = self._conta(numero)
+        if limite is None and token is None:
+            return {"saldo": conta.saldo, "transacoes": list(conta.historico.periodo(inicio, fim, operacao))}
+        pagina = conta.historico.pagina(limite, token, inicio, fim, operacao)
+        return {"saldo": conta.saldo, "transacoes": pagina.itens, "proximo": pagina.proximo}
+
+    def listar_contas(self, cpf, agencia=None, limite=None, token=None):
+        cliente = self.clientes.get(str(cpf))
+        if cliente is None:
+            raise ErroRequisicao("Cliente não encontrado.")
+        pagina = cliente.contas(limite, token, agencia)
+        return {"contas": [{"numero": conta.numero, "agencia": conta.agencia, "saldo": conta.saldo}
+                           for conta in pagina],
+                "proximo": pagina.proximo}
+
+    # ================================
+    # Protocolo
+    # ================================
+    def executar(self, requisicao: dict) -> dict:
+        """Executa uma requisição ({"op": ..., campos}) e devolve a resposta ({"ok": ...})."""
+        try:
+            campos = dict(requisicao)
+            operacao = self.operacoes.get(campos.pop("op", None))
+            if operacao is None:
+                raise ErroRequisicao("Operação desconhecida.")
+            resposta = {"ok": True}
+            resposta.update(operacao(**campos))
+        except ErroRequisicao as erro:
+            resposta = {"ok": False, "erro": str(erro)}
+        except (ValueError, TypeError) as erro:
+            resposta = {"ok": False, "erro": f"Requisição inválida: {erro}"}
+        except Exception as erro:  # erro inesperado: não pode derrubar a conexão (e as requisições na fila dela)
+            traceback.print_exc()  # no stderr mesmo com os eventos descartados (DestinoNulo)
+            emitir("servidor.erro_interno", "Erro inesperado na requisição {requisicao}: {erro}",
+                   requisicao=repr(requisicao), erro=repr(erro), rastreamento=traceback.format_exc())
+            resposta = {"ok": False, "erro": "Erro interno do servidor."}
+        return resposta
+
+    def responder(self, linha: bytes) -> bytes:
+        """Trata uma linha de requisição e devolve a linha de resposta."""
+        try:
+            resposta = self.executar(json.loads(linha))
+        except ValueError as erro:
+            resposta = {"ok": False, "erro": f"Requisição inválida: {erro}"}
+        return json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atende uma conexão: responde cada linha na ordem em que chegou."""
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                escritor.write(self.responder(linha))
+                # só espera o envio quando o buffer de saída enche (pipelining)
+                await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+
+async def iniciar_servidor(banco=None, host="127.0.0.1", porta=8765, unix=None):
+    """Cria e retorna o asyncio.Server (TCP ou socket Unix)."""
+    banco = banco or BancoServidor()
+    if unix:
+        return await asyncio.start_unix_server(banco.atender, path=unix)
+    return await asyncio.start_server(banco.atender, host, porta, backlog=4096)
+
+
+async def _principal(opcoes):
+    eventos.usar(DestinoNulo())  # as respostas vão pelo protocolo; nada é impresso por operação
+    banco = BancoServidor(opcoes.dados)
+    if opcoes.importar:
+        print(banco.importar_clientes(opcoes.importar, opcoes.rejeitadas))
+    servidor = await iniciar_servidor(banco, host=opcoes.host, porta=opcoes.porta, unix=opcoes.unix)
+    enderecos = ", ".join(str(sock.getsockname()) for sock in servidor.sockets)
+    print(f"Servidor do banco ouvindo em {enderecos} ({len(banco.contas)} contas carregadas)")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        banco.fechar()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de transações do banco.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--unix", help="caminho do socket Unix (em vez de TCP)")
+    parser.add_argument("--dados", help="diretório do WAL e dos snapshots (sem ele o estado fica só em memória)")
+    parser.add_argument("--importar", help="CSV de clientes importado em massa antes de atender")
+    parser.add_argument("--rejeitadas", help="CSV onde gravar as linhas recusadas na importação")
+    try:
+        asyncio.run(_principal(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("\nSERVIDOR ENCERRADO.")
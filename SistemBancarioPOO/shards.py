@@ -0,0 +1,320 @@
+# ==========================================================
+# CONTAS DIVIDIDAS EM SHARDS (UM PROCESSO POR SHARD)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Num processo só, o GIL limita o banco a um núcleo. Aqui as
+#     contas são divididas entre processos trabalhadores (shards); cada
+#     um roda seu próprio BancoServidor (com WAL e snapshots em
+#     'diretorio_dados/shard-N', quando há diretório).
+#   - Partição:
+#       "numero"  -> (padrão) o próprio número escolhe o shard
+#                    (numero % shards), sem tabela nenhuma no roteador
+#       "agencia" -> a agência da conta escolhe o shard (int % shards);
+#                    o roteador guarda número -> shard para achar a conta.
+#                    Só equilibra a carga com muitas agências: contas
+#                    abertas sem agência ficam todas na agência padrão,
+#                    isto é, num shard só.
+#   - O roteador fala com os shards por pipes. 'executar_lote' separa as
+#     requisições por shard, manda uma mensagem para cada shard envolvido
+#     (todos trabalham ao mesmo tempo) e devolve as respostas na ordem
+#     original. Dentro de um shard a ordem do lote é mantida; entre
+#     shards diferentes, não há ordem.
+#   - Transferências só entre contas do mesmo shard (lá elas são
+#     atômicas); entre shards diferentes a requisição é recusada.
+#   - Os números de conta saem do alocador do roteador (únicos no banco
+#     todo); os clientes são replicados em todos os shards (poucos e
+#     raramente alterados), as contas ficam só no shard dono.
+#   - Mensagens por pipe custam dezenas de microssegundos: a vazão
+#     escala com os núcleos quando as requisições vêm em lotes; uma
+#     requisição por vez paga a ida e volta inteira.
+#
+# Uso (os shards são iniciados com spawn: o programa que cria o
+# roteador precisa do 'if __name__ == "__main__":'):
+#   with RoteadorShards(shards=4) as roteador:
+#       roteador.executar({"op": "criar_cliente", "cpf": "1", "nome": "Ana"})
+#       roteador.executar_lote([{"op": "deposito", "numero": n, "valor": 10} ...])
+# ==========================================================
+
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+
+from banco.alocador_contas import AlocadorContas
+from banco.eventos import DestinoNulo, eventos
+
+from SistemBancarioPOO.modelos.Conta import agregados_saldo, alocador_contas
+from SistemBancarioPOO.servidor import BancoServidor
+
+PARTICOES = ("agencia", "numero")
+
+# Operações que atuam numa conta já existente (vão para o shard dono do "numero")
+_OPERACOES_DE_CONTA = {"deposito", "saque", "extrato"}
+
+
+def _trabalhador(conexao, diretorio_dados, registros_por_snapshot):
+    """Laço de um shard: recebe (comando, dados) pelo pipe e devolve o resultado."""
+    eventos.usar(DestinoNulo())  # as respostas voltam pelo pipe; nada é impresso por operação
+    banco = BancoServidor(diretorio_dados, registros_por_snapshot)
+    try:
+        while True:
+            try:
+                comando, dados = conexao.recv()
+            except EOFError:
+                return  # o roteador terminou sem fechar (o finally ainda grava o WAL)
+            if comando == "fechar":
+                banco.fechar()
+                banco = None
+                conexao.send(None)
+                return
+            try:
+                if comando == "lote":
+                    executar = banco.executar
+                    resultado = [executar(requisicao) for requisicao in dados]
+                elif comando == "contas":
+                    resultado = list(banco.contas)
+                elif comando == "agencias":
+                    resultado = agregados_saldo.agencias()
+                else:
+                    raise ValueError(f"Comando desconhecido: {comando!r}")
+            except Exception as erro:  # volta para o roteador em vez de derrubar o shard
+                resultado = erro
+            conexao.send(resultado)
+    finally:
+        if banco is not None:
+            banco.fechar()
+        conexao.close()
+
+
+class RoteadorShards:
+    """Distribui as requisições do BancoServidor entre processos trabalhadores."""
+
+    AGENCIA = BancoServidor.AGENCIA
+
+    def __init__(self, shards: int = None, diretorio_dados: str = None, particao: str = "numero",
+                 registros_por_snapshot: int = 100_000):
+        if particao not in PARTICOES:
+            raise ValueError(f"Partição inválida: {particao!r} (use {' ou '.join(PARTICOES)}).")
+        self.quantidade = shards or os.cpu_count() or 1
+        self.particao = particao
+        self.alocador = alocador_contas
+        if diretorio_dados:
+            os.makedirs(diretorio_dados, exist_ok=True)
+            self._conferir_configuracao(diretorio_dados)
+            self.alocador = AlocadorContas(os.path.join(diretorio_dados, "alocador_contas.json"), digitos=8)
+        self._trava = threading.Lock()  # um lote por vez nos pipes
+
+        # spawn: os shards começam limpos, sem herdar travas e threads (log, WAL) do processo pai
+        contexto = multiprocessing.get_context("spawn")
+        self._conexoes = []
+        self._processos = []
+        for indice in range(self.quantidade):
+            diretorio = os.path.join(diretorio_dados, f"shard-{indice}") if diretorio_dados else None
+            local, remota = contexto.Pipe()
+            processo = contexto.Process(target=_trabalhador, name=f"shard-{indice}", daemon=True,
+                                        args=(remota, diretorio, registros_por_snapshot))
+            processo.start()
+            remota.close()
+            self._conexoes.append(local)
+            self._processos.append(processo)
+
+        self._donos = None  # numero -> shard (só na partição por agência)
+        existentes = self._comando("contas")
+        # as contas recuperadas pelos shards ficam reservadas: o alocador do roteador não as entrega de novo
+        self.alocador.reservar_lote((self.AGENCIA, numero) for numeros in existentes for numero in numeros)
+        if particao == "agencia":
+            self._donos = {}
+            for indice, numeros in enumerate(existentes):
+                for numero in numeros:
+                    self._donos[numero] = indice
+
+    def _conferir_configuracao(self, diretorio_dados):
+        """Impede reabrir os dados com outra divisão (as contas iriam para o shard errado)."""
+        caminho = os.path.join(diretorio_dados, "shards.json")
+        configuracao = {"shards": self.quantidade, "particao": self.particao}
+        if os.path.exists(caminho):
+            with open(caminho, encoding="utf-8") as arquivo:
+                gravada = json.load(arquivo)
+            if gravada != configuracao:
+                raise ValueError(f"Os dados em {diretorio_dados!r} foram criados com {gravada}, não {configuracao}.")
+            return
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump(configuracao, arquivo)
+
+    # ================================
+    # Partição
+    # ================================
+    def shard_da_agencia(self, agencia) -> int:
+        agencia = str(agencia)
+        chave = int(agencia) if agencia.isdigit() else zlib.crc32(agencia.encode("utf-8"))
+        return chave % self.quantidade
+
+    def shard_da_conta(self, numero):
+        """Shard dono da conta (None se a conta não existe ou o número é inválido)."""
+        if self._donos is not None:
+            return self._donos.get(numero) if isinstance(numero, int) else None
+        return numero % self.quantidade if isinstance(numero, int) else None
+
+    # ================================
+    # Comunicação com os shards
+    # ================================
+    def _trocar(self, mensagens, repassar_erros: bool = True):
+        """Manda as mensagens (uma por shard, None = nada) e recebe as respostas; os shards trabalham juntos.
+
+        Sem 'repassar_erros', a exceção de um shard volta como resultado dele em vez de ser lançada.
+        """
+        enviados = []
+        for indice, mensagem in enumerate(mensagens):
+            if mensagem is not None:
+                self._conexoes[indice].send(mensagem)
+                enviados.append(indice)
+        resultados = [None] * self.quantidade
+        for indice in enviados:
+            resultados[indice] = self._conexoes[indice].recv()
+        if repassar_erros:
+            for resultado in resultados:
+                if isinstance(resultado, Exception):
+                    raise resultado
+        return resultados
+
+    def _comando(self, comando):
+        with self._trava:
+            return self._trocar([(comando, None)] * self.quantidade)
+
+    # ================================
+    # Requisições
+    # ================================
+    def executar(self, requisicao: dict) -> dict:
+        """Executa uma requisição no shard dono e devolve a resposta ({"ok": ...})."""
+        return self.executar_lote([requisicao])[0]
+
+    def executar_lote(self, requisicoes) -> list:
+        """Executa as requisições (no máximo uma mensagem por shard) e devolve as respostas na mesma ordem."""
+        requisicoes = list(requisicoes)
+        respostas = [None] * len(requisicoes)
+        por_shard = [[] for _ in range(self.quantidade)]
+        posicoes = [[] for _ in range(self.quantidade)]  # posição de cada requisição no lote (None = cópia)
+        abertas = []  # (posição, número) das contas abertas neste lote
+
+        with self._trava:
+            sem_numero = sum(1 for requisicao in requisicoes
+                             if requisicao.get("op") == "criar_conta" and requisicao.get("numero") is None)
+            # números escolhidos pelo cliente são reservados antes de alocar os das outras contas do lote
+            self.alocador.reservar_lote((self.AGENCIA, requisicao["numero"]) for requisicao in requisicoes
+                                        if requisicao.get("op") == "criar_conta"
+                                        and requisicao.get("numero") is not None)
+            numeros = iter(self.alocador.alocar_lote([self.AGENCIA] * sem_numero)) if sem_numero else None
+
+            for posicao, requisicao in enumerate(requisicoes):
+                operacao = requisicao.get("op")
+                if operacao == "criar_cliente":
+                    # todos os shards recebem o cliente; a resposta do primeiro representa as outras
+                    for indice in range(self.quantidade):
+                        por_shard[indice].append(requisicao)
+                        posicoes[indice].append(posicao if indice == 0 else None)
+                    continue
+
+                if operacao == "criar_conta":
+                    requisicao = dict(requisicao)
+                    agencia = requisicao["agencia"] = str(requisicao.get("agencia") or self.AGENCIA)
+                    if requisicao.get("numero") is None:
+                        requisicao["numero"] = next(numeros)
+                    numero = requisicao["numero"]
+                    if self._donos is None:
+                        indice = self.shard_da_conta(numero)
+                    elif numero in self._donos:
+                        respostas[posicao] = {"ok": False, "erro": "Conta já existe."}
+                        continue
+                    else:
+                        indice = self._donos[numero] = self.shard_da_agencia(agencia)
+                        abertas.append((posicao, numero))
+                elif operacao in _OPERACOES_DE_CONTA:
+                    indice = self.shard_da_conta(requisicao.get("numero"))
+                elif operacao == "transferencia":
+                    indice = self.shard_da_conta(requisicao.get("origem"))
+                    destino = self.shard_da_conta(requisicao.get("destino"))
+                    if indice is not None and destino is not None and destino != indice:
+                        respostas[posicao] = {"ok": False,
+                                              "erro": "Transferência entre shards diferentes não é suportada."}
+                        continue
+                    indice = None if destino is None else indice
+                else:
+                    respostas[posicao] = {"ok": False, "erro": "Operação desconhecida."}
+                    continue
+
+                if indice is None:
+                    respostas[posicao] = {"ok": False, "erro": "Conta não encontrada."}
+                    continue
+                por_shard[indice].append(requisicao)
+                posicoes[indice].append(posicao)
+
+            try:
+                resultados = self._trocar([("lote", lote) if lote else None for lote in por_shard],
+                                          repassar_erros=False)
+                erro = None
+                for indice, resultado in enumerate(resultados):
+                    if isinstance(resultado, Exception):
+                        erro = erro or resultado
+                        continue
+                    if resultado is None:
+                        continue
+                    for posicao, resposta in zip(posicoes[indice], resultado):
+                        if posicao is not None:
+                            respostas[posicao] = resposta
+                if erro is not None:
+                    raise erro  # as respostas dos outros shards já foram aproveitadas acima
+            finally:
+                # conta sem confirmação do shard (recusa, erro ou pipe quebrado) sai do mapa
+                for posicao, numero in abertas:
+                    resposta = respostas[posicao]
+                    if resposta is None or not resposta["ok"]:
+                        del self._donos[numero]
+        return respostas
+
+    # ================================
+    # Consultas agregadas
+    # ================================
+    def contas_por_shard(self) -> list:
+        """Quantidade de contas em cada shard (mostra o equilíbrio da partição)."""
+        return [len(numeros) for numeros in self._comando("contas")]
+
+    def saldos_por_agencia(self) -> dict:
+        """{agência: saldo em centavos}, juntando os saldos agregados de todos os shards."""
+        saldos = {}
+        for agencias in self._comando("agencias"):
+            for agencia, saldo in agencias.items():
+                saldos[agencia] = saldos.get(agencia, 0) + saldo
+        return saldos
+
+    def saldo_total(self) -> int:
+        """Saldo de todas as contas do banco, em centavos."""
+        return sum(self.saldos_por_agencia().values())
+
+    # ================================
+    # Encerramento
+    # ================================
+    def fechar(self):
+        """Pede a cada shard o snapshot final e espera os processos terminarem."""
+        with self._trava:
+            for conexao in self._conexoes:
+                try:
+                    conexao.send(("fechar", None))
+                except (BrokenPipeError, OSError):
+                    pass
+            for conexao, processo in zip(self._conexoes, self._processos):
+                try:
+                    conexao.recv()
+                except (EOFError, OSError):
+                    pass
+                conexao.close()
+                processo.join()
+            self._conexoes, self._processos = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
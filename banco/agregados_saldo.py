@@ -0,0 +1,130 @@
+# ==========================================================
+# SALDOS AGREGADOS (POR CLIENTE, POR AGÊNCIA E DO BANCO)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Totais mantidos de forma incremental: cada alteração de saldo
+#     de uma conta soma a mesma diferença (em centavos) no total do
+#     cliente, no da agência e no do banco.
+#   - Leitura O(1), sem percorrer as contas; painéis e checagens de
+#     risco podem consultar com a frequência que quiserem.
+#   - Uma trava curta protege só as somas (as contas continuam com a
+#     trava própria para o saldo).
+#   - 'verificar' recalcula tudo a partir das contas, para auditoria.
+#   - O cliente entra como chave (o CPF, no modelo de contas): guardar
+#     o próprio objeto manteria vivos todos os clientes já criados.
+# ==========================================================
+
+import threading
+
+
+class AgregadosSaldo:
+    """Totais de saldo (em centavos) e quantidade de contas por cliente, por agência e do banco."""
+
+    def __init__(self):
+        self._por_cliente = {}  # chave do cliente (CPF) -> [saldo, contas]
+        self._por_agencia = {}  # agência -> [saldo, contas]
+        self._total = 0
+        self._contas = 0
+        self._trava = threading.Lock()
+
+    @staticmethod
+    def _somar(tabela, chave, saldo, contas):
+        linha = tabela.get(chave)
+        if linha is None:
+            linha = tabela[chave] = [0, 0]
+        linha[0] += saldo
+        linha[1] += contas
+        if not linha[1]:
+            del tabela[chave]  # nenhuma conta restante
+
+    # ================================
+    # Atualizações (chamadas pelas contas)
+    # ================================
+    def registrar_conta(self, cliente, agencia, saldo: int = 0):
+        """Inclui uma conta nova nos totais."""
+        with self._trava:
+            self._somar(self._por_cliente, cliente, saldo, 1)
+            self._somar(self._por_agencia, agencia, saldo, 1)
+            self._total += saldo
+            self._contas += 1
+
+    def registrar_contas(self, contas):
+        """Inclui de uma vez várias contas novas (pares cliente, agência) com saldo zero."""
+        with self._trava:
+            for cliente, agencia in contas:
+                self._somar(self._por_cliente, cliente, 0, 1)
+                self._somar(self._por_agencia, agencia, 0, 1)
+                self._contas += 1
+
+    def remover_conta(self, cliente, agencia, saldo: int = 0):
+        """Retira uma conta dos totais."""
+        with self._trava:
+            self._somar(self._por_cliente, cliente, -saldo, -1)
+            self._somar(self._por_agencia, agencia, -saldo, -1)
+            self._total -= saldo
+            self._contas -= 1
+
+    def variar(self, cliente, agencia, diferenca: int):
+        """Aplica a variação de saldo de uma conta (centavos, positiva ou negativa)."""
+        if not diferenca:
+            return
+        with self._trava:
+            self._por_cliente[cliente][0] += diferenca
+            self._por_agencia[agencia][0] += diferenca
+            self._total += diferenca
+
+    def mover(self, cliente_antigo, agencia_antiga, cliente_novo, agencia_nova, saldo: int):
+        """Transfere uma conta (e seu saldo) de cliente e/ou agência."""
+        with self._trava:
+            self._somar(self._por_cliente, cliente_antigo, -saldo, -1)
+            self._somar(self._por_agencia, agencia_antiga, -saldo, -1)
+            self._somar(self._por_cliente, cliente_novo, saldo, 1)
+            self._somar(self._por_agencia, agencia_nova, saldo, 1)
+
+    # ================================
+    # Consultas O(1)
+    # ================================
+    def saldo_cliente(self, cliente) -> int:
+        linha = self._por_cliente.get(cliente)
+        return linha[0] if linha else 0
+
+    def saldo_agencia(self, agencia) -> int:
+        linha = self._por_agencia.get(agencia)
+        return linha[0] if linha else 0
+
+    def saldo_total(self) -> int:
+        return self._total
+
+    def contas_cliente(self, cliente) -> int:
+        linha = self._por_cliente.get(cliente)
+        return linha[1] if linha else 0
+
+    def contas_agencia(self, agencia) -> int:
+        linha = self._por_agencia.get(agencia)
+        return linha[1] if linha else 0
+
+    def total_contas(self) -> int:
+        return self._contas
+
+    def agencias(self) -> dict:
+        """Cópia de {agência: saldo} de todas as agências."""
+        with self._trava:
+            return {agencia: linha[0] for agencia, linha in self._por_agencia.items()}
+
+    def verificar(self, contas, chave=None) -> bool:
+        """Recalcula os totais a partir das contas (objetos com cliente, agencia e saldo_centavos).
+
+        'chave' converte o cliente da conta na chave usada nos totais (sem ela, o próprio cliente).
+        """
+        por_cliente, por_agencia, total, quantidade = {}, {}, 0, 0
+        for conta in contas:
+            saldo = conta.saldo_centavos
+            self._somar(por_cliente, conta.cliente if chave is None else chave(conta.cliente), saldo, 1)
+            self._somar(por_agencia, conta.agencia, saldo, 1)
+            total += saldo
+            quantidade += 1
+        with self._trava:
+            return (por_cliente == self._por_cliente and por_agencia == self._por_agencia
+                    and total == self._total and quantidade == self._contas)
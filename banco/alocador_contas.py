@@ -0,0 +1,207 @@
+# ==========================================================
+# ALOCADOR DE NÚMEROS DE CONTA (SEM COLISÃO, O(1))
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Cada agência tem uma sequência própria (0, 1, 2, ...).
+#   - A posição na sequência passa por uma permutação do espaço de
+#     números da agência (n -> (a*n + b) mod 10^digitos, com 'a' primo
+#     com 10), então os números são únicos por construção mas não
+#     parecem sequenciais. Nenhuma tentativa/colisão: sempre O(1).
+#   - Opcionalmente calcula um dígito verificador (módulo 11).
+#   - A marca d'água (até onde a sequência pode ter sido usada) é
+#     salva em blocos de 'reserva' números; ao reiniciar, a sequência
+#     continua depois do bloco salvo e nunca reaproveita um número.
+#   - O arquivo é um diário de linhas JSON ({agência: marca}): cada nova
+#     marca é uma linha acrescentada (O(1), não regrava as demais
+#     agências); ao abrir, o diário é compactado se tiver muitas linhas.
+#   - Números escolhidos por fora (ex: informados ao criar a conta) são
+#     reservados com 'reservar': a permutação é invertida para achar a
+#     posição deles na sequência, que é pulada quando chegar a vez dela.
+# ==========================================================
+
+import json
+import os
+import threading
+import zlib
+
+# Multiplicador da permutação: primo com 10 (logo com qualquer 10^digitos)
+_MULTIPLICADOR = 7_919_393
+
+
+def digito_verificador(numero: str) -> str:
+    """Dígito verificador módulo 11 (pesos 2..9 da direita para a esquerda)."""
+    soma = 0
+    peso = 2
+    for digito in reversed(numero):
+        soma += int(digito) * peso
+        peso = 2 if peso == 9 else peso + 1
+    resto = 11 - soma % 11
+    return "0" if resto >= 10 else str(resto)
+
+
+class AlocadorContas:
+    """Entrega pares (agência, número) únicos em tempo constante."""
+
+    def __init__(self, caminho: str = None, digitos: int = 4, reserva: int = 1000,
+                 embaralhar: bool = True):
+        self.caminho = caminho  # arquivo da marca d'água (None = só em memória)
+        self.digitos = digitos
+        self.capacidade = 10 ** digitos  # números possíveis por agência
+        self.reserva = reserva  # números reservados a cada gravação da marca d'água
+        self.embaralhar = embaralhar
+
+        self._proximos = {}  # agência -> próxima posição da sequência
+        self._reservadas = {}  # agência -> posições ainda não alcançadas cujos números já estão em uso
+        self._limites = {}  # agência -> marca d'água salva (posições abaixo podem ter sido usadas)
+        self._trava = threading.Lock()
+        self._diario = None  # arquivo aberto para acrescentar as novas marcas
+        if caminho and os.path.exists(caminho):
+            linhas = 0
+            incompleta = False
+            with open(caminho, encoding="utf-8") as arquivo:
+                for linha in arquivo:
+                    incompleta = not linha.endswith("\n")  # a próxima marca não pode colar nesta linha
+                    if not linha.strip():
+                        continue
+                    try:
+                        marcas = json.loads(linha)
+                    except ValueError:
+                        incompleta = True  # última linha corrompida (queda durante a gravação)
+                        break
+                    self._limites.update(marcas.get("agencias", marcas))  # aceita o formato antigo
+                    linhas += 1
+            if incompleta or linhas > 2 * len(self._limites) + 16:
+                self._compactar()
+            # reinício: continua depois de tudo o que pode ter sido entregue
+            self._proximos = dict(self._limites)
+
+    def _permutar(self, agencia: str, posicao: int) -> int:
+        if not self.embaralhar:
+            return posicao
+        deslocamento = zlib.crc32(agencia.encode("utf-8"))  # cada agência com seu próprio embaralhamento
+        return (_MULTIPLICADOR * posicao + deslocamento) % self.capacidade
+
+    def _posicao(self, agencia: str, numero: int) -> int:
+        """Inverso de '_permutar': posição da sequência da agência que gera 'numero'."""
+        if not self.embaralhar:
+            return numero
+        deslocamento = zlib.crc32(agencia.encode("utf-8"))
+        return (numero - deslocamento) * pow(_MULTIPLICADOR, -1, self.capacidade) % self.capacidade
+
+    def _proxima_livre(self, agencia: str, posicao: int) -> int:
+        """Primeira posição a partir de 'posicao' que não está reservada (as puladas saem da reserva)."""
+        reservadas = self._reservadas.get(agencia)
+        while reservadas and posicao in reservadas:
+            reservadas.discard(posicao)
+            posicao += 1
+        return posicao
+
+    def _compactar(self):
+        """Regrava o diário com uma linha só, de forma atômica (arquivo temporário + rename)."""
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps(self._limites) + "\n")
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self.caminho)
+
+    def _salvar(self, agencia: str):
+        """Acrescenta a nova marca d'água da agência ao diário e espera chegar ao disco."""
+        if self._diario is None:
+            self._diario = open(self.caminho, "a", encoding="utf-8")
+        self._diario.write(json.dumps({agencia: self._limites[agencia]}) + "\n")
+        self._diario.flush()
+        os.fsync(self._diario.fileno())
+
+    def alocar(self, agencia) -> int:
+        """Retorna um número de conta ainda não usado na agência."""
+        agencia = str(agencia)
+        with self._trava:
+            posicao = self._proxima_livre(agencia, self._proximos.get(agencia, 0))
+            if posicao >= self.capacidade:
+                raise ValueError(f"Agência {agencia} sem números de conta disponíveis.")
+            self._proximos[agencia] = posicao + 1
+            if self.caminho and posicao >= self._limites.get(agencia, 0):
+                # salva antes de entregar: depois de uma queda a posição nunca volta a ser usada
+                self._limites[agencia] = min(posicao + self.reserva, self.capacidade)
+                self._salvar(agencia)
+        return self._permutar(agencia, posicao)
+
+    def alocar_lote(self, agencias) -> list:
+        """Um número novo para cada agência da lista (repetidas recebem números diferentes).
+
+        As marcas d'água que precisarem avançar são gravadas juntas, com um único fsync.
+        Tudo ou nada: sem números para o lote inteiro, lança ValueError sem alterar o alocador.
+        """
+        agencias = [str(agencia) for agencia in agencias]
+        posicoes = []
+        with self._trava:
+            # 1) calcula o lote inteiro sem alterar nada: se faltar número, o alocador fica como estava
+            proximos = {}  # agência -> próxima posição depois do lote
+            puladas = []  # (agência, posição reservada que o lote passou)
+            for agencia in agencias:
+                posicao = proximos.get(agencia)
+                if posicao is None:
+                    posicao = self._proximos.get(agencia, 0)
+                reservadas = self._reservadas.get(agencia)
+                while reservadas and posicao in reservadas:
+                    puladas.append((agencia, posicao))
+                    posicao += 1
+                if posicao >= self.capacidade:
+                    raise ValueError(f"Agência {agencia} sem números de conta disponíveis.")
+                proximos[agencia] = posicao + 1
+                posicoes.append(posicao)
+            limites = {}
+            if self.caminho:
+                for agencia, proximo in proximos.items():
+                    if proximo > self._limites.get(agencia, 0):
+                        limites[agencia] = min(proximo - 1 + self.reserva, self.capacidade)
+
+            # 2) grava as marcas d'água (um fsync) e só então altera o estado em memória
+            if limites:
+                if self._diario is None:
+                    self._diario = open(self.caminho, "a", encoding="utf-8")
+                self._diario.write(json.dumps(limites) + "\n")
+                self._diario.flush()
+                os.fsync(self._diario.fileno())
+                self._limites.update(limites)
+            self._proximos.update(proximos)
+            for agencia, posicao in puladas:
+                self._reservadas[agencia].discard(posicao)
+        if not self.embaralhar:
+            return posicoes
+        # mesmo cálculo de '_permutar', com o deslocamento de cada agência calculado uma vez só
+        deslocamentos = {agencia: zlib.crc32(agencia.encode("utf-8")) for agencia in set(agencias)}
+        capacidade = self.capacidade
+        return [(_MULTIPLICADOR * posicao + deslocamentos[agencia]) % capacidade
+                for agencia, posicao in zip(agencias, posicoes)]
+
+    def reservar(self, agencia, numero: int):
+        """Marca 'numero' como em uso na agência: 'alocar' nunca o entregará.
+
+        Números já alcançados pela sequência (ou fora do espaço da agência) não precisam de reserva.
+        """
+        self.reservar_lote([(agencia, numero)])
+
+    def reservar_lote(self, contas):
+        """Reserva de uma vez os pares (agência, número) já em uso."""
+        with self._trava:
+            for agencia, numero in contas:
+                if not isinstance(numero, int) or not 0 <= numero < self.capacidade:
+                    continue
+                agencia = str(agencia)
+                posicao = self._posicao(agencia, numero)
+                if posicao >= self._proximos.get(agencia, 0):
+                    self._reservadas.setdefault(agencia, set()).add(posicao)
+
+    def formatar(self, numero: int, com_digito: bool = True) -> str:
+        """Número com zeros à esquerda e, opcionalmente, o dígito verificador (ex: '0421-7')."""
+        texto = f"{numero:0{self.digitos}d}"
+        return f"{texto}-{digito_verificador(texto)}" if com_digito else texto
+
+    def disponiveis(self, agencia) -> int:
+        """Quantos números a agência ainda pode receber."""
+        with self._trava:
+            return self.capacidade - self._proximos.get(str(agencia), 0)
@@ -0,0 +1,114 @@
+# ==========================================================
+# DINHEIRO EM CENTAVOS INTEIROS (PONTO FIXO)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Saldos, valores e históricos são guardados como int em centavos:
+#     as contas são exatas (sem o arredondamento acumulado do float) e
+#     continuam na velocidade de inteiros (sem Decimal no caminho quente).
+#   - 'para_centavos' converte a entrada do usuário ("10", "10.5",
+#     "10,50", "1.234,56", 10.5, Decimal) arredondando meio centavo para cima.
+#     Valores fora de +-CENTAVOS_MAXIMO (o que cabe nas colunas array('q'))
+#     são recusados com ValueError, como qualquer outro valor inválido.
+#   - 'formatar' faz o caminho inverso só na hora de exibir.
+#   - 'reais_ou_nan' lê o valor de uma linha do log (índice e filtros de
+#     relatório) com as mesmas regras, devolvendo NaN quando não é dinheiro.
+#   - 'somar' totaliza colunas array('q') de centavos de uma vez.
+# ==========================================================
+
+from array import array
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+# Maior valor (em centavos) aceito numa transação: o limite de um inteiro de 64 bits
+CENTAVOS_MAXIMO = 2 ** 63 - 1
+
+
+def para_centavos(valor) -> int:
+    """Converte um valor em reais (texto ou número) para centavos inteiros.
+
+    Lança ValueError para textos inválidos, NaN, infinito e valores fora de
+    +-CENTAVOS_MAXIMO, e TypeError para tipos não numéricos — as mesmas
+    exceções que float() lançaria.
+    """
+    centavos = valor * 100 if type(valor) is int else _converter(valor)
+    if -CENTAVOS_MAXIMO <= centavos <= CENTAVOS_MAXIMO:
+        return centavos
+    raise ValueError(f"Valor monetário fora do intervalo aceito: {valor!r}")
+
+
+def _converter(valor) -> int:
+    """Centavos de 'valor' sem checar o intervalo (ver 'para_centavos')."""
+    if isinstance(valor, float):
+        if valor != valor or valor in (float("inf"), float("-inf")):
+            raise ValueError(f"Valor monetário inválido: {valor!r}")
+        valor = repr(valor)  # usa a representação decimal mais curta do float (1.005 -> "1.005")
+    elif isinstance(valor, Decimal):
+        return _centavos_decimal(valor)
+    elif isinstance(valor, int):
+        return int(valor) * 100
+    elif not isinstance(valor, str):
+        raise TypeError(f"Valor monetário deve ser texto ou número, não {type(valor).__name__}")
+
+    texto = valor.strip()
+    if "," in texto:
+        texto = texto.replace(".", "").replace(",", ".")  # formato brasileiro: 1.234,56
+    if "e" in texto or "E" in texto:
+        try:
+            return _centavos_decimal(Decimal(texto))
+        except InvalidOperation:
+            raise ValueError(f"Valor monetário inválido: {valor!r}") from None
+
+    negativo = texto[:1] == "-"
+    if texto[:1] in "+-":
+        texto = texto[1:]
+    inteiro, _, fracao = texto.partition(".")
+    if (not inteiro and not fracao) or (inteiro and not inteiro.isdigit()) \
+            or (fracao and not fracao.isdigit()):
+        raise ValueError(f"Valor monetário inválido: {valor!r}")
+
+    centavos = int(inteiro or "0") * 100 + int((fracao + "00")[:2])
+    if len(fracao) > 2 and fracao[2] >= "5":
+        centavos += 1  # meio centavo ou mais arredonda para cima
+    return -centavos if negativo else centavos
+
+
+def _centavos_decimal(valor: Decimal) -> int:
+    if not valor.is_finite():
+        raise ValueError(f"Valor monetário inválido: {valor!r}")
+    return int((valor * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def formatar(centavos: int) -> str:
+    """Texto com duas casas decimais (ex: 123456 -> '1234.56')."""
+    sinal = "-" if centavos < 0 else ""
+    reais, resto = divmod(abs(centavos), 100)
+    return f"{sinal}{reais}.{resto:02d}"
+
+
+def para_reais(centavos: int) -> float:
+    """Valor em reais como float, apenas para exibição/compatibilidade."""
+    return centavos / 100
+
+
+def reais_ou_nan(valor) -> float:
+    """Valor em reais (float) lido como em 'para_centavos', ou NaN se não for um valor monetário."""
+    try:
+        return para_centavos(valor) / 100
+    except (ValueError, TypeError):
+        return float("nan")
+
+
+def somar(centavos) -> int:
+    """Soma exata de uma coluna de centavos (array('q'), lista ou iterável)."""
+    return sum(centavos)
+
+
+def somar_por_codigo(codigos, centavos, codigo: int) -> int:
+    """Soma exata apenas das posições cujo código (ex: tipo de operação) é 'codigo'."""
+    return sum([valor for cod, valor in zip(codigos, centavos) if cod == codigo])
+
+
+def nova_coluna(valores=()) -> array:
+    """Cria uma coluna compacta de centavos (inteiros de 64 bits)."""
+    return array("q", valores)
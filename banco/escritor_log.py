@@ -0,0 +1,214 @@
+# ==========================================================
+# ESCRITOR DE LOG COM BUFFER E THREAD DE FUNDO
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Mantém o arquivo de log aberto (sem open/close por operação).
+#   - Acumula as linhas em memória e grava em lotes numa thread de fundo,
+#     por tamanho do lote ou por tempo.
+#   - Modos de durabilidade:
+#       "por_operacao": grava e faz flush antes de retornar (sem thread).
+#       "grupo":        group commit; quem escreve espera o lote que contém
+#                       sua linha ser gravado, mas várias threads dividem
+#                       uma única escrita.
+#       "assincrono":   retorna na hora; a thread grava a cada 'tamanho_lote'
+#                       linhas ou a cada 'intervalo' segundos.
+#   - 'fechar' (também chamado no atexit) grava tudo o que estiver pendente.
+#   - Se uma gravação falha (disco cheio, arquivo removido...), a thread
+#     guarda o erro, acorda quem espera e termina; o erro é relançado em
+#     quem espera o lote, no 'descarregar', no 'fechar' e nas próximas
+#     chamadas de 'escrever' (nenhuma linha é aceita depois da falha).
+#   - Opcionalmente alimenta um IndiceLog com a posição de cada linha.
+#   - Opcionalmente roda o arquivo (RotacaoLog): antes de gravar um lote,
+#     se o arquivo passou do tamanho ou do tempo máximo, ele é fechado,
+#     vira um segmento (com o resumo do índice no manifesto) e o índice
+#     recomeça junto com o arquivo novo.
+# ==========================================================
+
+import atexit
+import os
+import threading
+
+
+class EscritorLog:
+    """Escritor de log que mantém o arquivo aberto e grava em lotes."""
+
+    MODOS = ("por_operacao", "grupo", "assincrono")
+
+    def __init__(self, caminho: str = "log.txt", modo: str = "assincrono",
+                 tamanho_lote: int = 512, intervalo: float = 0.2, fsync: bool = False,
+                 indice=None, rotacao=None):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo de log inválido: {modo}. Use um de {self.MODOS}")
+        self.caminho = caminho
+        self.modo = modo
+        self.tamanho_lote = tamanho_lote  # linhas acumuladas que disparam uma gravação
+        self.intervalo = intervalo  # tempo máximo (s) que uma linha espera no buffer
+        self.fsync = fsync  # além do flush, força a gravação no disco (os.fsync)
+        self.indice = indice  # IndiceLog opcional que recebe a posição de cada linha
+        self.rotacao = rotacao  # RotacaoLog opcional que fecha o arquivo em segmentos
+
+        self._arquivo = None  # aberto só na primeira escrita
+        self._posicao = 0  # tamanho do arquivo (byte onde começa a próxima linha)
+        self._pendentes = []  # linhas aguardando gravação
+        self._sequencia = 0  # número da última linha recebida
+        self._gravado = 0  # número da última linha já gravada
+        self._condicao = threading.Condition()
+        self._thread = None
+        self._fechando = False
+        self._erro = None  # exceção que derrubou a thread de fundo (relançada para quem escreve/espera)
+
+    # ================================
+    # Escrita
+    # ================================
+    def escrever(self, linha: str, meta=None):
+        """Registra uma linha (deve terminar com '\\n') conforme o modo configurado.
+
+        'meta' é a tupla (horario_epoch, operacao, valor) repassada ao índice, se houver.
+        """
+        if self.modo == "por_operacao":
+            with self._condicao:
+                self._abrir()
+                self._gravar([(linha, meta)])
+            return
+
+        with self._condicao:
+            self._conferir_erro()
+            if self._fechando:
+                raise ValueError("Escritor de log já foi fechado.")
+            self._iniciar()
+            self._pendentes.append((linha, meta))
+            self._sequencia += 1
+            minha_sequencia = self._sequencia
+
+            if self.modo == "grupo":
+                # acorda a thread e espera o lote com esta linha ser gravado
+                self._condicao.notify_all()
+                while self._gravado < minha_sequencia:
+                    self._conferir_erro()
+                    self._condicao.wait()
+            elif len(self._pendentes) >= self.tamanho_lote:
+                self._condicao.notify_all()
+
+    def descarregar(self):
+        """Bloqueia até que todas as linhas recebidas até agora estejam gravadas."""
+        with self._condicao:
+            if self._thread is None:
+                return
+            alvo = self._sequencia
+            self._condicao.notify_all()
+            while self._gravado < alvo:
+                self._conferir_erro()
+                self._condicao.wait()
+
+    def fechar(self):
+        """Grava o que estiver pendente, encerra a thread e fecha o arquivo."""
+        with self._condicao:
+            if self._fechando:
+                return
+            self._fechando = True
+            self._condicao.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._condicao:
+            arquivo, self._arquivo = self._arquivo, None
+            if arquivo is not None and self._erro is None:
+                arquivo.close()
+            elif arquivo is not None:
+                try:
+                    arquivo.close()  # o buffer pode falhar de novo ao fechar; o erro original é o que vale
+                except OSError:
+                    pass
+            self._conferir_erro()  # as linhas pendentes na falha não foram gravadas
+
+    # ================================
+    # Funções internas
+    # ================================
+    def _conferir_erro(self):
+        """Relança a falha da thread de fundo, se houve (chamado com a trava)."""
+        if self._erro is not None:
+            raise self._erro
+
+    def _abrir(self):
+        if self._arquivo is None:
+            self._arquivo = open(self.caminho, "ab", buffering=1 << 16)
+            self._posicao = self._arquivo.tell()
+
+    def _rodar(self):
+        """Fecha o arquivo atual como segmento e abre um novo, vazio."""
+        self._arquivo.close()
+        self._arquivo = None
+        resumo = None
+        if self.indice is not None:
+            self.indice.descarregar()
+            resumo = self.indice.resumo()
+        self.rotacao.fechar_segmento(resumo)
+        if self.indice is not None:
+            self.indice.reiniciar()
+        self._abrir()
+
+    def _gravar(self, lote):
+        """Grava um lote de (linha, meta), alimenta o índice e faz o flush."""
+        if self.rotacao is not None and self._posicao and self.rotacao.cheio(self._posicao):
+            self._rodar()
+        indice = self.indice
+        if indice is None:
+            dados = "".join([linha for linha, _ in lote]).encode("utf-8")
+        else:
+            partes = []
+            posicao = self._posicao
+            for linha, meta in lote:
+                bruto = linha.encode("utf-8")
+                if meta is not None:
+                    indice.registrar(posicao, *meta)
+                posicao += len(bruto)
+                partes.append(bruto)
+            dados = b"".join(partes)
+        self._arquivo.write(dados)
+        self._posicao += len(dados)
+        self._arquivo.flush()
+        if self.fsync:
+            os.fsync(self._arquivo.fileno())
+        if indice is not None:
+            indice.descarregar()  # o índice só é salvo depois das linhas que ele aponta
+
+    def _iniciar(self):
+        """Abre o arquivo e sobe a thread de fundo na primeira escrita."""
+        if self._thread is None:
+            self._abrir()
+            self._thread = threading.Thread(target=self._laco, name="escritor-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.fechar)
+
+    def _laco(self):
+        condicao = self._condicao
+        while True:
+            with condicao:
+                if not self._pendentes and not self._fechando:
+                    condicao.wait(self.intervalo)
+                # no modo assíncrono dá um tempo para o lote encher antes de gravar
+                if (self.modo == "assincrono" and not self._fechando
+                        and 0 < len(self._pendentes) < self.tamanho_lote):
+                    condicao.wait(self.intervalo)
+                lote = self._pendentes
+                self._pendentes = []
+                alvo = self._sequencia
+                encerrar = self._fechando
+
+            if lote:
+                # a escrita acontece fora da trava: quem chega agora já entra no próximo lote
+                try:
+                    self._gravar(lote)
+                except Exception as erro:
+                    with condicao:
+                        self._erro = erro
+                        condicao.notify_all()  # ninguém fica preso esperando um lote que não virá
+                    return
+
+            with condicao:
+                self._gravado = alvo
+                condicao.notify_all()
+                if encerrar and not self._pendentes:
+                    return
@@ -0,0 +1,177 @@
+# ==========================================================
+# EVENTOS DAS OPERAÇÕES E DESTINOS DE SAÍDA
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - As operações não imprimem mais direto: emitem um evento
+#     estruturado (tipo, horário e campos) com o formato da mensagem.
+#   - Quem roda o programa escolhe os destinos:
+#       DestinoConsole -> imprime a mensagem (o menu interativo)
+#       DestinoArquivo -> JSON lines num arquivo com buffer grande
+#       DestinoFila    -> guarda os eventos na memória (testes, painéis)
+#       DestinoNulo    -> descarta (lote e servidor)
+#   - Sem destinos (ou só o nulo), 'emitir' retorna logo na primeira
+#     linha: nenhum evento é montado e nenhum texto é formatado.
+#   - O texto só é montado por quem precisa dele (o console); no
+#     formato, '{campo:R}' exibe um valor em centavos como reais.
+# ==========================================================
+
+import contextlib
+import json
+import string
+import sys
+import threading
+import time
+from collections import deque
+
+from banco.dinheiro import formatar
+
+
+class _Formatador(string.Formatter):
+    """str.format com a especificação 'R' para centavos (ex: '{saldo:R}' -> '10.50')."""
+
+    def format_field(self, valor, especificacao):
+        if especificacao == "R":
+            return formatar(valor)
+        return super().format_field(valor, especificacao)
+
+
+_FORMATADOR = _Formatador()
+
+
+class Evento:
+    """Um fato ocorrido numa operação (ex: 'conta.deposito'), com os campos que o descrevem."""
+
+    __slots__ = ("tipo", "tempo", "formato", "dados")
+
+    def __init__(self, tipo: str, formato, dados: dict):
+        self.tipo = tipo
+        self.tempo = time.time()
+        self.formato = formato  # texto para str.format ou função(dados) -> texto
+        self.dados = dados
+
+    @property
+    def texto(self) -> str:
+        """Mensagem legível do evento (a mesma que o programa imprimia)."""
+        if callable(self.formato):
+            return self.formato(self.dados)
+        return _FORMATADOR.vformat(self.formato, (), self.dados)
+
+    def como_dicionario(self) -> dict:
+        return {"tipo": self.tipo, "tempo": self.tempo, **self.dados}
+
+    def __repr__(self):
+        return f"Evento({self.tipo!r}, {self.dados!r})"
+
+
+# ================================
+# Destinos
+# ================================
+class DestinoConsole:
+    """Imprime a mensagem de cada evento (no sys.stdout do momento, ou em 'saida')."""
+
+    def __init__(self, saida=None):
+        self.saida = saida
+
+    def receber(self, evento: Evento):
+        print(evento.texto, file=self.saida or sys.stdout)
+
+
+class DestinoArquivo:
+    """Grava cada evento como uma linha JSON; o buffer só vai para o disco quando enche ou ao descarregar."""
+
+    def __init__(self, caminho: str, tamanho_buffer: int = 1 << 20):
+        self._arquivo = open(caminho, "a", encoding="utf-8", buffering=tamanho_buffer)
+        self._trava = threading.Lock()
+
+    def receber(self, evento: Evento):
+        linha = json.dumps(evento.como_dicionario(), ensure_ascii=False, default=str)
+        with self._trava:
+            self._arquivo.write(linha + "\n")
+
+    def descarregar(self):
+        with self._trava:
+            self._arquivo.flush()
+
+    def fechar(self):
+        with self._trava:
+            self._arquivo.close()
+
+
+class DestinoFila:
+    """Guarda os eventos na memória; com 'maximo', só os mais recentes."""
+
+    def __init__(self, maximo: int = None):
+        self._eventos = deque(maxlen=maximo)  # append/popleft são seguros entre threads
+
+    def receber(self, evento: Evento):
+        self._eventos.append(evento)
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def drenar(self) -> list:
+        """Retira e retorna todos os eventos guardados, do mais antigo ao mais recente."""
+        eventos = []
+        try:
+            while True:
+                eventos.append(self._eventos.popleft())
+        except IndexError:
+            return eventos
+
+
+class DestinoNulo:
+    """Descarta tudo (o emissor nem chega a montar os eventos)."""
+
+    def receber(self, evento: Evento):
+        pass
+
+
+# ================================
+# Emissor
+# ================================
+class Emissor:
+    """Entrega os eventos emitidos pelas operações aos destinos registrados."""
+
+    def __init__(self, *destinos):
+        self._destinos = ()  # tupla: trocada inteira, lida sem trava no caminho quente
+        self.usar(*destinos)
+
+    @property
+    def destinos(self) -> tuple:
+        return self._destinos
+
+    def usar(self, *destinos):
+        """Substitui os destinos (os nulos são descartados: sem destinos, emitir não faz nada)."""
+        self._destinos = tuple(destino for destino in destinos if not isinstance(destino, DestinoNulo))
+
+    def adicionar(self, destino):
+        self.usar(*self._destinos, destino)
+
+    def remover(self, destino):
+        self.usar(*(atual for atual in self._destinos if atual is not destino))
+
+    @contextlib.contextmanager
+    def redirecionar(self, *destinos):
+        """Usa outros destinos só dentro do bloco 'with' (ex: DestinoNulo() no modo em lote)."""
+        anteriores = self._destinos
+        self.usar(*destinos)
+        try:
+            yield self
+        finally:
+            self._destinos = anteriores
+
+    def emitir(self, tipo: str, formato="", **dados):
+        """Emite o evento 'tipo' para todos os destinos; 'formato' monta a mensagem a partir dos campos."""
+        destinos = self._destinos
+        if not destinos:
+            return
+        evento = Evento(tipo, formato, dados)
+        for destino in destinos:
+            destino.receber(evento)
+
+
+# Emissor compartilhado pelo banco (por padrão imprime, como antes) e atalho para ele
+eventos = Emissor(DestinoConsole())
+emitir = eventos.emitir
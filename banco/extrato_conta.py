@@ -0,0 +1,94 @@
+# ==========================================================
+# EXTRATO COM LANÇAMENTOS EM COLUNAS E EXIBIÇÃO PAGINADA
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Substitui a string 'extrato' que era concatenada a cada operação
+#     (cópia da string inteira por lançamento).
+#   - Cada lançamento é acrescentado em O(1) em colunas 'array'
+#     (horário epoch, tipo e valor em centavos).
+#   - O texto só é montado na hora de exibir, e só para o trecho pedido:
+#     últimos N lançamentos, uma página ou um período.
+# ==========================================================
+
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+
+from banco.dinheiro import formatar, somar, somar_por_codigo
+
+DEPOSITO = 0
+SAQUE = 1
+
+# Texto de cada tipo de lançamento (mesmo formato da antiga string de extrato)
+_DESCRICOES = ("Depósito", "Saque")
+
+
+class Extrato:
+    """Extrato de uma conta: lançamentos acrescentados em O(1) e exibidos sob demanda."""
+
+    def __init__(self):
+        self._tempos = array("d")  # horário do lançamento (epoch, sempre crescente)
+        self._tipos = array("B")  # DEPOSITO ou SAQUE
+        self._valores = array("q")  # valor do lançamento em centavos
+
+    def adicionar(self, tipo: int, valor: int, tempo: float = None):
+        """Acrescenta um lançamento (valor em centavos) ao final do extrato."""
+        tempo = time.time() if tempo is None else tempo
+        if self._tempos and tempo < self._tempos[-1]:
+            tempo = self._tempos[-1]  # mantém a coluna ordenada para as buscas por período
+        self._tempos.append(tempo)
+        self._tipos.append(tipo)
+        self._valores.append(valor)
+
+    def __len__(self):
+        return len(self._valores)
+
+    def __repr__(self):
+        return f"Extrato({len(self)} lançamentos)"
+
+    def capturar(self):
+        """Retorna as colunas do extrato para um snapshot."""
+        return (self._tempos, self._tipos, self._valores)
+
+    def restaurar(self, estado):
+        """Substitui os lançamentos pelos de um snapshot."""
+        tempos, tipos, valores = estado
+        self._tempos = array("d", tempos)
+        self._tipos = array("B", tipos)
+        self._valores = array("q", valores)
+
+    def total(self, tipo: int = None) -> int:
+        """Soma exata (em centavos) dos lançamentos, ou só dos de um tipo (DEPOSITO/SAQUE)."""
+        if tipo is None:
+            return somar(self._valores)
+        return somar_por_codigo(self._tipos, self._valores, tipo)
+
+    # ================================
+    # Exibição
+    # ================================
+    def _texto(self, inicio: int, fim: int) -> str:
+        """Monta o texto dos lançamentos nas posições [inicio, fim)."""
+        tipos, valores = self._tipos, self._valores
+        return "".join(f"{_DESCRICOES[tipos[i]]} de {formatar(valores[i])} RS\n" for i in range(inicio, fim))
+
+    def __str__(self):
+        return self._texto(0, len(self))
+
+    def ultimos(self, quantidade: int) -> str:
+        """Texto dos últimos 'quantidade' lançamentos."""
+        total = len(self)
+        return self._texto(max(0, total - quantidade), total)
+
+    def total_paginas(self, tamanho: int) -> int:
+        return (len(self) + tamanho - 1) // tamanho
+
+    def pagina(self, numero: int, tamanho: int = 20) -> str:
+        """Texto da página 'numero' (começando em 1) com 'tamanho' lançamentos."""
+        inicio = (numero - 1) * tamanho
+        return self._texto(max(0, inicio), min(len(self), inicio + tamanho))
+
+    def periodo(self, inicio: float, fim: float) -> str:
+        """Texto dos lançamentos entre os horários epoch 'inicio' e 'fim' (inclusivos)."""
+        return self._texto(bisect_left(self._tempos, inicio), bisect_right(self._tempos, fim))
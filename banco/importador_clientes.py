@@ -0,0 +1,179 @@
+# ==========================================================
+# IMPORTAÇÃO EM MASSA DE CLIENTES (CSV EM STREAMING)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Substitui chamar criarusuario + criarconta uma vez por linha ao
+#     trazer a base de um banco parceiro.
+#   - O CSV (cabeçalho com nome, cpf, data_nascimento, endereco e,
+#     opcionalmente, agencia e numero) é lido em lotes de
+#     'tamanho_lote' linhas; cada lote é validado e entregue de uma vez
+#     ao destino, que cria os clientes e as contas em massa.
+#   - CPF repetido: contra o registro (consulta O(1) por linha) e dentro
+#     do arquivo. Os lotes anteriores já estão no registro, então só o
+#     lote atual precisa de um conjunto próprio: a memória da importação
+#     é constante, não cresce com o arquivo.
+#   - As linhas recusadas vão direto para um CSV (linha, motivo e os
+#     campos originais) e são contadas por motivo no resumo.
+#   - O destino é informado por funções (como as operações do modo em
+#     lote): 'cpf_existe', 'validar_conta' e 'inserir_lote'.
+# ==========================================================
+
+import csv
+import time
+from itertools import islice
+
+TAMANHO_LOTE = 20_000
+
+# Motivos de recusa de uma linha
+MOTIVO_CAMPOS_FALTANDO = "campos_faltando"
+MOTIVO_CPF_INVALIDO = "cpf_invalido"
+MOTIVO_CPF_CADASTRADO = "cpf_ja_cadastrado"
+MOTIVO_CPF_REPETIDO = "cpf_repetido_no_arquivo"
+MOTIVO_CONTA_INVALIDA = "conta_invalida"
+MOTIVO_CONTA_EXISTENTE = "conta_ja_existe"
+
+# Nomes aceitos no cabeçalho para cada campo
+_SINONIMOS = {
+    "nome": ("nome",),
+    "cpf": ("cpf",),
+    "data_nascimento": ("data_nascimento", "dta", "nascimento"),
+    "endereco": ("endereco", "endereço"),
+    "agencia": ("agencia", "agência"),
+    "numero": ("numero", "número", "conta"),
+}
+
+
+def _colunas(cabecalho):
+    """Posição de cada campo no cabeçalho (None para os ausentes)."""
+    normalizado = [nome.strip().lower() for nome in cabecalho]
+    posicoes = {}
+    for campo, nomes in _SINONIMOS.items():
+        posicoes[campo] = next((normalizado.index(nome) for nome in nomes if nome in normalizado), None)
+    if posicoes["nome"] is None or posicoes["cpf"] is None:
+        raise ValueError("O CSV precisa das colunas 'nome' e 'cpf'.")
+    return posicoes
+
+
+def ler_lotes(caminho: str, tamanho_lote: int = TAMANHO_LOTE):
+    """Gera (posições das colunas, número do primeiro registro, lote) com até 'tamanho_lote' listas de campos.
+
+    O número do registro conta a partir de 2 (o cabeçalho é o 1), como as linhas de um CSV sem quebras dentro dos campos.
+    """
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        leitor = csv.reader(arquivo)
+        posicoes = _colunas(next(leitor, []))
+        primeira = 2
+        while True:
+            lote = list(islice(leitor, tamanho_lote))  # o csv monta o lote sem passar por código Python por linha
+            if not lote:
+                return
+            yield posicoes, primeira, lote
+            primeira += len(lote)
+
+
+class ResumoImportacao:
+    """Contagem de clientes/contas criados e de linhas recusadas por motivo."""
+
+    def __init__(self):
+        self.clientes = 0
+        self.contas = 0
+        self.recusadas = {}  # motivo -> quantidade
+        self.lotes = 0
+        self.segundos = 0.0
+
+    @property
+    def linhas(self):
+        return self.clientes + sum(self.recusadas.values())
+
+    def __str__(self):
+        linhas = ["=== RESUMO DA IMPORTAÇÃO ===",
+                  f"Clientes criados: {self.clientes} | Contas criadas: {self.contas} | Lotes: {self.lotes}"]
+        for motivo, quantidade in sorted(self.recusadas.items()):
+            linhas.append(f"Recusadas ({motivo}): {quantidade}")
+        taxa = self.linhas / self.segundos if self.segundos else 0.0
+        linhas.append(f"Total: {self.linhas} linhas em {self.segundos:.2f}s ({taxa:,.0f}/s)")
+        return "\n".join(linhas)
+
+
+def importar_clientes(caminho: str, cpf_existe, validar_conta, inserir_lote, rejeitadas: str = None,
+                      tamanho_lote: int = TAMANHO_LOTE) -> ResumoImportacao:
+    """Importa o CSV lote a lote e retorna o resumo.
+
+    cpf_existe(cpf) -> bool:                 o CPF já está no registro do destino
+    validar_conta(agencia, numero) -> motivo: None se a conta informada pode ser criada
+    inserir_lote(clientes, contas):          cria de uma vez os clientes (nome, cpf, data, endereço) e
+                                             as contas (cpf, agência, número); agência/número None = o
+                                             destino escolhe
+    rejeitadas:                              CSV onde gravar as linhas recusadas (linha, motivo, campos)
+    """
+    resumo = ResumoImportacao()
+    inicio = time.perf_counter()
+    arquivo_rejeitadas = open(rejeitadas, "w", encoding="utf-8", newline="") if rejeitadas else None
+    try:
+        escritor = csv.writer(arquivo_rejeitadas) if arquivo_rejeitadas else None
+        if escritor:
+            escritor.writerow(["linha", "motivo", "campos"])
+        recusadas = resumo.recusadas
+
+        for posicoes, primeira, lote in ler_lotes(caminho, tamanho_lote):
+            p_nome, p_cpf = posicoes["nome"], posicoes["cpf"]
+            p_data, p_endereco = posicoes["data_nascimento"], posicoes["endereco"]
+            p_agencia, p_numero = posicoes["agencia"], posicoes["numero"]
+            largura = max(posicao for posicao in posicoes.values() if posicao is not None) + 1
+
+            clientes, contas = [], []
+            cpfs_lote, contas_lote = set(), set()
+            for numero_linha, campos in enumerate(lote, primeira):
+                motivo = None
+                if len(campos) < largura:
+                    campos = campos + [""] * (largura - len(campos))
+                nome, cpf = campos[p_nome].strip(), campos[p_cpf].strip()
+                agencia = campos[p_agencia].strip() if p_agencia is not None else ""
+                numero = campos[p_numero].strip() if p_numero is not None else ""
+
+                if not nome or not cpf:
+                    motivo = MOTIVO_CAMPOS_FALTANDO
+                elif not cpf.isdigit():
+                    motivo = MOTIVO_CPF_INVALIDO
+                elif cpf in cpfs_lote:
+                    motivo = MOTIVO_CPF_REPETIDO
+                elif cpf_existe(cpf):
+                    motivo = MOTIVO_CPF_CADASTRADO
+                elif agencia or numero:
+                    if not (agencia.isdigit() and numero.isdigit()):
+                        motivo = MOTIVO_CONTA_INVALIDA
+                    else:
+                        agencia, numero = int(agencia), int(numero)
+                        if (agencia, numero) in contas_lote:
+                            motivo = MOTIVO_CONTA_EXISTENTE
+                        else:
+                            motivo = validar_conta(agencia, numero)
+                else:
+                    agencia = numero = None
+
+                if motivo is not None:
+                    recusadas[motivo] = recusadas.get(motivo, 0) + 1
+                    if escritor:
+                        escritor.writerow([numero_linha, motivo, *campos])
+                    continue
+
+                cpfs_lote.add(cpf)
+                if agencia is not None:
+                    contas_lote.add((agencia, numero))
+                clientes.append((nome, cpf,
+                                 campos[p_data].strip() if p_data is not None else "",
+                                 campos[p_endereco].strip() if p_endereco is not None else ""))
+                contas.append((cpf, agencia, numero))
+
+            if clientes:
+                inserir_lote(clientes, contas)
+            resumo.clientes += len(clientes)
+            resumo.contas += len(contas)
+            resumo.lotes += 1
+    finally:
+        if arquivo_rejeitadas:
+            arquivo_rejeitadas.close()
+    resumo.segundos = time.perf_counter() - inicio
+    return resumo
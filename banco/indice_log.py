@@ -0,0 +1,310 @@
+# ==========================================================
+# ÍNDICE LATERAL DO LOG E CONSULTAS INDEXADAS
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Para cada linha gravada no log.txt o índice guarda, em colunas
+#     'array': posição (byte) da linha no arquivo, horário (epoch),
+#     código da operação e valor da operação.
+#   - Índices secundários:
+#       por operação:  lista ordenada de ids de linha de cada operação;
+#       por tempo:     a coluna de horários é mantida ordenada, então um
+#                      período vira um intervalo de ids via busca binária;
+#       por valor:     ids agrupados por faixa logarítmica do valor
+#                      (10 faixas por ordem de grandeza: 1-1.25, ..., 794-1000, ...).
+#   - 'consultar' escolhe o índice mais seletivo, confere os demais filtros
+#     nas colunas e só então lê do log as linhas encontradas (seek direto).
+#   - Tudo é salvo ao lado do log ('log.txt.indice/'), um arquivo binário
+#     por coluna, e recarregado com array.frombytes (sem reprocessar o log).
+#   - Na rotação do log, 'resumo' fornece o período, as contagens por
+#     operação e a faixa de valores do segmento fechado, e 'reiniciar'
+#     esvazia o índice para o novo arquivo.
+# ==========================================================
+
+import math
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from heapq import merge
+
+from banco.dinheiro import reais_ou_nan
+
+# Formato das linhas gravadas pelo decorador 'log' (usado só na reconstrução)
+_PADRAO_LINHA = re.compile(r"Operação (\w+) com argumentos \(('[^']*'|[^,)]*)")  # "1.234,56" inteiro
+
+
+def faixa_valor(valor: float) -> int:
+    """Faixa logarítmica de um valor (0 para valores inválidos ou menores que 1)."""
+    if not valor >= 1 or math.isinf(valor):  # também descarta NaN
+        return 0
+    return int(math.log10(valor) * 10) + 1
+
+
+class IndiceLog:
+    """Índice lateral do arquivo de log com consultas por operação, período e valor."""
+
+    def __init__(self, caminho_log: str = "log.txt"):
+        self.caminho_log = caminho_log
+        self.diretorio = caminho_log + ".indice"
+        self._trava = threading.RLock()
+        self._carregado = False
+
+    # ================================
+    # Carga e persistência
+    # ================================
+    def _novo(self):
+        self._offsets = array("Q")  # posição da linha no log
+        self._tempos = array("d")  # horário (epoch) — mantido em ordem crescente
+        self._ops = array("H")  # código da operação
+        self._valores = array("d")  # valor da operação (NaN quando não numérico)
+        self._nomes_ops = []  # código -> nome da operação
+        self._codigo_op = {}  # nome -> código
+        self._por_op = {}  # código -> array de ids
+        self._por_faixa = {}  # faixa -> array de ids
+        self._salvos = {}  # nome do arquivo -> quantos itens já foram gravados
+
+    def _colunas(self):
+        """Pares (arquivo, array) de tudo o que é persistido."""
+        pares = [("offsets.bin", self._offsets), ("tempos.bin", self._tempos),
+                 ("ops.bin", self._ops), ("valores.bin", self._valores)]
+        pares += [(f"op_{codigo}.bin", ids) for codigo, ids in self._por_op.items()]
+        pares += [(f"faixa_{faixa}.bin", ids) for faixa, ids in self._por_faixa.items()]
+        return pares
+
+    def _carregar(self):
+        """Carrega o índice do disco na primeira utilização."""
+        if self._carregado:
+            return
+        self._novo()
+        self._carregado = True
+
+        caminho_ops = os.path.join(self.diretorio, "operacoes.txt")
+        if not os.path.exists(caminho_ops):
+            # sem índice salvo: indexa o log existente (uma única vez)
+            self.reconstruir()
+            return
+
+        with open(caminho_ops, encoding="utf-8") as arquivo:
+            for nome in arquivo.read().split():
+                self._registrar_op(nome)
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith("faixa_"):
+                self._por_faixa[int(nome[6:-4])] = array("I")
+
+        for nome, coluna in self._colunas():
+            caminho = os.path.join(self.diretorio, nome)
+            if os.path.exists(caminho):
+                with open(caminho, "rb") as arquivo:
+                    coluna.frombytes(arquivo.read())
+
+        # uma queda no meio da gravação pode deixar colunas com tamanhos diferentes
+        total = min(len(self._offsets), len(self._tempos), len(self._ops), len(self._valores))
+        for nome, coluna in self._colunas():
+            if coluna.typecode == "I":
+                del coluna[bisect_left(coluna, total):]
+            else:
+                del coluna[total:]
+            if self._tamanho_em_disco(nome, coluna) != len(coluna):
+                self._regravar(nome, coluna)  # descarta a parte incompleta também no disco
+            self._salvos[nome] = len(coluna)
+
+        # índice de um arquivo que já foi rodado (queda entre a rotação e o reinício do índice)
+        if self._offsets and (not os.path.exists(self.caminho_log)
+                              or os.path.getsize(self.caminho_log) <= self._offsets[-1]):
+            self.reconstruir()
+            return
+
+        # linhas que chegaram ao log mas não ao índice (queda entre as duas gravações)
+        fim_indexado = 0
+        if self._offsets and os.path.exists(self.caminho_log):
+            with open(self.caminho_log, "rb") as arquivo:
+                arquivo.seek(self._offsets[-1])
+                fim_indexado = self._offsets[-1] + len(arquivo.readline())
+        if os.path.exists(self.caminho_log) and os.path.getsize(self.caminho_log) > fim_indexado:
+            self._indexar_cauda(fim_indexado)
+
+    def _tamanho_em_disco(self, nome, coluna) -> int:
+        caminho = os.path.join(self.diretorio, nome)
+        return os.path.getsize(caminho) // coluna.itemsize if os.path.exists(caminho) else 0
+
+    def _regravar(self, nome, coluna):
+        with open(os.path.join(self.diretorio, nome), "wb") as arquivo:
+            coluna.tofile(arquivo)
+
+    def descarregar(self):
+        """Grava no disco a parte das colunas que ainda não foi salva."""
+        with self._trava:
+            if not self._carregado:
+                return
+            os.makedirs(self.diretorio, exist_ok=True)
+            if self._salvos.get("operacoes.txt") != len(self._nomes_ops):
+                with open(os.path.join(self.diretorio, "operacoes.txt"), "w", encoding="utf-8") as arquivo:
+                    arquivo.write("\n".join(self._nomes_ops))
+                self._salvos["operacoes.txt"] = len(self._nomes_ops)
+            for nome, coluna in self._colunas():
+                salvos = self._salvos.get(nome, 0)
+                if salvos == len(coluna):
+                    continue
+                with open(os.path.join(self.diretorio, nome), "ab") as arquivo:
+                    coluna[salvos:].tofile(arquivo)
+                self._salvos[nome] = len(coluna)
+
+    # ================================
+    # Registro de linhas
+    # ================================
+    def _registrar_op(self, nome: str) -> int:
+        codigo = self._codigo_op.get(nome)
+        if codigo is None:
+            codigo = len(self._nomes_ops)
+            self._nomes_ops.append(nome)
+            self._codigo_op[nome] = codigo
+            self._por_op[codigo] = array("I")
+        return codigo
+
+    def registrar(self, offset: int, tempo: float, operacao: str, valor: float):
+        """Indexa uma linha gravada na posição 'offset' do log."""
+        with self._trava:
+            self._carregar()
+            # horários fora de ordem (threads concorrentes) são ajustados para manter a coluna ordenada
+            if self._tempos and tempo < self._tempos[-1]:
+                tempo = self._tempos[-1]
+            id_linha = len(self._offsets)
+            codigo = self._registrar_op(operacao)
+            self._offsets.append(offset)
+            self._tempos.append(tempo)
+            self._ops.append(codigo)
+            self._valores.append(valor)
+            self._por_op[codigo].append(id_linha)
+            faixa = faixa_valor(valor)
+            ids_faixa = self._por_faixa.get(faixa)
+            if ids_faixa is None:
+                ids_faixa = self._por_faixa[faixa] = array("I")
+            ids_faixa.append(id_linha)
+
+    def reiniciar(self):
+        """Esvazia o índice (memória e disco); usado quando o log é rodado e recomeça vazio."""
+        with self._trava:
+            self._novo()
+            self._carregado = True
+            if os.path.isdir(self.diretorio):
+                for nome in os.listdir(self.diretorio):
+                    os.remove(os.path.join(self.diretorio, nome))
+
+    def reconstruir(self):
+        """Indexa um log já existente lendo-o uma vez (linhas antigas ficam com horário 0)."""
+        with self._trava:
+            self._novo()
+            self._carregado = True
+            os.makedirs(self.diretorio, exist_ok=True)
+            for nome in os.listdir(self.diretorio):
+                os.remove(os.path.join(self.diretorio, nome))  # descarta um índice antigo/incompleto
+            self._indexar_cauda(0)
+            self.descarregar()
+
+    def _indexar_cauda(self, inicio: int):
+        """Indexa as linhas do log a partir do byte 'inicio' lendo o texto de cada uma."""
+        if not os.path.exists(self.caminho_log):
+            return
+        offset = inicio
+        with open(self.caminho_log, "rb") as arquivo:
+            arquivo.seek(inicio)
+            for bruto in arquivo:
+                encontrado = _PADRAO_LINHA.search(bruto.decode("utf-8", "replace"))
+                if encontrado:
+                    valor = reais_ou_nan(encontrado.group(2).strip("'\" "))
+                    self.registrar(offset, 0.0, encontrado.group(1), valor)
+                offset += len(bruto)
+
+    # ================================
+    # Consultas
+    # ================================
+    def __len__(self):
+        with self._trava:
+            self._carregar()
+            return len(self._offsets)
+
+    def operacoes(self):
+        """Nomes das operações já vistas no log."""
+        with self._trava:
+            self._carregar()
+            return list(self._nomes_ops)
+
+    def resumo(self) -> dict:
+        """Período, quantidade de linhas, contagem por operação e faixa de valores do log indexado."""
+        with self._trava:
+            self._carregar()
+            valores = [valor for valor in self._valores if valor == valor]  # sem NaN
+            return {
+                "inicio": self._tempos[0] if self._tempos else None,
+                "fim": self._tempos[-1] if self._tempos else None,
+                "linhas": len(self._offsets),
+                "operacoes": {nome: len(self._por_op[codigo])
+                              for codigo, nome in enumerate(self._nomes_ops) if self._por_op[codigo]},
+                "valor_min": min(valores) if valores else None,
+                "valor_max": max(valores) if valores else None,
+            }
+
+    @staticmethod
+    def _recortar(ids, inicio, fim):
+        """Parte de uma lista ordenada de ids que cai em [inicio, fim)."""
+        return ids[bisect_left(ids, inicio):bisect_left(ids, fim)]
+
+    def consultar(self, operacao=None, valor_min=None, valor_max=None, inicio=None, fim=None):
+        """Gera, em ordem de arquivo, os ids das linhas que atendem a todos os filtros.
+
+        'inicio' e 'fim' são horários epoch (inclusivos); os valores também são inclusivos.
+        """
+        with self._trava:
+            self._carregar()
+            tempos, ops, valores = self._tempos, self._ops, self._valores
+            total = len(self._offsets)
+
+            # período: intervalo contínuo de ids por busca binária na coluna de horários
+            primeiro = bisect_left(tempos, inicio, 0, total) if inicio is not None else 0
+            ultimo = bisect_right(tempos, fim, 0, total) if fim is not None else total
+            if primeiro >= ultimo:
+                return iter(())
+
+            candidatos = [(ultimo - primeiro, range(primeiro, ultimo))]
+
+            codigo = None
+            if operacao is not None:
+                codigo = self._codigo_op.get(operacao)
+                if codigo is None:
+                    return iter(())
+                ids = self._recortar(self._por_op[codigo], primeiro, ultimo)
+                candidatos.append((len(ids), ids))
+
+            if valor_min is not None or valor_max is not None:
+                menor = faixa_valor(valor_min) if valor_min is not None else 0
+                maior = faixa_valor(valor_max) if valor_max is not None else math.inf
+                partes = [self._recortar(ids, primeiro, ultimo)
+                          for faixa, ids in self._por_faixa.items() if menor <= faixa <= maior]
+                candidatos.append((sum(map(len, partes)), merge(*partes)))
+
+            # percorre o conjunto de candidatos menor e confere os outros filtros nas colunas
+            _, escolhidos = min(candidatos, key=lambda par: par[0])
+
+        def filtrar():
+            for id_linha in escolhidos:
+                if codigo is not None and ops[id_linha] != codigo:
+                    continue
+                valor = valores[id_linha]
+                if valor_min is not None and not valor >= valor_min:
+                    continue
+                if valor_max is not None and not valor <= valor_max:
+                    continue
+                yield id_linha
+
+        return filtrar()
+
+    def linhas(self, ids):
+        """Lê do log apenas as linhas dos ids informados."""
+        offsets = self._offsets
+        with open(self.caminho_log, "rb") as arquivo:
+            for id_linha in ids:
+                arquivo.seek(offsets[id_linha])
+                yield arquivo.readline().decode("utf-8").rstrip("\n")
@@ -0,0 +1,104 @@
+# ==========================================================
+# LIMITADOR DE SAQUES POR JANELA DE TEMPO (TABELA COMPARTILHADA)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Substitui os contadores de saque que nunca zeravam: cada conta
+#     pode fazer 'limite' saques por 'janela' segundos, e a permissão
+#     volta aos poucos (um saque a cada janela/limite segundos), como
+#     um balde de fichas.
+#   - Implementado como GCRA: por conta guarda só um horário (o
+#     "horário teórico" em que o balde estará cheio de novo) numa
+#     coluna array('d') — 8 bytes por conta, 80 MB para 10 milhões.
+#   - Checagem e consumo são O(1) e a expiração é preguiçosa: nada
+#     precisa ser varrido ou zerado quando a janela passa.
+#   - O limite e a janela vêm de quem pergunta (ex: atributos do tipo
+#     de conta), então cada tipo de conta pode ter a sua política.
+#   - O limitador não tem trava própria por conta: quem chama já segura
+#     a trava da conta; só a criação de posições é protegida.
+# ==========================================================
+
+import math
+import threading
+import time
+from array import array
+
+JANELA_DIARIA = 86400.0  # segundos
+
+
+class LimitadorSaques:
+    """Tabela de limites de saque por conta (uma posição por conta)."""
+
+    def __init__(self):
+        self._cheio_em = array("d")  # por posição: epoch em que o balde volta a ficar cheio
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._cheio_em)
+
+    def nova_conta(self) -> int:
+        """Reserva a posição de uma conta na tabela e a retorna."""
+        with self._trava:
+            self._cheio_em.append(0.0)
+            return len(self._cheio_em) - 1
+
+    def novas_contas(self, quantidade: int) -> range:
+        """Reserva as posições de 'quantidade' contas de uma vez e as retorna."""
+        with self._trava:
+            primeira = len(self._cheio_em)
+            self._cheio_em.extend(array("d", bytes(8 * quantidade)))
+            return range(primeira, primeira + quantidade)
+
+    # ================================
+    # Checagem e consumo
+    # ================================
+    def permitido(self, posicao: int, limite: int, janela: float = JANELA_DIARIA, agora: float = None) -> bool:
+        """True se a conta ainda pode sacar agora (não consome)."""
+        if limite <= 0:
+            return False
+        agora = time.time() if agora is None else agora
+        intervalo = janela / limite
+        # saques ainda "dentro da janela" = (cheio_em - agora) / intervalo; aceita se < limite
+        # (meio intervalo de folga absorve o arredondamento do float)
+        return self._cheio_em[posicao] - agora < janela - intervalo / 2
+
+    def consumir(self, posicao: int, limite: int, janela: float = JANELA_DIARIA, agora: float = None):
+        """Registra um saque feito pela conta."""
+        agora = time.time() if agora is None else agora
+        cheio_em = self._cheio_em[posicao]
+        self._cheio_em[posicao] = (cheio_em if cheio_em > agora else agora) + janela / limite
+
+    def tentar(self, posicao: int, limite: int, janela: float = JANELA_DIARIA, agora: float = None) -> bool:
+        """Checa e, se permitido, já consome um saque."""
+        agora = time.time() if agora is None else agora
+        if not self.permitido(posicao, limite, janela, agora):
+            return False
+        self.consumir(posicao, limite, janela, agora)
+        return True
+
+    def disponiveis(self, posicao: int, limite: int, janela: float = JANELA_DIARIA, agora: float = None) -> int:
+        """Quantos saques a conta pode fazer agora."""
+        if limite <= 0:
+            return 0
+        agora = time.time() if agora is None else agora
+        intervalo = janela / limite
+        ocupado = max(0.0, self._cheio_em[posicao] - agora)
+        # k saques seguidos passam enquanto ocupado + (k-1)*intervalo < janela - intervalo/2
+        return max(0, min(limite, math.ceil((janela - ocupado) / intervalo + 0.5) - 1))
+
+    def proximo_em(self, posicao: int, limite: int, janela: float = JANELA_DIARIA, agora: float = None) -> float:
+        """Segundos até o próximo saque ser permitido (0 se já é)."""
+        if limite <= 0:
+            return float("inf")
+        agora = time.time() if agora is None else agora
+        return max(0.0, self._cheio_em[posicao] - agora - (janela - janela / limite))
+
+    # ================================
+    # Snapshot (persistência)
+    # ================================
+    def estado(self, posicao: int) -> float:
+        return self._cheio_em[posicao]
+
+    def restaurar_estado(self, posicao: int, cheio_em: float):
+        self._cheio_em[posicao] = cheio_em
@@ -0,0 +1,108 @@
+# ==========================================================
+# PROCESSAMENTO EM LOTE DE ARQUIVOS DE TRANSAÇÕES (SEM MENU)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Lê um arquivo de transações em streaming (uma linha por vez,
+#     sem carregar o arquivo inteiro):
+#       .jsonl / .json -> um objeto JSON por linha
+#       outros (.csv)  -> CSV com cabeçalho
+#     Campo "op": deposito, saque, criar_usuario ou criar_conta; os
+#     demais campos são os argumentos da operação (valor, nome, cpf,
+#     dta, endereco, titular).
+#   - Uma linha JSON malformada (ou que não é um objeto) vira None e é
+#     contada como inválida, como uma linha CSV com campos errados; o
+#     resto do lote continua.
+#   - Cada linha é entregue à função do script para aquela operação
+#     (as mesmas regras de negócio do menu); os eventos das operações
+#     vão para o DestinoNulo (nem chegam a ser montados) e, no fim, um
+#     resumo é impresso.
+#   - Uma transação cuja função lança exceção (valor com tipo errado,
+#     regra que recusa lançando erro...) conta como recusada; campo
+#     obrigatório ausente (KeyError) conta como inválida. Nenhuma
+#     transação interrompe o lote.
+# ==========================================================
+
+import contextlib
+import csv
+import json
+import time
+
+from banco.eventos import DestinoNulo, eventos
+
+
+def ler_transacoes(caminho: str):
+    """Gera um dicionário por transação do arquivo (JSON lines ou CSV com cabeçalho).
+
+    Linhas JSON malformadas ou que não são um objeto geram None (transação inválida).
+    """
+    with open(caminho, encoding="utf-8", newline="") as arquivo:
+        if caminho.endswith((".jsonl", ".json")):
+            for linha in arquivo:
+                if linha.strip():
+                    try:
+                        transacao = json.loads(linha)
+                    except json.JSONDecodeError:
+                        transacao = None
+                    yield transacao if isinstance(transacao, dict) else None
+        else:
+            yield from csv.DictReader(arquivo)
+
+
+class ResumoLote:
+    """Contagem de transações aceitas, recusadas e inválidas por operação."""
+
+    def __init__(self):
+        self.aceitas = {}  # operação -> quantidade
+        self.recusadas = {}  # operação -> quantidade (regra de negócio recusou)
+        self.invalidas = 0  # linhas malformadas, com operação desconhecida ou campos faltando
+        self.segundos = 0.0
+
+    @property
+    def total(self):
+        return sum(self.aceitas.values()) + sum(self.recusadas.values()) + self.invalidas
+
+    def __str__(self):
+        linhas = ["=== RESUMO DO LOTE ==="]
+        for operacao in sorted(set(self.aceitas) | set(self.recusadas)):
+            linhas.append(f"{operacao}: {self.aceitas.get(operacao, 0)} aceitas, "
+                          f"{self.recusadas.get(operacao, 0)} recusadas")
+        linhas.append(f"Linhas inválidas: {self.invalidas}")
+        taxa = self.total / self.segundos if self.segundos else 0.0
+        linhas.append(f"Total: {self.total} transações em {self.segundos:.2f}s ({taxa:,.0f}/s)")
+        return "\n".join(linhas)
+
+
+def processar_transacoes(transacoes, operacoes, silencioso: bool = True) -> ResumoLote:
+    """Aplica as transações em ordem e retorna o resumo.
+
+    'operacoes' mapeia o nome da operação para uma função que recebe o
+    dicionário da transação e retorna verdadeiro se ela foi aceita.
+    Com 'silencioso', os eventos das operações são descartados durante o lote.
+    """
+    resumo = ResumoLote()
+    inicio = time.perf_counter()
+    with contextlib.ExitStack() as pilha:
+        if silencioso:
+            pilha.enter_context(eventos.redirecionar(DestinoNulo()))
+        for transacao in transacoes:
+            if not isinstance(transacao, dict):
+                resumo.invalidas += 1  # linha que não pôde ser lida
+                continue
+            operacao = transacao.get("op")
+            funcao = operacoes.get(operacao)
+            if funcao is None:
+                resumo.invalidas += 1
+                continue
+            try:
+                aceita = funcao(transacao)
+            except KeyError:
+                resumo.invalidas += 1  # campo obrigatório ausente
+                continue
+            except Exception:
+                aceita = False  # a operação falhou nesta transação: recusada, o lote continua
+            contagem = resumo.aceitas if aceita else resumo.recusadas
+            contagem[operacao] = contagem.get(operacao, 0) + 1
+    resumo.segundos = time.perf_counter() - inicio
+    return resumo
@@ -0,0 +1,260 @@
+# ==========================================================
+# MÉTRICAS DAS OPERAÇÕES (CONTADORES E HISTOGRAMAS DE LATÊNCIA)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - '@metricas.instrumentar("nome")' conta chamadas, sucessos e
+#     falhas por motivo e mede a latência com perf_counter_ns.
+#   - A função instrumentada informa o motivo de uma recusa com
+#     'registrar_falha(MOTIVO_...)' antes de retornar; o decorator o
+#     atribui à chamada (e também às chamadas externas que a envolvem).
+#   - Latência em histograma de potências de 2 (65 faixas de ns num
+#     array): memória fixa e percentis aproximados sem guardar amostras.
+#   - Amostragem: com 'amostragem=N' só 1 a cada N chamadas mede a
+#     latência; contagens e motivos continuam exatos. O registro
+#     compartilhado 'metricas' usa N=16.
+#   - Uma exceção que escapa da função conta como falha com o motivo
+#     MOTIVO_EXCECAO e é relançada: chamadas = sucessos + falhas.
+#   - Cada thread atualiza suas próprias tabelas (sem trava no caminho
+#     quente); 'snapshot' junta todas na hora da leitura. Cada função
+#     instrumentada guarda num threading.local próprio a estatística da
+#     thread, então o caminho quente faz um único acesso por chamada.
+#   - Tabelas de threads que já terminaram são somadas num acumulado e
+#     descartadas no 'snapshot' (as contagens delas não se perdem).
+# ==========================================================
+
+import json
+import threading
+import time
+from array import array
+
+# Motivos de falha padronizados
+MOTIVO_VALOR_INVALIDO = "valor_invalido"
+MOTIVO_SALDO_INSUFICIENTE = "saldo_insuficiente"
+MOTIVO_ACIMA_LIMITE = "acima_do_limite"
+MOTIVO_LIMITE_SAQUES = "limite_de_saques"
+MOTIVO_MESMA_CONTA = "mesma_conta"  # transferência para a própria conta
+MOTIVO_CONTA_INVALIDA = "conta_invalida"  # destino que não é uma conta
+MOTIVO_DESCONHECIDO = "desconhecido"  # falhou sem informar o motivo
+MOTIVO_EXCECAO = "excecao"  # a função lançou uma exceção
+
+_FAIXAS = 65  # faixa k = bit_length da latência: [2^(k-1), 2^k) ns
+
+
+class _Estatistica:
+    """Contadores de uma operação em uma thread."""
+
+    __slots__ = ("chamadas", "sucessos", "falhas", "amostras", "total_ns", "maximo_ns", "histograma")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.sucessos = 0
+        self.falhas = {}  # motivo -> quantidade
+        self.amostras = 0  # chamadas com latência medida
+        self.total_ns = 0
+        self.maximo_ns = 0
+        self.histograma = array("Q", bytes(8 * _FAIXAS))
+
+    def somar(self, outra: "_Estatistica"):
+        self.chamadas += outra.chamadas
+        self.sucessos += outra.sucessos
+        for motivo, quantidade in list(outra.falhas.items()):
+            self.falhas[motivo] = self.falhas.get(motivo, 0) + quantidade
+        self.amostras += outra.amostras
+        self.total_ns += outra.total_ns
+        self.maximo_ns = max(self.maximo_ns, outra.maximo_ns)
+        for faixa, quantidade in enumerate(outra.histograma):
+            self.histograma[faixa] += quantidade
+
+
+class _EstadoThread:
+    """Tabelas e motivo da falha em andamento de uma thread."""
+
+    __slots__ = ("thread", "tabela", "motivo")
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.tabela = {}  # operação -> _Estatistica
+        self.motivo = None
+
+
+def _percentil(histograma, amostras: int, fracao: float) -> int:
+    """Limite superior (ns) da faixa onde cai o percentil pedido."""
+    alvo = fracao * amostras
+    acumulado = 0
+    for faixa, quantidade in enumerate(histograma):
+        acumulado += quantidade
+        if quantidade and acumulado >= alvo:
+            return 1 << faixa
+    return 0
+
+
+class Metricas:
+    """Registro de métricas por operação."""
+
+    def __init__(self, amostragem: int = 1, ativo: bool = True):
+        self.amostragem = max(1, int(amostragem))  # mede a latência de 1 a cada N chamadas
+        self.ativo = ativo
+        self._local = threading.local()  # .estado: _EstadoThread da thread
+        self._estados = []  # um _EstadoThread por thread viva (ou ainda não podada)
+        self._encerradas = {}  # operação -> _Estatistica somada das threads que já terminaram
+        self._trava = threading.Lock()  # só para criar tabelas novas e para a leitura
+        self._inicio = time.time()
+
+    def _estado(self) -> _EstadoThread:
+        estado = getattr(self._local, "estado", None)
+        if estado is None:
+            estado = self._local.estado = _EstadoThread()
+            with self._trava:
+                self._estados.append(estado)
+        return estado
+
+    def _estatistica(self, operacao: str):
+        """(estado da thread, estatística da operação nesta thread), criando o que faltar."""
+        estado = self._estado()
+        estatistica = estado.tabela.get(operacao)
+        if estatistica is None:
+            estatistica = estado.tabela[operacao] = _Estatistica()
+        return estado, estatistica
+
+    # ================================
+    # Instrumentação
+    # ================================
+    def registrar_falha(self, motivo: str):
+        """Informa o motivo da recusa da operação em andamento nesta thread."""
+        self._estado().motivo = motivo
+
+    def instrumentar(self, nome: str = None, sucesso=None):
+        """Decorator que mede a função.
+
+        'sucesso(resultado)' diz se a chamada foi aceita; sem ele, vale o valor verdade do resultado.
+        """
+        def decorar(funcao):
+            operacao = nome or funcao.__qualname__
+            local = threading.local()  # .par: (estado, estatística) desta operação nesta thread
+            relogio = time.perf_counter_ns
+
+            def instrumentada(*args, **kwargs):
+                if not self.ativo:
+                    return funcao(*args, **kwargs)
+                try:
+                    estado, estatistica = local.par
+                except AttributeError:
+                    estado, estatistica = local.par = self._estatistica(operacao)
+
+                estado.motivo = None
+                chamadas = estatistica.chamadas = estatistica.chamadas + 1
+                try:
+                    if chamadas % self.amostragem:
+                        resultado = funcao(*args, **kwargs) if kwargs else funcao(*args)
+                    else:
+                        inicio = relogio()
+                        resultado = funcao(*args, **kwargs) if kwargs else funcao(*args)
+                        decorrido = relogio() - inicio
+                        estatistica.amostras += 1
+                        estatistica.total_ns += decorrido
+                        if decorrido > estatistica.maximo_ns:
+                            estatistica.maximo_ns = decorrido
+                        estatistica.histograma[decorrido.bit_length()] += 1
+                except BaseException:
+                    estado.motivo = MOTIVO_EXCECAO  # também vale para as chamadas externas
+                    estatistica.falhas[MOTIVO_EXCECAO] = estatistica.falhas.get(MOTIVO_EXCECAO, 0) + 1
+                    raise
+
+                if (resultado if sucesso is None else sucesso(resultado)):
+                    estatistica.sucessos += 1
+                else:
+                    motivo = estado.motivo or MOTIVO_DESCONHECIDO
+                    estatistica.falhas[motivo] = estatistica.falhas.get(motivo, 0) + 1
+                return resultado
+
+            instrumentada.__name__ = funcao.__name__
+            instrumentada.__qualname__ = funcao.__qualname__
+            instrumentada.__doc__ = funcao.__doc__
+            instrumentada.__wrapped__ = funcao
+            return instrumentada
+        return decorar
+
+    # ================================
+    # Leitura
+    # ================================
+    def snapshot(self) -> dict:
+        """Retorna as métricas de todas as threads somadas, por operação."""
+        with self._trava:
+            vivos = []
+            for estado in self._estados:
+                if estado.thread.is_alive():
+                    vivos.append(estado)
+                else:  # thread encerrada: guarda as contagens e solta a tabela
+                    for operacao, estatistica in estado.tabela.items():
+                        total = self._encerradas.get(operacao)
+                        if total is None:
+                            total = self._encerradas[operacao] = _Estatistica()
+                        total.somar(estatistica)
+            self._estados = vivos
+            tabelas = [self._encerradas] + [estado.tabela for estado in vivos]
+            somadas = {}
+            for tabela in tabelas:
+                for operacao, estatistica in list(tabela.items()):
+                    total = somadas.get(operacao)
+                    if total is None:
+                        total = somadas[operacao] = _Estatistica()
+                    total.somar(estatistica)
+
+        resultado = {}
+        for operacao, total in sorted(somadas.items()):
+            amostras = total.amostras
+            resultado[operacao] = {
+                "chamadas": total.chamadas,
+                "sucessos": total.sucessos,
+                "falhas": dict(sorted(total.falhas.items())),
+                "latencia_ns": {
+                    "amostras": amostras,
+                    "media": total.total_ns // amostras if amostras else 0,
+                    "p50": _percentil(total.histograma, amostras, 0.50),
+                    "p90": _percentil(total.histograma, amostras, 0.90),
+                    "p99": _percentil(total.histograma, amostras, 0.99),
+                    "maximo": total.maximo_ns,
+                },
+                # limite superior da faixa (ns) -> quantidade, só as faixas usadas
+                "histograma": {1 << faixa: quantidade
+                               for faixa, quantidade in enumerate(total.histograma) if quantidade},
+            }
+        return resultado
+
+    def exportar(self, caminho: str = None) -> str:
+        """Snapshot em JSON; grava no arquivo se 'caminho' for informado."""
+        texto = json.dumps({"desde": self._inicio, "amostragem": self.amostragem,
+                            "operacoes": self.snapshot()}, indent=2, ensure_ascii=False)
+        if caminho:
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.write(texto)
+        return texto
+
+    def texto(self) -> str:
+        """Resumo legível: uma linha por operação."""
+        linhas = []
+        for operacao, dados in self.snapshot().items():
+            latencia = dados["latencia_ns"]
+            falhas = ", ".join(f"{motivo}={quantidade}" for motivo, quantidade in dados["falhas"].items())
+            linhas.append(f"{operacao}: {dados['chamadas']} chamadas, {dados['sucessos']} sucessos"
+                          f"{' (' + falhas + ')' if falhas else ''} | média {latencia['media']} ns,"
+                          f" p50 ≤{latencia['p50']} ns, p99 ≤{latencia['p99']} ns")
+        return "\n".join(linhas) if linhas else "Nenhuma operação medida."
+
+    def zerar(self):
+        """Descarta todas as contagens (as threads recomeçam do zero)."""
+        with self._trava:
+            self._encerradas = {}
+            for estado in self._estados:
+                for estatistica in estado.tabela.values():
+                    estatistica.__init__()  # zera no lugar: as funções instrumentadas guardam a referência
+        self._inicio = time.time()
+
+
+# Registro compartilhado pelo banco e atalhos para ele (latência
+# amostrada: medir toda chamada custaria mais que a própria operação)
+metricas = Metricas(amostragem=16)
+instrumentar = metricas.instrumentar
+registrar_falha = metricas.registrar_falha
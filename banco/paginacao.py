@@ -0,0 +1,92 @@
+# ==========================================================
+# PAGINAÇÃO COM TOKEN DE CONTINUAÇÃO
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - As listagens (contas da tabela, contas de um cliente, histórico)
+#     devolvem uma página por vez: até 'tamanho' itens e o token para
+#     pedir a seguinte (None na última).
+#   - As coleções só crescem no final, então a posição do próximo item
+#     identifica o ponto de continuação de forma estável: itens novos
+#     não fazem a página seguinte repetir nem pular nada.
+#   - O token é opaco (base64 de "posição:assinatura"); a assinatura
+#     vem dos filtros da consulta, e um token usado com outros filtros
+#     (ou corrompido) é recusado com ValueError.
+#   - O tamanho da página é limitado a TAMANHO_MAXIMO: uma requisição
+#     nunca monta mais que isso de uma vez.
+# ==========================================================
+
+import base64
+import binascii
+import zlib
+from itertools import islice
+
+TAMANHO_PADRAO = 20
+TAMANHO_MAXIMO = 1000
+
+
+class Pagina:
+    """Itens de uma página e o token da próxima (None quando não há mais)."""
+
+    __slots__ = ("itens", "proximo")
+
+    def __init__(self, itens: list, proximo: str = None):
+        self.itens = itens
+        self.proximo = proximo
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+    def __repr__(self):
+        return f"Pagina({len(self.itens)} itens, proximo={self.proximo!r})"
+
+
+def tamanho_pagina(tamanho) -> int:
+    """Tamanho efetivo da página: o padrão se None, no máximo TAMANHO_MAXIMO."""
+    if tamanho is None:
+        return TAMANHO_PADRAO
+    tamanho = int(tamanho)
+    if tamanho < 1:
+        raise ValueError("O tamanho da página deve ser positivo.")
+    return min(tamanho, TAMANHO_MAXIMO)
+
+
+def _assinatura(filtros) -> int:
+    return zlib.crc32(repr(filtros).encode("utf-8"))
+
+
+def gerar_token(posicao: int, filtros) -> str:
+    """Token que continua a listagem (com estes filtros) a partir de 'posicao'."""
+    texto = f"{posicao}:{_assinatura(filtros):08x}"
+    return base64.urlsafe_b64encode(texto.encode("ascii")).rstrip(b"=").decode("ascii")
+
+
+def ler_token(token, filtros) -> int:
+    """Posição guardada no token (0 para None); ValueError se inválido ou de outra consulta."""
+    if token is None:
+        return 0
+    try:
+        texto = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("ascii")
+        posicao, assinatura = texto.split(":")
+        posicao = int(posicao)
+        valido = posicao >= 0 and int(assinatura, 16) == _assinatura(filtros)
+    except (ValueError, TypeError, binascii.Error):
+        valido = False
+    if not valido:
+        raise ValueError("Token de continuação inválido para esta consulta.")
+    return posicao
+
+
+def paginar(itens, tamanho, filtros) -> Pagina:
+    """Monta a página a partir de 'itens', que gera (posição, item) em posições crescentes.
+
+    Só consome tamanho + 1 itens: o excedente apenas indica onde a próxima página começa.
+    """
+    tamanho = tamanho_pagina(tamanho)
+    lidos = list(islice(itens, tamanho + 1))
+    proximo = gerar_token(lidos[tamanho][0], filtros) if len(lidos) > tamanho else None
+    return Pagina([item for _, item in lidos[:tamanho]], proximo)
@@ -0,0 +1,349 @@
+# ==========================================================
+# PERSISTÊNCIA: WRITE-AHEAD LOG (WAL) + SNAPSHOTS
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Toda alteração de estado vira um registro binário no WAL:
+#       [tamanho:4][crc32:4][lsn:8][registro (pickle)]
+#     O crc permite descartar um final de arquivo incompleto após uma queda.
+#   - Group commit: as escritas são acumuladas e uma thread de fundo grava
+#     o lote inteiro com um único fsync. No modo "grupo" quem registra
+#     espera seu lote estar no disco; no modo "assincrono" não espera.
+#   - Protocolo de quem altera o estado: validar, 'registrar' no WAL,
+#     aplicar em memória e só então 'talvez_snapshot'. O snapshot nunca
+#     é tirado entre o registro e a aplicação (ele perderia o registro).
+#     A validação cobre tudo o que poderia fazer a aplicação falhar: um
+#     registro gravado precisa se aplicar sem erro.
+#   - Mesmo assim, um registro que lança exceção na recuperação é pulado
+#     (evento "persistencia.registro_ignorado", contado em 'ignorados')
+#     em vez de impedir o banco de subir.
+#   - A cada 'registros_por_snapshot' registros o estado inteiro é salvo
+#     num snapshot compacto ('snapshot-<lsn>.bin') e o WAL começa um novo
+#     segmento ('wal-<lsn>.log'); segmentos e snapshots antigos são apagados.
+#   - Com 'snapshot_em_fundo', só a captura do estado acontece na thread
+#     de quem chama; a serialização e o fsync do snapshot rodam numa
+#     thread de fundo (um snapshot por vez). Nesse modo 'capturar' deve
+#     devolver cópias, não as estruturas que continuam sendo alteradas.
+#   - Na recuperação carrega o snapshot mais novo e reaplica apenas os
+#     registros do WAL posteriores a ele. O WAL é lido até o primeiro
+#     registro incompleto, corrompido ou fora de sequência; esse final é
+#     cortado do segmento (e os segmentos seguintes são renomeados para
+#     '.descartado') antes de qualquer escrita nova, para que registros
+#     gravados depois da queda nunca fiquem atrás de lixo.
+# ==========================================================
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from banco.eventos import emitir
+
+_CABECALHO = struct.Struct("<IIQ")  # tamanho, crc32, lsn
+
+
+class DiarioWAL:
+    """Write-ahead log em segmentos com group commit."""
+
+    MODOS = ("grupo", "assincrono")
+
+    def __init__(self, diretorio: str, modo: str = "grupo", intervalo: float = 0.002, fsync: bool = True):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo do WAL inválido: {modo}. Use um de {self.MODOS}")
+        self.diretorio = diretorio
+        self.modo = modo
+        self.intervalo = intervalo  # espera máxima (s) antes de gravar um lote no modo assíncrono
+        self.fsync = fsync
+
+        self._arquivo = None
+        self._ultimo_lsn = 0  # lsn do último registro recebido
+        self._gravado = 0  # lsn do último registro já gravado
+        self._pendentes = []  # registros já serializados aguardando gravação
+        self._condicao = threading.Condition()
+        self._thread = None
+        self._fechando = False
+
+    @property
+    def ultimo_lsn(self):
+        return self._ultimo_lsn
+
+    # ================================
+    # Segmentos
+    # ================================
+    @staticmethod
+    def ler_segmento(caminho: str):
+        """Gera (lsn, registro) de um segmento, parando no primeiro registro incompleto ou corrompido."""
+        for lsn, registro, _ in DiarioWAL.ler_segmento_com_posicao(caminho):
+            yield lsn, registro
+
+    @staticmethod
+    def ler_segmento_com_posicao(caminho: str):
+        """Como 'ler_segmento', mas gera (lsn, registro, byte logo após o registro)."""
+        with open(caminho, "rb") as arquivo:
+            dados = arquivo.read()
+        posicao = 0
+        while posicao + _CABECALHO.size <= len(dados):
+            tamanho, crc, lsn = _CABECALHO.unpack_from(dados, posicao)
+            inicio = posicao + _CABECALHO.size
+            carga = dados[inicio:inicio + tamanho]
+            if len(carga) < tamanho or zlib.crc32(carga) != crc:
+                return
+            try:
+                registro = pickle.loads(carga)
+            except Exception:  # crc certo mas carga ilegível: trata como o fim válido do segmento
+                return
+            posicao = inicio + tamanho
+            yield lsn, registro, posicao
+
+    def cortar_segmento(self, caminho: str, tamanho: int):
+        """Descarta o final inválido de um segmento (o que vem depois de 'tamanho' bytes)."""
+        with open(caminho, "r+b") as arquivo:
+            arquivo.truncate(tamanho)
+            arquivo.flush()
+            if self.fsync:
+                os.fsync(arquivo.fileno())
+
+    def descartar_segmento(self, caminho: str):
+        """Tira o segmento da recuperação (renomeado para '.descartado', para análise)."""
+        os.replace(caminho, caminho + ".descartado")
+
+    def segmentos(self):
+        """Lista (primeiro_lsn, caminho) dos segmentos em ordem."""
+        encontrados = []
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith("wal-") and nome.endswith(".log"):
+                encontrados.append((int(nome[4:-4]), os.path.join(self.diretorio, nome)))
+        return sorted(encontrados)
+
+    def abrir_segmento(self, ultimo_lsn: int):
+        """Começa um novo segmento; o próximo registro recebe o lsn 'ultimo_lsn + 1'."""
+        self.descarregar()
+        with self._condicao:
+            if self._arquivo is not None:
+                self._arquivo.close()
+            self._ultimo_lsn = self._gravado = ultimo_lsn
+            caminho = os.path.join(self.diretorio, f"wal-{ultimo_lsn + 1:020d}.log")
+            self._arquivo = open(caminho, "ab")
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._laco, name="diario-wal", daemon=True)
+                self._thread.start()
+
+    # ================================
+    # Escrita
+    # ================================
+    def registrar(self, registro) -> int:
+        """Acrescenta um registro ao WAL e retorna seu lsn."""
+        carga = pickle.dumps(registro, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._condicao:
+            if self._fechando:
+                raise ValueError("WAL já foi fechado.")
+            self._ultimo_lsn += 1
+            lsn = self._ultimo_lsn
+            self._pendentes.append(_CABECALHO.pack(len(carga), zlib.crc32(carga), lsn) + carga)
+            self._condicao.notify_all()
+            if self.modo == "grupo":
+                while self._gravado < lsn:
+                    self._condicao.wait()
+        return lsn
+
+    def descarregar(self):
+        """Bloqueia até que tudo o que foi registrado esteja gravado."""
+        with self._condicao:
+            alvo = self._ultimo_lsn
+            self._condicao.notify_all()
+            while self._thread is not None and self._gravado < alvo:
+                self._condicao.wait()
+
+    def fechar(self):
+        with self._condicao:
+            if self._fechando:
+                return
+            self._fechando = True
+            self._condicao.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+    def _laco(self):
+        condicao = self._condicao
+        while True:
+            with condicao:
+                while not self._pendentes and not self._fechando:
+                    condicao.wait()
+                if self.modo == "assincrono" and not self._fechando:
+                    condicao.wait(self.intervalo)  # junta mais registros no mesmo lote
+                lote = self._pendentes
+                self._pendentes = []
+                alvo = self._ultimo_lsn
+                encerrar = self._fechando
+                arquivo = self._arquivo
+
+            if lote:
+                # um único write + fsync para o lote inteiro (group commit)
+                arquivo.write(b"".join(lote))
+                arquivo.flush()
+                if self.fsync:
+                    os.fsync(arquivo.fileno())
+
+            with condicao:
+                self._gravado = max(self._gravado, alvo)
+                condicao.notify_all()
+                if encerrar and not self._pendentes:
+                    return
+
+
+class Armazenamento:
+    """Estado durável: WAL para cada alteração e snapshots periódicos.
+
+    capturar():          retorna o estado inteiro (qualquer objeto serializável por pickle)
+    restaurar(estado):   substitui o estado em memória pelo do snapshot
+    aplicar(registro):   reaplica um registro do WAL (mesma função usada na operação normal)
+    """
+
+    def __init__(self, diretorio: str, capturar, restaurar, aplicar, modo: str = "grupo",
+                 registros_por_snapshot: int = 100_000, fsync: bool = True, snapshot_em_fundo: bool = False):
+        self.diretorio = diretorio
+        self._capturar = capturar
+        self._restaurar = restaurar
+        self._aplicar = aplicar
+        self.registros_por_snapshot = registros_por_snapshot
+        self.fsync = fsync
+        self.snapshot_em_fundo = snapshot_em_fundo
+        os.makedirs(diretorio, exist_ok=True)
+        self.wal = DiarioWAL(diretorio, modo=modo, fsync=fsync)
+        self._desde_snapshot = 0
+        self._gravacao = None  # thread gravando o último snapshot (modo em fundo)
+        self.ignorados = 0  # registros do WAL que falharam ao ser reaplicados na recuperação
+        self._erro_gravacao = None
+
+    def _snapshots(self):
+        encontrados = []
+        for nome in os.listdir(self.diretorio):
+            if nome.startswith("snapshot-") and nome.endswith(".bin"):
+                encontrados.append((int(nome[9:-4]), os.path.join(self.diretorio, nome)))
+        return sorted(encontrados)
+
+    def recuperar(self) -> int:
+        """Carrega o snapshot mais novo, reaplica o final do WAL e retorna quantos registros foram reaplicados."""
+        lsn_snapshot = 0
+        for lsn, caminho in reversed(self._snapshots()):
+            try:
+                with open(caminho, "rb") as arquivo:
+                    estado = pickle.load(arquivo)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                continue  # snapshot incompleto: tenta o anterior
+            self._restaurar(estado)
+            lsn_snapshot = lsn
+            break
+
+        ultimo = lsn_snapshot
+        reaplicados = 0
+        interrompido = False  # achou o fim válido do WAL: o que vem depois é descartado
+        for _, caminho in self.wal.segmentos():
+            if interrompido:
+                self.wal.descartar_segmento(caminho)
+                continue
+            fim_valido = 0
+            for lsn, registro, fim in DiarioWAL.ler_segmento_com_posicao(caminho):
+                if lsn <= ultimo:
+                    fim_valido = fim
+                    continue
+                if lsn != ultimo + 1:
+                    interrompido = True  # buraco na sequência: o resto não é confiável
+                    break
+                try:
+                    self._aplicar(registro)
+                    reaplicados += 1
+                except Exception as erro:  # um registro que não se aplica não pode impedir o banco de subir
+                    self.ignorados += 1
+                    emitir("persistencia.registro_ignorado",
+                           "Registro {lsn} do WAL não pôde ser reaplicado e foi ignorado: {erro}",
+                           lsn=lsn, erro=repr(erro), registro=repr(registro))
+                ultimo = lsn
+                fim_valido = fim
+            if interrompido or fim_valido < os.path.getsize(caminho):
+                interrompido = True
+                if fim_valido:
+                    self.wal.cortar_segmento(caminho, fim_valido)  # nada novo é gravado depois de lixo
+                else:
+                    self.wal.descartar_segmento(caminho)  # nenhum registro aproveitável
+
+        # continua num segmento novo, depois do último registro válido
+        self.wal.abrir_segmento(ultimo)
+        self._desde_snapshot = reaplicados
+        return reaplicados
+
+    def registrar(self, registro) -> int:
+        """Grava o registro no WAL (antes de aplicá-lo) e retorna seu lsn; não tira snapshot."""
+        lsn = self.wal.registrar(registro)
+        self._desde_snapshot += 1
+        return lsn
+
+    def talvez_snapshot(self):
+        """Tira o snapshot se já é a hora; chamar só depois de aplicar o registro em memória."""
+        if self._desde_snapshot >= self.registros_por_snapshot:
+            self.snapshot()
+
+    def snapshot(self, em_fundo: bool = None):
+        """Salva o estado inteiro (com tudo o que já foi aplicado) e descarta o WAL que ele cobre.
+
+        'em_fundo' (padrão: snapshot_em_fundo) grava o arquivo numa thread de fundo.
+        """
+        self._esperar_gravacao()  # os arquivos antigos são apagados na ordem dos snapshots
+        lsn = self.wal.ultimo_lsn
+        estado = self._capturar()
+        self.wal.abrir_segmento(lsn)  # os registros seguintes vão para um segmento que o snapshot não cobre
+        self._desde_snapshot = 0
+        if self.snapshot_em_fundo if em_fundo is None else em_fundo:
+            self._gravacao = threading.Thread(target=self._gravar_em_fundo, args=(estado, lsn),
+                                              name="snapshot", daemon=True)
+            self._gravacao.start()
+        else:
+            self._gravar(estado, lsn)
+
+    def _gravar_em_fundo(self, estado, lsn):
+        try:
+            self._gravar(estado, lsn)
+        except Exception as erro:  # o snapshot anterior e o WAL continuam no disco
+            self._erro_gravacao = erro
+
+    def _esperar_gravacao(self):
+        """Espera o snapshot em fundo terminar e repassa o erro dele, se houve."""
+        if self._gravacao is not None:
+            self._gravacao.join()
+            self._gravacao = None
+        erro, self._erro_gravacao = self._erro_gravacao, None
+        if erro is not None:
+            raise erro
+
+    def _gravar(self, estado, lsn):
+        """Grava o snapshot de forma atômica e apaga os snapshots e segmentos que ele tornou desnecessários."""
+        caminho = os.path.join(self.diretorio, f"snapshot-{lsn:020d}.bin")
+        temporario = caminho + ".tmp"
+        with open(temporario, "wb") as arquivo:
+            pickle.dump(estado, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+            arquivo.flush()
+            if self.fsync:
+                os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+
+        # o snapshot novo já está no disco: apaga o que ele tornou desnecessário
+        for lsn_antigo, caminho_antigo in self._snapshots():
+            if lsn_antigo < lsn:
+                os.remove(caminho_antigo)
+        for primeiro_lsn, caminho_segmento in self.wal.segmentos():
+            if primeiro_lsn <= lsn:
+                os.remove(caminho_segmento)
+
+    def fechar(self, com_snapshot: bool = True):
+        try:
+            self._esperar_gravacao()
+        finally:
+            if com_snapshot and self._desde_snapshot:
+                self.snapshot(em_fundo=False)  # o último snapshot termina antes de fechar
+            self.wal.fechar()
@@ -0,0 +1,116 @@
+# ==========================================================
+# REGISTRO DE CLIENTES INDEXADO POR CPF
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Substitui as listas planas 'usuarios' e 'cpfcliente'.
+#   - Cada cliente vira um registro 'Usuario' com campos nomeados.
+#   - A busca por CPF usa um dicionário, então consultar,
+#     inserir, atualizar e remover custam O(1) em média,
+#     independente de quantos clientes estejam cadastrados.
+# ==========================================================
+
+
+class Usuario:
+    """Registro estruturado de um cliente (nome, cpf, nascimento, endereço)."""
+
+    __slots__ = ("nome", "cpf", "data_nascimento", "endereco")
+
+    def __init__(self, nome: str, cpf: str, data_nascimento: str = "", endereco: str = ""):
+        self.nome = str(nome)
+        self.cpf = str(cpf)
+        self.data_nascimento = str(data_nascimento)
+        self.endereco = str(endereco)
+
+    def como_tupla(self):
+        """Retorna os campos na mesma ordem da antiga lista plana."""
+        return (self.nome, self.cpf, self.data_nascimento, self.endereco)
+
+    def __eq__(self, outro):
+        if not isinstance(outro, Usuario):
+            return NotImplemented
+        return self.como_tupla() == outro.como_tupla()
+
+    def __repr__(self):
+        return (f"Usuario(nome={self.nome!r}, cpf={self.cpf!r}, "
+                f"data_nascimento={self.data_nascimento!r}, endereco={self.endereco!r})")
+
+
+class RegistroClientes:
+    """Registro de clientes com busca por CPF em tempo constante."""
+
+    # Campos que podem ser alterados por 'atualizar' (o CPF é a chave e não muda)
+    CAMPOS_EDITAVEIS = ("nome", "data_nascimento", "endereco")
+
+    def __init__(self):
+        self._por_cpf = {}  # formato: {'12345678900': Usuario(...), ...}
+
+    # ================================
+    # Consultas
+    # ================================
+    def __contains__(self, cpf):
+        return str(cpf) in self._por_cpf
+
+    def __len__(self):
+        return len(self._por_cpf)
+
+    def __iter__(self):
+        """Itera sobre os registros na ordem de cadastro."""
+        return iter(self._por_cpf.values())
+
+    def __repr__(self):
+        return repr(list(self._por_cpf.values()))
+
+    def obter(self, cpf):
+        """Retorna o registro do CPF informado ou None se não existir."""
+        return self._por_cpf.get(str(cpf))
+
+    def cpfs(self):
+        """Retorna uma visão (sem cópia) dos CPFs cadastrados."""
+        return self._por_cpf.keys()
+
+    # ================================
+    # Alterações
+    # ================================
+    def inserir(self, usuario: Usuario) -> bool:
+        """Cadastra o usuário. Retorna False se o CPF já estiver cadastrado."""
+        if usuario.cpf in self._por_cpf:
+            return False
+        self._por_cpf[usuario.cpf] = usuario
+        return True
+
+    def inserir_lote(self, usuarios) -> int:
+        """Cadastra vários usuários de uma vez (os CPFs já cadastrados são ignorados). Retorna quantos entraram."""
+        por_cpf = self._por_cpf
+        antes = len(por_cpf)
+        for usuario in usuarios:
+            if usuario.cpf not in por_cpf:
+                por_cpf[usuario.cpf] = usuario
+        return len(por_cpf) - antes
+
+    def atualizar(self, cpf, **campos) -> bool:
+        """Altera campos de um cliente existente. Retorna False se o CPF não existir."""
+        usuario = self._por_cpf.get(str(cpf))
+        if usuario is None:
+            return False
+        for campo, valor in campos.items():
+            if campo not in self.CAMPOS_EDITAVEIS:
+                raise ValueError(f"Campo não editável: {campo}")
+            setattr(usuario, campo, str(valor))
+        return True
+
+    def remover(self, cpf):
+        """Remove e retorna o registro do CPF, ou None se não existir."""
+        return self._por_cpf.pop(str(cpf), None)
+
+    # ================================
+    # Snapshot (persistência)
+    # ================================
+    def capturar(self):
+        """Retorna o estado do registro (tuplas na ordem de cadastro) para um snapshot."""
+        return [usuario.como_tupla() for usuario in self._por_cpf.values()]
+
+    def restaurar(self, estado):
+        """Substitui o conteúdo do registro pelo estado de um snapshot."""
+        self._por_cpf = {campos[1]: Usuario(*campos) for campos in estado}
@@ -0,0 +1,262 @@
+# ==========================================================
+# ROTAÇÃO DO LOG EM SEGMENTOS COMPRIMIDOS COM MANIFESTO
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - O log.txt deixa de crescer para sempre: quando passa de
+#     'tamanho_maximo' bytes ou fica aberto por mais de 'duracao_maxima'
+#     segundos, o EscritorLog o fecha e ele vira um segmento em
+#     'log.txt.segmentos/' (log-000001.txt, log-000002.txt, ...).
+#   - Uma thread de fundo comprime os segmentos fechados com gzip
+#     (.txt -> .gz); com 'manter_segmentos', os mais antigos são apagados.
+#   - Um manifesto pequeno ('manifesto.json') guarda, por segmento, o
+#     período (primeiro/último horário), as linhas, a contagem por
+#     operação e a faixa de valores (vindos do IndiceLog do arquivo).
+#   - 'consultar' usa o manifesto para pular os segmentos que não podem
+#     ter linhas do relatório e descomprime/filtra só os relevantes, em
+#     paralelo (um processo por segmento), devolvendo as linhas em ordem.
+#   - Recuperação: um segmento que ficou só no manifesto (queda antes
+#     de mover o arquivo) é descartado; um .txt sem o .gz é comprimido
+#     de novo ao abrir.
+# ==========================================================
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from datetime import datetime
+
+from banco.varredura_log import executar_em_ordem, filtrar_linhas
+
+# Horário no início de cada linha gravada pelo decorador 'log': "[HH:MM:SS]"
+_PADRAO_HORARIO = re.compile(rb"^\[(\d\d):(\d\d):(\d\d)\]")
+
+
+def filtrar_segmento(caminho, inicio_segmento, texto=None, operacao=None, valor_min=None, valor_max=None,
+                     inicio=None, fim=None):
+    """Lê um segmento (descomprimindo aos poucos) e retorna as linhas (bytes) que atendem aos filtros.
+
+    As linhas só trazem a hora; o dia vem do início do segmento (virando quando a hora
+    volta mais de 12h). Sem o início do segmento, os filtros de período descartam a linha.
+    """
+    if not os.path.exists(caminho) and os.path.exists(caminho + ".gz"):
+        caminho += ".gz"  # comprimido entre a leitura do manifesto e agora
+    abrir = gzip.open if caminho.endswith(".gz") else open
+    with abrir(caminho, "rb") as arquivo:
+        # linha a linha: só as linhas encontradas ficam na memória, não o segmento descomprimido inteiro
+        linhas = filtrar_linhas((linha.rstrip(b"\r\n") for linha in arquivo),
+                                texto, operacao, valor_min, valor_max)
+        if inicio is None and fim is None:
+            return list(linhas)
+
+        encontradas = []
+        meia_noite = None
+        if inicio_segmento:
+            data = datetime.fromtimestamp(inicio_segmento)
+            meia_noite = inicio_segmento - (data.hour * 3600 + data.minute * 60 + data.second + data.microsecond / 1e6)
+        dias, anterior = 0, None
+        for linha in linhas:
+            horario = _PADRAO_HORARIO.match(linha)
+            if meia_noite is None or horario is None:
+                continue
+            segundos = int(horario.group(1)) * 3600 + int(horario.group(2)) * 60 + int(horario.group(3))
+            if anterior is not None and segundos < anterior - 43200:
+                dias += 1
+            anterior = segundos
+            tempo = meia_noite + dias * 86400 + segundos  # início do segundo da linha
+            if inicio is not None and tempo + 1 <= inicio:
+                continue
+            if fim is not None and tempo > fim:
+                continue
+            encontradas.append(linha)
+        return encontradas
+
+
+class RotacaoLog:
+    """Política de rotação do log, manifesto dos segmentos e consultas sobre eles."""
+
+    def __init__(self, caminho_log: str = "log.txt", tamanho_maximo: int = 64 * 1024 * 1024,
+                 duracao_maxima: float = 86400.0, manter_segmentos: int = None):
+        self.caminho_log = caminho_log
+        self.diretorio = caminho_log + ".segmentos"
+        self.prefixo = os.path.splitext(os.path.basename(caminho_log))[0]  # 'log'
+        self.tamanho_maximo = tamanho_maximo  # bytes do arquivo ativo que disparam a rotação
+        self.duracao_maxima = duracao_maxima  # segundos que o arquivo ativo pode ficar aberto
+        self.manter_segmentos = manter_segmentos  # None = mantém todos
+        self._trava = threading.RLock()
+        self._carregado = False
+        self._fila = queue.Queue()  # segmentos fechados aguardando compressão
+        self._thread = None
+
+    # ================================
+    # Manifesto
+    # ================================
+    @property
+    def _caminho_manifesto(self):
+        return os.path.join(self.diretorio, "manifesto.json")
+
+    def _carregar(self):
+        """Lê o manifesto na primeira utilização e retoma compressões interrompidas."""
+        if self._carregado:
+            return
+        self._carregado = True
+        self._segmentos = []
+        self._ativo_desde = None
+        if os.path.exists(self._caminho_manifesto):
+            with open(self._caminho_manifesto, encoding="utf-8") as arquivo:
+                documento = json.load(arquivo)
+            self._ativo_desde = documento.get("ativo_desde")
+            for segmento in documento.get("segmentos", []):
+                caminho = os.path.join(self.diretorio, segmento["arquivo"])
+                comprimido = caminho if caminho.endswith(".gz") else caminho + ".gz"
+                if not caminho.endswith(".gz") and not os.path.exists(caminho) and os.path.exists(comprimido):
+                    segmento["arquivo"] += ".gz"  # a compressão terminou, só o manifesto não foi salvo
+                elif not os.path.exists(caminho):
+                    continue  # o arquivo nem chegou a ser movido (ou já foi apagado)
+                self._segmentos.append(segmento)
+                if not segmento["arquivo"].endswith(".gz"):
+                    self._comprimir_depois(segmento)
+        if self._ativo_desde is None:
+            self._ativo_desde = time.time()
+
+    def _salvar(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + os.replace)."""
+        os.makedirs(self.diretorio, exist_ok=True)
+        temporario = self._caminho_manifesto + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({"ativo_desde": self._ativo_desde, "segmentos": self._segmentos}, arquivo, indent=1)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(temporario, self._caminho_manifesto)
+
+    def segmentos(self) -> list:
+        """Cópia das entradas do manifesto, do segmento mais antigo ao mais recente."""
+        with self._trava:
+            self._carregar()
+            return [dict(segmento) for segmento in self._segmentos]
+
+    # ================================
+    # Rotação (chamada pelo EscritorLog)
+    # ================================
+    def cheio(self, tamanho: int, agora: float = None) -> bool:
+        """True se o arquivo ativo (com 'tamanho' bytes) já deve ser fechado."""
+        if tamanho >= self.tamanho_maximo:
+            return True
+        with self._trava:
+            self._carregar()
+            if not os.path.exists(self._caminho_manifesto):
+                self._salvar()  # guarda desde quando o arquivo ativo está aberto (sobrevive a reinícios)
+            agora = time.time() if agora is None else agora
+            return agora - self._ativo_desde >= self.duracao_maxima
+
+    def fechar_segmento(self, resumo: dict = None):
+        """Move o log ativo (já fechado) para um segmento novo e agenda a compressão.
+
+        'resumo' é o IndiceLog.resumo() do arquivo; sem ele, o período é o tempo em que o
+        arquivo ficou aberto e as contagens ficam desconhecidas (o segmento nunca é pulado por elas).
+        Um resumo sem horários (índice reconstruído, com tempos zerados) mantém o período medido.
+        """
+        with self._trava:
+            self._carregar()
+            agora = time.time()
+            numero = int(self._segmentos[-1]["arquivo"].split("-")[-1].split(".")[0]) + 1 if self._segmentos else 1
+            segmento = {
+                "arquivo": f"{self.prefixo}-{numero:06d}.txt",
+                "inicio": self._ativo_desde, "fim": agora,
+                "linhas": None, "operacoes": None, "valor_min": None, "valor_max": None,
+            }
+            if resumo and resumo["linhas"]:
+                segmento.update(resumo)
+                if not resumo["inicio"] or not resumo["fim"]:
+                    segmento["inicio"], segmento["fim"] = self._ativo_desde, agora
+            self._segmentos.append(segmento)
+            self._salvar()  # manifesto antes de mover: uma queda aqui deixa o log ativo intacto
+            os.replace(self.caminho_log, os.path.join(self.diretorio, segmento["arquivo"]))
+            self._ativo_desde = agora
+            self._salvar()
+            self._comprimir_depois(segmento)
+
+    # ================================
+    # Compressão em segundo plano
+    # ================================
+    def _comprimir_depois(self, segmento):
+        self._fila.put(segmento)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._laco, name="rotacao-log", daemon=True)
+            self._thread.start()
+            atexit.register(self.aguardar)
+
+    def aguardar(self):
+        """Bloqueia até todos os segmentos fechados estarem comprimidos."""
+        self._fila.join()
+
+    def _laco(self):
+        while True:
+            segmento = self._fila.get()
+            try:
+                self._comprimir(segmento)
+            finally:
+                self._fila.task_done()
+
+    def _comprimir(self, segmento):
+        original = os.path.join(self.diretorio, segmento["arquivo"])
+        comprimido = original + ".gz"
+        temporario = comprimido + ".tmp"
+        with open(original, "rb") as entrada, gzip.open(temporario, "wb", compresslevel=6) as saida:
+            shutil.copyfileobj(entrada, saida, 1 << 20)
+        os.replace(temporario, comprimido)
+        with self._trava:
+            segmento["arquivo"] += ".gz"
+            segmento["bytes"] = os.path.getsize(comprimido)
+            self._descartar_antigos()
+            self._salvar()
+        os.remove(original)  # só depois do manifesto apontar para o .gz
+
+    def _descartar_antigos(self):
+        """Apaga os segmentos comprimidos mais antigos além de 'manter_segmentos'."""
+        if self.manter_segmentos is None:
+            return
+        while len(self._segmentos) > self.manter_segmentos and self._segmentos[0]["arquivo"].endswith(".gz"):
+            antigo = self._segmentos.pop(0)
+            try:
+                os.remove(os.path.join(self.diretorio, antigo["arquivo"]))
+            except FileNotFoundError:
+                pass
+
+    # ================================
+    # Consultas
+    # ================================
+    @staticmethod
+    def _relevante(segmento, operacao, valor_min, valor_max, inicio, fim) -> bool:
+        """False se o manifesto garante que o segmento não tem linhas do relatório."""
+        if inicio is not None and segmento["fim"] is not None and segmento["fim"] + 1 <= inicio:
+            return False
+        if fim is not None and segmento["inicio"] is not None and segmento["inicio"] > fim:
+            return False
+        if operacao is not None and segmento["operacoes"] is not None and not segmento["operacoes"].get(operacao):
+            return False
+        if valor_min is not None and segmento["valor_max"] is not None and segmento["valor_max"] < valor_min:
+            return False
+        if valor_max is not None and segmento["valor_min"] is not None and segmento["valor_min"] > valor_max:
+            return False
+        return True
+
+    def consultar(self, texto=None, operacao=None, valor_min=None, valor_max=None, inicio=None, fim=None,
+                  processos=None):
+        """Gera, do segmento mais antigo ao mais recente, as linhas que atendem aos filtros.
+
+        'inicio' e 'fim' são horários epoch (inclusivos, com precisão de segundo nas linhas).
+        """
+        tarefas = [(os.path.join(self.diretorio, segmento["arquivo"]), segmento["inicio"],
+                    texto, operacao, valor_min, valor_max, inicio, fim)
+                   for segmento in self.segmentos()
+                   if self._relevante(segmento, operacao, valor_min, valor_max, inicio, fim)]
+        for linhas in executar_em_ordem(filtrar_segmento, tarefas, processos):
+            for linha in linhas:
+                yield linha.decode("utf-8")
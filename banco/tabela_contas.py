@@ -0,0 +1,232 @@
+# ==========================================================
+# TABELA DE CONTAS EM COLUNAS (array)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Substitui a lista plana 'contalista' ([agencia, numero, titular, ...]).
+#   - Agência e número ficam em colunas 'array' de inteiros sem sinal
+#     (4 bytes por conta cada), em vez de um objeto str por campo.
+#   - O titular é guardado como um id inteiro que aponta para uma
+#     tabela de nomes únicos (nomes repetidos ocupam memória uma vez só).
+#   - Um índice por (agência, número) permite localizar a conta em O(1).
+#   - Listagem por páginas (com token de continuação e filtros por
+#     agência/titular) ou por número de página, sem percorrer a tabela:
+#     cada agência e cada titular têm a lista (crescente) das suas
+#     linhas, e o token (a linha seguinte) é achado nela por busca binária.
+# ==========================================================
+
+from array import array
+from bisect import bisect_left
+
+from banco.paginacao import gerar_token, ler_token, paginar, tamanho_pagina
+
+_MAXIMO_COLUNA = 2 ** 32 - 1  # maior agência/número que cabe numa coluna array("I")
+
+
+class TabelaContas:
+    """Tabela colunar de contas: agência, número e titular por linha."""
+
+    def __init__(self, largura_agencia: int = 5, largura_numero: int = 5):
+        self._agencias = array("I")  # coluna de agências
+        self._numeros = array("I")  # coluna de números de conta
+        self._titulares = array("I")  # coluna com o id do nome do titular
+
+        self._nomes = []  # tabela de nomes únicos: id -> nome
+        self._id_nome = {}  # nome -> id (internamento dos titulares)
+
+        self._indice = {}  # chave (agência, número) empacotada em um int -> linha
+        self._linhas_agencia = {}  # agência -> linhas dela (crescentes)
+        self._linhas_titular = {}  # id do titular -> linhas dele (crescentes)
+
+        # Larguras usadas para exibir os números com zeros à esquerda
+        self._largura_agencia = largura_agencia
+        self._largura_numero = largura_numero
+
+    @staticmethod
+    def _chave(agencia: int, numero: int) -> int:
+        """Empacota (agência, número) em um único inteiro para o índice."""
+        return (int(agencia) << 32) | int(numero)
+
+    def _id_titular(self, titular: str) -> int:
+        """Retorna o id do nome, cadastrando-o na tabela de nomes se for novo."""
+        id_nome = self._id_nome.get(titular)
+        if id_nome is None:
+            id_nome = len(self._nomes)
+            self._nomes.append(titular)
+            self._id_nome[titular] = id_nome
+        return id_nome
+
+    def _indexar(self, linha: int, agencia: int, id_titular: int):
+        """Acrescenta a linha às listas da sua agência e do seu titular."""
+        linhas = self._linhas_agencia.get(agencia)
+        if linhas is None:
+            linhas = self._linhas_agencia[agencia] = array("I")
+        linhas.append(linha)
+        linhas = self._linhas_titular.get(id_titular)
+        if linhas is None:
+            linhas = self._linhas_titular[id_titular] = array("I")
+        linhas.append(linha)
+
+    # ================================
+    # Inserção e consulta
+    # ================================
+    def conferir(self, linhas):
+        """Lança ValueError, sem alterar nada, se alguma linha (agência, número, titular) não pode ser
+        cadastrada: agência ou número que não cabem na coluna, conta já existente ou repetida nas linhas."""
+        chaves = set()
+        for agencia, numero, _ in linhas:
+            agencia, numero = int(agencia), int(numero)
+            if not (0 <= agencia <= _MAXIMO_COLUNA and 0 <= numero <= _MAXIMO_COLUNA):
+                raise ValueError(f"Agência ou número fora do intervalo: {agencia} {numero}")
+            chave = self._chave(agencia, numero)
+            if chave in self._indice or chave in chaves:
+                raise ValueError(f"Conta já cadastrada: agência {agencia} número {numero}")
+            chaves.add(chave)
+
+    def adicionar(self, agencia, numero, titular) -> int:
+        """Cadastra a conta e retorna sua linha. Lança ValueError se já existir ou não couber na tabela."""
+        self.conferir([(agencia, numero, titular)])
+        agencia = int(agencia)
+        numero = int(numero)
+        chave = self._chave(agencia, numero)
+
+        linha = len(self._numeros)
+        self._agencias.append(agencia)
+        self._numeros.append(numero)
+        id_titular = self._id_titular(str(titular))
+        self._titulares.append(id_titular)
+        self._indice[chave] = linha
+        self._indexar(linha, agencia, id_titular)
+        return linha
+
+    def adicionar_lote(self, linhas):
+        """Cadastra várias contas (agência, número, titular) de uma vez. Lança ValueError, sem
+        cadastrar nenhuma, se alguma não puder ser cadastrada (ver 'conferir')."""
+        linhas = [(int(agencia), int(numero), str(titular)) for agencia, numero, titular in linhas]
+        self.conferir(linhas)
+        chaves = [(agencia << 32) | numero for agencia, numero, _ in linhas]
+
+        primeira = len(self._numeros)
+        self._agencias.extend(agencia for agencia, _, _ in linhas)
+        self._numeros.extend(numero for _, numero, _ in linhas)
+        self._titulares.extend(self._id_titular(titular) for _, _, titular in linhas)
+        self._indice.update(zip(chaves, range(primeira, primeira + len(linhas))))
+        for linha in range(primeira, len(self._numeros)):
+            self._indexar(linha, self._agencias[linha], self._titulares[linha])
+
+    def existe(self, agencia, numero) -> bool:
+        return self._chave(agencia, numero) in self._indice
+
+    def buscar(self, agencia, numero):
+        """Retorna a linha da conta (agência, número) ou None se não existir."""
+        return self._indice.get(self._chave(agencia, numero))
+
+    def linha(self, posicao: int):
+        """Retorna (agência, número, titular) da linha informada."""
+        return (self._agencias[posicao], self._numeros[posicao],
+                self._nomes[self._titulares[posicao]])
+
+    def formatar(self, agencia: int, numero: int):
+        """Converte agência e número para texto com zeros à esquerda."""
+        return (f"{agencia:0{self._largura_agencia}d}",
+                f"{numero:0{self._largura_numero}d}")
+
+    def linhas_formatadas(self):
+        """Itera sobre (agência, número, titular) já formatados como texto."""
+        nomes = self._nomes
+        for agencia, numero, id_nome in zip(self._agencias, self._numeros, self._titulares):
+            texto_agencia, texto_numero = self.formatar(agencia, numero)
+            yield texto_agencia, texto_numero, nomes[id_nome]
+
+    # ================================
+    # Listagem preguiçosa e paginada
+    # ================================
+    def _linhas_desde(self, inicio: int, agencia=None, titular=None):
+        """Gera (posição, (agência, número, titular)) a partir de 'inicio', só das linhas que atendem aos filtros.
+
+        Com filtro, percorre só as linhas da agência ou do titular (a menor das
+        duas listas quando há os dois filtros), a partir de uma busca binária.
+        """
+        agencias, numeros, titulares, nomes = self._agencias, self._numeros, self._titulares, self._nomes
+        id_titular = None
+        if titular is not None:
+            id_titular = self._id_nome.get(str(titular))
+            if id_titular is None:
+                return  # titular sem contas
+        agencia = None if agencia is None else int(agencia)
+
+        if agencia is None and id_titular is None:
+            candidatas = range(inicio, len(numeros))
+        else:
+            listas = []
+            if agencia is not None:
+                listas.append(self._linhas_agencia.get(agencia, ()))
+            if id_titular is not None:
+                listas.append(self._linhas_titular[id_titular])
+            linhas = min(listas, key=len)
+            candidatas = (linhas[indice] for indice in range(bisect_left(linhas, inicio), len(linhas)))
+
+        for posicao in candidatas:
+            if agencia is not None and agencias[posicao] != agencia:
+                continue
+            if id_titular is not None and titulares[posicao] != id_titular:
+                continue
+            yield posicao, (agencias[posicao], numeros[posicao], nomes[titulares[posicao]])
+
+    def iterar(self, agencia=None, titular=None):
+        """Itera (preguiçosamente) sobre (agência, número, titular) das contas que atendem aos filtros."""
+        for _, linha in self._linhas_desde(0, agencia, titular):
+            yield linha
+
+    def pagina(self, tamanho: int = None, token: str = None, agencia=None, titular=None):
+        """Página de linhas (agência, número, titular) e o token da seguinte.
+
+        Custo O(log n + tamanho) com um filtro ou nenhum; com agência e titular juntos,
+        percorre as linhas do filtro mais seletivo até encher a página.
+        """
+        filtros = ("contas", None if agencia is None else int(agencia), None if titular is None else str(titular))
+        return paginar(self._linhas_desde(ler_token(token, filtros), agencia, titular), tamanho, filtros)
+
+    def pagina_numero(self, numero: int, tamanho: int = None):
+        """Página 'numero' (começando em 1) da tabela inteira, em tempo proporcional à página."""
+        inicio = (numero - 1) * tamanho_pagina(tamanho)
+        return self.pagina(tamanho, gerar_token(max(0, inicio), ("contas", None, None)))
+
+    def total_paginas(self, tamanho: int = None) -> int:
+        tamanho = tamanho_pagina(tamanho)
+        return (len(self) + tamanho - 1) // tamanho
+
+    def __len__(self):
+        return len(self._numeros)
+
+    def __iter__(self):
+        """Itera sobre (agência, número, titular) na ordem de cadastro."""
+        nomes = self._nomes
+        for agencia, numero, id_nome in zip(self._agencias, self._numeros, self._titulares):
+            yield agencia, numero, nomes[id_nome]
+
+    def __repr__(self):
+        return f"TabelaContas({len(self)} contas)"
+
+    # ================================
+    # Snapshot (persistência)
+    # ================================
+    def capturar(self):
+        """Retorna as colunas e a tabela de nomes para um snapshot (arrays viram bytes no pickle)."""
+        return (self._agencias, self._numeros, self._titulares, self._nomes)
+
+    def restaurar(self, estado):
+        """Substitui o conteúdo da tabela pelo estado de um snapshot e refaz o índice."""
+        agencias, numeros, titulares, nomes = estado
+        self._agencias = array("I", agencias)
+        self._numeros = array("I", numeros)
+        self._titulares = array("I", titulares)
+        self._nomes = list(nomes)
+        self._id_nome = {nome: id_nome for id_nome, nome in enumerate(self._nomes)}
+        self._indice = {(agencia << 32) | numero: linha
+                        for linha, (agencia, numero) in enumerate(zip(self._agencias, self._numeros))}
+        self._linhas_agencia = {}
+        self._linhas_titular = {}
+        for linha, (agencia, id_titular) in enumerate(zip(self._agencias, self._titulares)):
+            self._indexar(linha, agencia, id_titular)
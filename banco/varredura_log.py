@@ -0,0 +1,123 @@
+# ==========================================================
+# VARREDURA PARALELA DO LOG (mmap + processos)
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Para relatórios que o índice não cobre (busca por texto livre).
+#   - O log é mapeado em memória (mmap) e dividido em blocos que sempre
+#     terminam numa quebra de linha.
+#   - Um pool de processos filtra os blocos em paralelo; os resultados
+#     são devolvidos em ordem de arquivo, como um gerador, com um número
+#     limitado de blocos em andamento (memória constante).
+#   - Logs pequenos (um bloco só) são filtrados no próprio processo.
+# ==========================================================
+
+import mmap
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from banco.dinheiro import reais_ou_nan
+
+# Valor da operação dentro da linha: primeiro argumento em "com argumentos ('100',)"
+# (entre aspas o texto vai inteiro, mesmo com vírgula: "('1.234,56',)")
+_PADRAO_VALOR = re.compile(rb"com argumentos \(('[^']*'|[^,)]*)")
+
+TAMANHO_BLOCO = 32 * 1024 * 1024  # 32 MB por bloco
+
+
+def dividir_em_blocos(caminho: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Retorna a lista de (inicio, fim) dos blocos, cada um terminando em '\\n'."""
+    tamanho = os.path.getsize(caminho)
+    if tamanho == 0:
+        return []
+    blocos = []
+    with open(caminho, "rb") as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        inicio = 0
+        while inicio < tamanho:
+            fim = min(inicio + tamanho_bloco, tamanho)
+            if fim < tamanho:
+                quebra = mapa.find(b"\n", fim - 1)
+                fim = tamanho if quebra == -1 else quebra + 1
+            blocos.append((inicio, fim))
+            inicio = fim
+    return blocos
+
+
+def _valor_da_linha(linha: bytes) -> float:
+    encontrado = _PADRAO_VALOR.search(linha)
+    if encontrado:
+        return reais_ou_nan(encontrado.group(1).strip(b"'\" ").decode("utf-8", "replace"))
+    return float("nan")
+
+
+def filtrar_linhas(linhas, texto=None, operacao=None, valor_min=None, valor_max=None):
+    """Gera as linhas (bytes) que atendem aos filtros."""
+    texto = texto.encode("utf-8") if texto else None
+    marcador_op = f"Operação {operacao} ".encode("utf-8") if operacao else None
+    filtra_valor = valor_min is not None or valor_max is not None
+
+    for linha in linhas:
+        if texto is not None and texto not in linha:
+            continue
+        if marcador_op is not None and marcador_op not in linha:
+            continue
+        if filtra_valor:
+            valor = _valor_da_linha(linha)
+            if valor_min is not None and not valor >= valor_min:
+                continue
+            if valor_max is not None and not valor <= valor_max:
+                continue
+        yield linha
+
+
+def filtrar_bloco(caminho, inicio, fim, texto=None, operacao=None, valor_min=None, valor_max=None):
+    """Filtra as linhas de um bloco do log e retorna as que atendem aos filtros (bytes)."""
+    with open(caminho, "rb") as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        return list(filtrar_linhas(mapa[inicio:fim].splitlines(), texto, operacao, valor_min, valor_max))
+
+
+def executar_em_ordem(funcao, tarefas, processos=None):
+    """Gera os resultados de funcao(*argumentos) para cada tarefa, em ordem, usando um pool de processos.
+
+    No máximo 2 tarefas por processo ficam em andamento (memória limitada); com
+    uma tarefa só, ela roda no próprio processo.
+    """
+    tarefas = list(tarefas)
+    if len(tarefas) <= 1:
+        for argumentos in tarefas:
+            yield funcao(*argumentos)
+        return
+
+    processos = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        pendentes = deque()
+        proximas = iter(tarefas)
+        for argumentos in proximas:
+            pendentes.append(pool.submit(funcao, *argumentos))
+            if len(pendentes) >= 2 * processos:
+                break
+        while pendentes:
+            resultado = pendentes.popleft().result()  # espera a tarefa mais antiga: preserva a ordem
+            for argumentos in proximas:
+                pendentes.append(pool.submit(funcao, *argumentos))
+                break
+            yield resultado
+
+
+def varrer_log(caminho: str = "log.txt", texto=None, operacao=None, valor_min=None, valor_max=None,
+               processos=None, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Gera, em ordem de arquivo, as linhas do log que atendem aos filtros.
+
+    texto:          trecho que precisa aparecer na linha (busca livre)
+    operacao:       nome da operação (ex: "sacar", "depositor")
+    valor_min/max:  faixa do valor da operação (inclusiva)
+    processos:      tamanho do pool (padrão: todos os núcleos)
+    """
+    filtros = (texto, operacao, valor_min, valor_max)
+    tarefas = [(caminho, inicio, fim, *filtros) for inicio, fim in dividir_em_blocos(caminho, tamanho_bloco)]
+    for linhas in executar_em_ordem(filtrar_bloco, tarefas, processos):
+        for linha in linhas:
+            yield linha.decode("utf-8")
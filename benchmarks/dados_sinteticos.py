@@ -0,0 +1,71 @@
+# ==========================================================
+# GERADORES DETERMINÍSTICOS DE DADOS PARA OS BENCHMARKS
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Mesma semente -> mesmos dados, em qualquer máquina, para que
+#     duas execuções da suíte meçam exatamente o mesmo trabalho.
+#   - Valores monetários como texto ("123.45"), do jeito que o menu recebe.
+#   - Logs sintéticos no mesmo formato de linha do decorator 'log' do
+#     Projeto01, já com o índice lateral (IndiceLog) preenchido.
+# ==========================================================
+
+import random
+
+from banco.indice_log import IndiceLog
+
+# Operações que aparecem no log sintético e seu peso relativo
+_OPERACOES_LOG = ("depositor", "sacar", "depositor", "sacar", "criarconta")
+
+
+def valores(quantidade: int, semente: int = 0, maximo: int = 500):
+    """Lista de valores em reais como texto, entre 0.01 e 'maximo'."""
+    sorteio = random.Random(semente)
+    return [f"{sorteio.randint(0, maximo - 1)}.{sorteio.randint(1, 99):02d}" for _ in range(quantidade)]
+
+
+def usuarios(quantidade: int, semente: int = 0, inicio: int = 0):
+    """Tuplas (nome, cpf, nascimento, endereço) com CPFs únicos a partir de 'inicio'."""
+    sorteio = random.Random(semente)
+    return [
+        (f"Cliente {i}", f"{i:011d}", f"{sorteio.randint(1, 28):02d}/{sorteio.randint(1, 12):02d}/"
+         f"{sorteio.randint(1940, 2005)}", f"Rua {sorteio.randint(1, 9999)} - Centro")
+        for i in range(inicio, inicio + quantidade)
+    ]
+
+
+def contas(quantidade: int, semente: int = 0):
+    """Tuplas (agência, número, titular) únicas."""
+    sorteio = random.Random(semente)
+    return [(10000 + sorteio.randint(0, 9999), i, f"Cliente {i % 1000}") for i in range(quantidade)]
+
+
+def gerar_log(caminho: str, linhas: int, semente: int = 0, inicio_epoch: float = 1_700_000_000.0):
+    """Escreve um log sintético com 'linhas' linhas e monta o índice lateral dele.
+
+    Retorna o IndiceLog já gravado em disco.
+    """
+    sorteio = random.Random(semente)
+    indice = IndiceLog(caminho)
+    indice.reconstruir()  # começa de um índice vazio (o arquivo ainda não existe)
+    offset = 0
+    tempo = inicio_epoch
+    bloco = []
+    with open(caminho, "wb") as arquivo:
+        for _ in range(linhas):
+            operacao = _OPERACOES_LOG[sorteio.randrange(len(_OPERACOES_LOG))]
+            valor = f"{sorteio.randint(1, 999)}.{sorteio.randint(0, 99):02d}"
+            tempo += sorteio.random()
+            horas, resto = divmod(int(tempo) % 86400, 3600)
+            linha = (f"[{horas:02d}:{resto // 60:02d}:{resto % 60:02d}] Operação {operacao}"
+                     f" com argumentos ('{valor}',) {{}}. Retornou o resultado None\n").encode("utf-8")
+            bloco.append(linha)
+            indice.registrar(offset, tempo, operacao, float(valor))
+            offset += len(linha)
+            if len(bloco) >= 65536:
+                arquivo.write(b"".join(bloco))
+                bloco.clear()
+        arquivo.write(b"".join(bloco))
+    indice.descarregar()
+    return indice
@@ -0,0 +1,159 @@
+# ==========================================================
+# ESCALA DO BANCO DIVIDIDO EM SHARDS
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Abre as mesmas contas (espalhadas por várias agências) com 1, 2,
+#     4, ... shards e mede a vazão de depósitos e saques enviados em
+#     lotes pelo RoteadorShards.
+#   - A linha "sem shards" roda as mesmas requisições num BancoServidor
+#     no próprio processo (referência sem custo de pipes).
+#   - Mostra a aceleração e a eficiência em relação a 1 shard; só há
+#     ganho com núcleos livres (a coluna 'núcleos' lembra quantos há).
+#   - Confere no final que o saldo total dos shards é a soma dos
+#     depósitos menos os saques aceitos.
+#
+# Uso (a partir da raiz do repositório):
+#   python -m benchmarks.escala_shards --shards 1 2 4 8 --operacoes 400000
+#   python -m benchmarks.escala_shards --particao agencia --saida escala.json
+# ==========================================================
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+from banco.dinheiro import para_centavos
+from banco.eventos import DestinoNulo, eventos
+
+from SistemBancarioPOO.servidor import BancoServidor
+from SistemBancarioPOO.shards import PARTICOES, RoteadorShards
+
+
+def _abertura(contas: int, agencias: int):
+    """Requisições que cadastram 'contas' clientes, cada um com uma conta numa agência."""
+    clientes = [{"op": "criar_cliente", "cpf": f"{i:011d}", "nome": f"Cliente {i}"} for i in range(contas)]
+    abertura = [{"op": "criar_conta", "cpf": f"{i:011d}", "agencia": f"{i % agencias + 1:04d}"}
+                for i in range(contas)]
+    return clientes, abertura
+
+
+def _movimentos(numeros, operacoes: int, semente: int):
+    """Depósitos (80%) e saques (20%) em contas sorteadas."""
+    sorteio = random.Random(semente)
+    return [{"op": "deposito" if sorteio.random() < 0.8 else "saque",
+             "numero": sorteio.choice(numeros), "valor": sorteio.randint(1, 500)}
+            for _ in range(operacoes)]
+
+
+def _saldo_esperado(movimentos, respostas) -> int:
+    total = 0
+    for requisicao, resposta in zip(movimentos, respostas):
+        if resposta["ok"]:
+            centavos = para_centavos(requisicao["valor"])
+            total += centavos if requisicao["op"] == "deposito" else -centavos
+    return total
+
+
+def _em_lotes(executar_lote, requisicoes, tamanho_lote):
+    respostas = []
+    for inicio in range(0, len(requisicoes), tamanho_lote):
+        respostas.extend(executar_lote(requisicoes[inicio:inicio + tamanho_lote]))
+    return respostas
+
+
+def medir_sem_shards(contas, agencias, operacoes, tamanho_lote, semente=0):
+    """Vazão (ops/s) do BancoServidor no próprio processo, com as mesmas requisições."""
+    banco = BancoServidor()
+    clientes, abertura = _abertura(contas, agencias)
+    for requisicao in clientes:
+        banco.executar(requisicao)
+    numeros = [banco.executar(requisicao)["numero"] for requisicao in abertura]
+    movimentos = _movimentos(numeros, operacoes, semente)
+
+    def executar_lote(lote):
+        return [banco.executar(requisicao) for requisicao in lote]
+
+    inicio = time.perf_counter()
+    _em_lotes(executar_lote, movimentos, tamanho_lote)
+    return operacoes / (time.perf_counter() - inicio)
+
+
+def medir(shards, contas, agencias, operacoes, tamanho_lote, particao="numero", diretorio_dados=None,
+          semente=0):
+    """Vazão (ops/s), contas por shard e se o saldo total confere, com 'shards' processos."""
+    with RoteadorShards(shards, diretorio_dados, particao) as roteador:
+        clientes, abertura = _abertura(contas, agencias)
+        _em_lotes(roteador.executar_lote, clientes, tamanho_lote)
+        numeros = [resposta["numero"] for resposta in _em_lotes(roteador.executar_lote, abertura, tamanho_lote)]
+        movimentos = _movimentos(numeros, operacoes, semente)
+
+        inicio = time.perf_counter()
+        respostas = _em_lotes(roteador.executar_lote, movimentos, tamanho_lote)
+        vazao = operacoes / (time.perf_counter() - inicio)
+
+        confere = roteador.saldo_total() == _saldo_esperado(movimentos, respostas)
+        return vazao, roteador.contas_por_shard(), confere
+
+
+def _executar(opcoes, nucleos):
+    """Imprime a tabela e retorna ({shards: ops/s}, ops/s sem shards, alguma rodada falhou?)."""
+    print(f"núcleos: {nucleos} | contas: {opcoes.contas} em {opcoes.agencias} agências | "
+          f"operações: {opcoes.operacoes} em lotes de {opcoes.lote} | partição: {opcoes.particao}")
+    base = medir_sem_shards(opcoes.contas, opcoes.agencias, opcoes.operacoes, opcoes.lote)
+    print(f"{'shards':>8} {'ops/s':>12} {'aceleração':>11} {'eficiência':>11}  saldo  contas por shard")
+    print(f"{'sem':>8} {base:>12.0f} {'-':>11} {'-':>11}", flush=True)
+
+    curva = {}
+    falhou = False
+    for shards in opcoes.shards:
+        vazao, distribuicao, confere = medir(shards, opcoes.contas, opcoes.agencias, opcoes.operacoes,
+                                             opcoes.lote, opcoes.particao,
+                                             f"dados_{shards}" if opcoes.wal else None)
+        curva[shards] = vazao
+        falhou = falhou or not confere
+        menor = min(curva)
+        aceleracao = vazao / curva[menor] * menor  # em relação ao menor número de shards medido
+        print(f"{shards:>8} {vazao:>12.0f} {aceleracao:>10.2f}x {aceleracao / shards:>10.0%}  "
+              f"{'OK' if confere else 'ERRO'}   {distribuicao}", flush=True)
+    return curva, base, falhou
+
+
+def main(argumentos=None):
+    nucleos = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Vazão do banco dividido em shards (processos).")
+    parser.add_argument("--shards", type=int, nargs="+", default=sorted({1, 2, 4, nucleos}))
+    parser.add_argument("--contas", type=int, default=20_000)
+    parser.add_argument("--agencias", type=int, default=64)
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    parser.add_argument("--lote", type=int, default=5_000, help="requisições por lote enviado aos shards")
+    parser.add_argument("--particao", choices=PARTICOES, default="numero")
+    parser.add_argument("--wal", action="store_true", help="cada shard grava WAL num diretório temporário")
+    parser.add_argument("--saida", help="arquivo JSON onde salvar a curva")
+    opcoes = parser.parse_args(argumentos)
+
+    eventos.usar(DestinoNulo())
+    raiz = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="escala_shards_") as temporario:
+        os.chdir(temporario)  # marca d'água do alocador e WAL dos shards ficam no temporário
+        try:
+            curva, base, falhou = _executar(opcoes, nucleos)
+        finally:
+            os.chdir(raiz)
+
+    if opcoes.saida:
+        with open(opcoes.saida, "w", encoding="utf-8") as arquivo:
+            json.dump({"python": platform.python_version(), "processadores": nucleos,
+                       "particao": opcoes.particao, "sem_shards": base,
+                       "ops_por_segundo": {str(shards): vazao for shards, vazao in curva.items()}},
+                      arquivo, indent=2)
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# ==========================================================
+# TESTE DE ESTRESSE: OPERAÇÕES CONCORRENTES EM CONTAS
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Várias threads fazem depósitos e saques de R$1,00 em contas
+#     sorteadas ao mesmo tempo.
+#   - No final confere se o saldo de cada conta é exatamente
+#     (depósitos - saques aceitos); qualquer atualização perdida
+#     ou saque a descoberto faz o teste falhar.
+#   - Repete com quantidades crescentes de contas para mostrar a
+#     vazão e a queda das disputas de trava (travas por conta).
+#
+# Uso (a partir da raiz do repositório):
+#   python -m benchmarks.estresse_concorrencia --threads 8 --contas 1 8 64
+# ==========================================================
+
+import argparse
+import contextlib
+import os
+import random
+import sys
+import threading
+import time
+
+from SistemBancarioPOO.modelos.Conta import ContaConrente, PessoaFisica
+
+
+def executar(numero_contas: int, numero_threads: int, operacoes: int, semente: int = 0):
+    """Roda uma rodada de estresse e retorna (vazão em ops/s, disputas, saldos corretos?)."""
+    cliente = PessoaFisica("Estresse", "00000000000", "01/01/2000", "Rua do Teste")
+    # limite de saques alto o bastante para nenhum saque ser recusado pela janela
+    contas = [ContaConrente(cliente, numero, LIMITE_SAQUE=numero_threads * operacoes)
+              for numero in range(numero_contas)]
+    esperados = [[0] * numero_contas for _ in range(numero_threads)]  # saldo esperado por thread/conta
+    largada = threading.Barrier(numero_threads + 1)
+
+    def trabalhar(indice):
+        sorteio = random.Random(semente + indice)
+        meus = esperados[indice]
+        largada.wait()
+        for _ in range(operacoes):
+            posicao = sorteio.randrange(numero_contas)
+            if sorteio.random() < 0.5:
+                if contas[posicao].deposito(1.0):
+                    meus[posicao] += 1
+            elif contas[posicao].sacar(1.0):
+                meus[posicao] -= 1
+
+    threads = [threading.Thread(target=trabalhar, args=(i,)) for i in range(numero_threads)]
+    with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+        for thread in threads:
+            thread.start()
+        largada.wait()
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        duracao = time.perf_counter() - inicio
+
+    corretos = all(
+        conta.saldo == sum(esperados[t][posicao] for t in range(numero_threads)) and conta.saldo >= 0
+        for posicao, conta in enumerate(contas)
+    )
+    disputas = sum(conta.estatisticas_trava()["disputas"] for conta in contas)
+    return numero_threads * operacoes / duracao, disputas, corretos
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Estresse de operações concorrentes em contas.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operacoes", type=int, default=20000, help="operações por thread")
+    parser.add_argument("--contas", type=int, nargs="+", default=[1, 8, 64, 512])
+    opcoes = parser.parse_args(argumentos)
+
+    sys.setswitchinterval(1e-5)  # troca de thread frequente para provocar corridas
+    falhou = False
+    print(f"{'contas':>8} {'ops/s':>12} {'disputas':>10}  saldos")
+    for numero_contas in opcoes.contas:
+        vazao, disputas, corretos = executar(numero_contas, opcoes.threads, opcoes.operacoes)
+        falhou = falhou or not corretos
+        print(f"{numero_contas:>8} {vazao:>12.0f} {disputas:>10}  {'OK' if corretos else 'INCORRETOS'}")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# ==========================================================
+# TESTE DE ESTRESSE: TRANSFERÊNCIAS CONCORRENTES ENTRE CONTAS
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Várias threads transferem valores sorteados entre pares de
+#     contas sorteados (nos dois sentidos, o caso clássico de deadlock
+#     quando cada thread trava primeiro a sua origem).
+#   - Com --lote N, cada thread manda as transferências em lotes de N
+#     pelo transferir_lote (uma aquisição de trava por conta por lote).
+#   - No final confere:
+#       o dinheiro total não mudou (soma dos saldos e saldo agregado);
+#       nenhum saldo ficou negativo;
+#       cada conta: saldo = depósito inicial + recebidas - enviadas;
+#       cada transferência aparece uma vez como enviada e uma vez como
+#       recebida, com o mesmo identificador e o mesmo valor.
+#   - Uma thread que não termina dentro do prazo é contada como deadlock.
+#
+# Uso (a partir da raiz do repositório):
+#   python -m benchmarks.estresse_transferencias --threads 8 --contas 2 16 256
+#   python -m benchmarks.estresse_transferencias --lote 100
+# ==========================================================
+
+import argparse
+import itertools
+import random
+import sys
+import threading
+import time
+
+from banco.eventos import DestinoNulo, eventos
+
+from SistemBancarioPOO.modelos.Conta import (
+    OPERACAO_TRANSFERENCIA_ENVIADA,
+    OPERACAO_TRANSFERENCIA_RECEBIDA,
+    RESULTADO_OK,
+    ContaConrente,
+    PessoaFisica,
+    agregados_saldo,
+    transferir_lote,
+)
+
+SALDO_INICIAL = 1_000_00  # centavos por conta
+
+_rodadas = itertools.count()  # cada rodada usa um CPF próprio (os saldos agregados são por CPF)
+
+
+def _conferir(cliente, contas) -> list:
+    """Lista os problemas encontrados nas contas (todas do 'cliente') depois do estresse (vazia = tudo certo)."""
+    problemas = []
+    total = sum(conta.saldo_centavos for conta in contas)
+    if total != SALDO_INICIAL * len(contas):
+        problemas.append(f"dinheiro total mudou: {total} != {SALDO_INICIAL * len(contas)}")
+    if cliente.saldo_total_centavos != total:
+        problemas.append(f"saldo agregado do cliente ({cliente.saldo_total_centavos}) != {total}")
+
+    enviadas, recebidas = {}, {}
+    for conta in contas:
+        historico = conta.historico
+        if conta.saldo_centavos < 0:
+            problemas.append(f"conta {conta.numero} negativa")
+        esperado = (historico.total("Deposito") + historico.total(OPERACAO_TRANSFERENCIA_RECEBIDA)
+                    - historico.total(OPERACAO_TRANSFERENCIA_ENVIADA))
+        if esperado != conta.saldo_centavos:
+            problemas.append(f"conta {conta.numero}: histórico soma {esperado}, saldo {conta.saldo_centavos}")
+        for registro in historico.listar_transacao():
+            if "TRANSFERENCIA" in registro:
+                lado = enviadas if registro["Operaçao"] == OPERACAO_TRANSFERENCIA_ENVIADA else recebidas
+                lado[registro["TRANSFERENCIA"]] = registro["VALOR"]
+    if enviadas != recebidas:
+        problemas.append(f"entradas sem par: {len(enviadas.keys() ^ recebidas.keys())}")
+    return problemas
+
+
+def executar(numero_contas: int, numero_threads: int, operacoes: int, lote: int = 1, semente: int = 0,
+             prazo: float = 120.0):
+    """Roda uma rodada e retorna (transferências/s, aceitas, disputas, problemas)."""
+    cliente = PessoaFisica("Estresse", f"{next(_rodadas):011d}", "01/01/2000", "Rua do Teste")
+    contas = [ContaConrente(cliente, numero) for numero in range(numero_contas)]
+    for conta in contas:
+        conta.aplicar_lote([("deposito", SALDO_INICIAL / 100)])
+    aceitas = [0] * numero_threads
+    largada = threading.Barrier(numero_threads + 1)
+
+    def trabalhar(indice):
+        sorteio = random.Random(semente + indice)
+        pares = []
+        for _ in range(operacoes):
+            origem, destino = sorteio.sample(contas, 2)
+            pares.append((origem, destino, sorteio.randint(1, 30_000) / 100))
+        largada.wait()
+        if lote <= 1:
+            for origem, destino, valor in pares:
+                if origem.transferir(destino, valor):
+                    aceitas[indice] += 1
+        else:
+            for inicio in range(0, operacoes, lote):
+                resultados = transferir_lote(pares[inicio:inicio + lote])
+                aceitas[indice] += resultados.count(RESULTADO_OK)
+
+    threads = [threading.Thread(target=trabalhar, args=(i,), daemon=True) for i in range(numero_threads)]
+    for thread in threads:
+        thread.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    limite = time.monotonic() + prazo
+    for thread in threads:
+        thread.join(max(0.0, limite - time.monotonic()))
+    duracao = time.perf_counter() - inicio
+
+    presas = sum(thread.is_alive() for thread in threads)
+    if presas:
+        return 0.0, sum(aceitas), 0, [f"{presas} threads não terminaram em {prazo:.0f}s (deadlock?)"]
+    disputas = sum(conta.estatisticas_trava()["disputas"] for conta in contas)
+    return numero_threads * operacoes / duracao, sum(aceitas), disputas, _conferir(cliente, contas)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Estresse de transferências concorrentes entre contas.")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operacoes", type=int, default=20000, help="transferências por thread")
+    parser.add_argument("--contas", type=int, nargs="+", default=[2, 16, 256])
+    parser.add_argument("--lote", type=int, default=1, help="transferências por chamada de transferir_lote")
+    parser.add_argument("--prazo", type=float, default=120.0, help="segundos até considerar deadlock")
+    opcoes = parser.parse_args(argumentos)
+
+    eventos.usar(DestinoNulo())
+    sys.setswitchinterval(1e-5)  # troca de thread frequente para provocar corridas
+    falhou = False
+    print(f"{'contas':>8} {'transf/s':>12} {'aceitas':>10} {'disputas':>10}  resultado")
+    for numero_contas in opcoes.contas:
+        vazao, aceitas, disputas, problemas = executar(numero_contas, opcoes.threads, opcoes.operacoes,
+                                                       opcoes.lote, prazo=opcoes.prazo)
+        falhou = falhou or bool(problemas)
+        print(f"{numero_contas:>8} {vazao:>12.0f} {aceitas:>10} {disputas:>10}  "
+              f"{'FALHOU' if problemas else 'OK'}")
+        for problema in problemas:
+            print(f"{'':>10}- {problema}")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+# ==========================================================
+# MICROBENCHMARKS DOS CAMINHOS QUENTES DO BANCO
+# ==========================================================
+
+# ----------------------------------------------------------
+# Descrição:
+#   - Mede o custo por operação (ns/op) de:
+#       depositor/sacar do Projeto01, com e sem o decorator 'log';
+#       criarusuario com o registro já contendo 10^3, 10^4 e 10^5 clientes;
+#       conta_iterador; gerador_relatorio sobre logs sintéticos
+#       (consulta pelo índice e busca por texto livre);
+#       Conta.deposito/Conta.sacar; Historico.adicionar_transacao/__str__;
+#       páginas de TabelaContas e Historico (custo por página, que não
+#       deve crescer com o tamanho da coleção).
+#   - Dados determinísticos (benchmarks/dados_sinteticos.py); cada
+#     medida é a melhor de N repetições.
+#   - A saída das funções (print) vai para o devnull, e os arquivos
+#     (log.txt, índice) são criados num diretório temporário.
+#   - Resultados em JSON; com --comparar, cada medida é confrontada com
+#     uma linha de base e as regressões acima da tolerância são listadas
+#     (código de saída 1).
+#
+# Uso (a partir da raiz do repositório):
+#   python -m benchmarks.microbenchmarks --saida base.json
+#   python -m benchmarks.microbenchmarks --comparar base.json --tolerancia 0.15
+#   python -m benchmarks.microbenchmarks --filtro gerador --linhas-log 100000 1000000
+# ==========================================================
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from benchmarks import dados_sinteticos
+
+# Benchmarks registrados: nome -> (função, tamanhos)
+# Cada função recebe o tamanho e retorna (operações, segundos) só do trecho medido.
+BENCHMARKS = {}
+
+
+def benchmark(nome: str, tamanhos):
+    """Registra a função como benchmark, rodado uma vez para cada tamanho."""
+    def registrar(funcao):
+        BENCHMARKS[nome] = (funcao, tuple(tamanhos))
+        return funcao
+    return registrar
+
+
+def _projeto():
+    """Importa o Projeto01 (sem efeitos colaterais) e zera o estado global dele."""
+    import Projeto01
+    from banco.extrato_conta import Extrato
+    from banco.registro_clientes import RegistroClientes
+    from banco.tabela_contas import TabelaContas
+
+    Projeto01.saldo = 0
+    Projeto01.numero_saques = 0
+    Projeto01.limitador_saques.restaurar_estado(Projeto01.posicao_saques, 0.0)
+    Projeto01.extrato = Extrato()
+    Projeto01.usuarios = RegistroClientes()
+    Projeto01.contalista = TabelaContas()
+    return Projeto01
+
+
+def _medir(funcao, argumentos):
+    """Executa 'funcao' para cada argumento e retorna (operações, segundos)."""
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcao(argumento)
+    return len(argumentos), time.perf_counter() - inicio
+
+
+# ================================
+# Projeto01 (funções do menu)
+# ================================
+@benchmark("depositor_com_log", (20_000,))
+def _depositor_com_log(quantidade):
+    projeto = _projeto()
+    resultado = _medir(projeto.depositor, dados_sinteticos.valores(quantidade, semente=1))
+    projeto.escritor_log.descarregar()
+    return resultado
+
+
+@benchmark("depositor_sem_log", (20_000,))
+def _depositor_sem_log(quantidade):
+    projeto = _projeto()
+    return _medir(projeto.depositor.__wrapped__, dados_sinteticos.valores(quantidade, semente=1))
+
+
+def _preparar_saques(projeto, quantidade):
+    projeto.saldo = 10 ** 15  # saldo e limite de saques folgados: mede o caminho do saque aceito
+    projeto.LIMITE_SAQUES = quantidade + 1
+    return dados_sinteticos.valores(quantidade, semente=2, maximo=499)
+
+
+@benchmark("sacar_com_log", (20_000,))
+def _sacar_com_log(quantidade):
+    projeto = _projeto()
+    resultado = _medir(projeto.sacar, _preparar_saques(projeto, quantidade))
+    projeto.escritor_log.descarregar()
+    return resultado
+
+
+@benchmark("sacar_sem_log", (20_000,))
+def _sacar_sem_log(quantidade):
+    projeto = _projeto()
+    return _medir(projeto.sacar.__wrapped__, _preparar_saques(projeto, quantidade))
+
+
+@benchmark("criarusuario", (1_000, 10_000, 100_000))
+def _criarusuario(cadastrados):
+    projeto = _projeto()
+    projeto.usuarios.restaurar(dados_sinteticos.usuarios(cadastrados, semente=3))
+    novos = dados_sinteticos.usuarios(2_000, semente=4, inicio=cadastrados)
+    return _medir(lambda campos: projeto.criarusuario(*campos), novos)
+
+
+@benchmark("conta_iterador", (1_000, 10_000, 100_000))
+def _conta_iterador(quantidade):
+    projeto = _projeto()
+    for agencia, numero, titular in dados_sinteticos.contas(quantidade, semente=5):
+        projeto.contalista.adicionar(agencia, numero, titular)
+    inicio = time.perf_counter()
+    projeto.conta_iterador(projeto.contalista)
+    return quantidade, time.perf_counter() - inicio
+
+
+@benchmark("TabelaContas.pagina_numero", (10_000, 100_000))
+def _tabela_pagina(quantidade):
+    projeto = _projeto()
+    for agencia, numero, titular in dados_sinteticos.contas(quantidade, semente=5):
+        projeto.contalista.adicionar(agencia, numero, titular)
+    ultima = projeto.contalista.total_paginas(20)
+    paginas = [1 + (indice * 7919) % ultima for indice in range(1_000)]  # páginas espalhadas pela tabela
+    return _medir(lambda pagina: projeto.contalista.pagina_numero(pagina, 20), paginas)
+
+
+def _relatorio(linhas, **filtros):
+    """Gera um log sintético num diretório próprio e mede um relatório (custo por linha do log)."""
+    import Projeto01
+
+    from banco.indice_log import IndiceLog
+
+    anterior = os.getcwd()
+    diretorio = os.path.join(anterior, f"relatorio_{linhas}")
+    os.makedirs(diretorio, exist_ok=True)
+    os.chdir(diretorio)  # gerador_relatorio lê sempre 'log.txt' do diretório atual
+    try:
+        if not os.path.exists("log.txt"):
+            dados_sinteticos.gerar_log("log.txt", linhas, semente=6)
+        Projeto01.indice_log = IndiceLog("log.txt")
+        Projeto01.indice_log.operacoes()  # carga do índice fora da medida (acontece uma vez por processo)
+        inicio = time.perf_counter()
+        Projeto01.gerador_relatorio(**filtros)
+        return linhas, time.perf_counter() - inicio
+    finally:
+        os.chdir(anterior)
+
+
+# Tamanhos dos logs sintéticos (trocados por --linhas-log; 10^8 linhas ocupam ~10 GB)
+TAMANHOS_LOG = [100_000]
+
+
+@benchmark("gerador_relatorio_indice", TAMANHOS_LOG)
+def _gerador_relatorio_indice(linhas):
+    return _relatorio(linhas, tipo="sacar", valor_min=100.0, valor_max=110.0)
+
+
+@benchmark("gerador_relatorio_texto", TAMANHOS_LOG)
+def _gerador_relatorio_texto(linhas):
+    return _relatorio(linhas, texto="criarconta")
+
+
+# ================================
+# SistemBancarioPOO (classes)
+# ================================
+def _conta():
+    from SistemBancarioPOO.modelos.Conta import ContaConrente, PessoaFisica
+
+    cliente = PessoaFisica("Benchmark", "00000000000", "01/01/2000", "Rua do Teste")
+    return ContaConrente(cliente, 1)
+
+
+@benchmark("Conta.deposito", (50_000,))
+def _conta_deposito(quantidade):
+    return _medir(_conta().deposito, dados_sinteticos.valores(quantidade, semente=7))
+
+
+@benchmark("Conta.sacar", (50_000,))
+def _conta_sacar(quantidade):
+    conta = _conta()
+    conta.saldo = 10 ** 13  # pelo setter, para os saldos agregados acompanharem
+    conta.limite, conta.LIMITE_SAQUE = 10 ** 11, quantidade + 1  # mede saques aceitos, não recusas
+    return _medir(conta.sacar, dados_sinteticos.valores(quantidade, semente=8))
+
+
+@benchmark("Historico.adicionar_transacao", (100_000,))
+def _historico_adicionar(quantidade):
+    from SistemBancarioPOO.modelos.Conta import Deposito, Historico
+
+    historico = Historico()
+    transacoes = [Deposito(valor) for valor in dados_sinteticos.valores(quantidade, semente=9)]
+    return _medir(historico.adicionar_transacao, transacoes)
+
+
+@benchmark("Historico.pagina", (10_000, 100_000))
+def _historico_pagina(quantidade):
+    from SistemBancarioPOO.modelos.Conta import Deposito, Historico
+
+    historico = Historico()
+    for valor in dados_sinteticos.valores(quantidade, semente=11):
+        historico.adicionar_transacao(Deposito(valor))
+    # segue os tokens até o fim: cada página custa O(log n + tamanho), não O(posição)
+    tokens, token = [], None
+    while True:
+        tokens.append(token)
+        token = historico.pagina(50, token).proximo
+        if token is None:
+            break
+    return _medir(lambda token: historico.pagina(50, token), tokens)
+
+
+@benchmark("Historico.__str__", (10_000,))
+def _historico_str(quantidade):
+    from SistemBancarioPOO.modelos.Conta import Deposito, Historico
+
+    historico = Historico()
+    for valor in dados_sinteticos.valores(quantidade, semente=10):
+        historico.adicionar_transacao(Deposito(valor))
+    inicio = time.perf_counter()
+    str(historico)
+    return quantidade, time.perf_counter() - inicio
+
+
+# ================================
+# Execução e comparação
+# ================================
+def executar(filtro=None, repeticoes: int = 3):
+    """Roda os benchmarks (os que contêm 'filtro' no nome) e retorna {nome[tamanho]: ns/op}."""
+    resultados = {}
+    with open(os.devnull, "w") as nulo:
+        for nome, (funcao, tamanhos) in BENCHMARKS.items():
+            if filtro and filtro not in nome:
+                continue
+            for tamanho in tamanhos:
+                melhor = None
+                for _ in range(repeticoes):
+                    with contextlib.redirect_stdout(nulo):
+                        operacoes, segundos = funcao(tamanho)
+                    custo = segundos * 1e9 / operacoes
+                    melhor = custo if melhor is None else min(melhor, custo)
+                chave = f"{nome}[{tamanho}]"
+                resultados[chave] = melhor
+                print(f"{chave:<45} {melhor:>14.1f} ns/op", flush=True)
+    return resultados
+
+
+def comparar(atuais: dict, base: dict, tolerancia: float):
+    """Lista (nome, ns base, ns atual, variação) das medidas mais lentas que a base além da tolerância."""
+    regressoes = []
+    for nome, atual in atuais.items():
+        anterior = base.get(nome)
+        if anterior:
+            variacao = atual / anterior - 1
+            if variacao > tolerancia:
+                regressoes.append((nome, anterior, atual, variacao))
+    return regressoes
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks dos caminhos quentes do banco.")
+    parser.add_argument("--saida", help="arquivo JSON onde salvar os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior usado como linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="piora aceita (0.10 = 10%%)")
+    parser.add_argument("--filtro", help="roda só os benchmarks cujo nome contém este texto")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--linhas-log", type=int, nargs="+", help="tamanhos dos logs sintéticos")
+    opcoes = parser.parse_args(argumentos)
+
+    if opcoes.linhas_log:
+        TAMANHOS_LOG[:] = opcoes.linhas_log
+        for nome in ("gerador_relatorio_indice", "gerador_relatorio_texto"):
+            BENCHMARKS[nome] = (BENCHMARKS[nome][0], tuple(TAMANHOS_LOG))
+
+    sys.path.insert(0, os.getcwd())  # Projeto01 fica na raiz do repositório
+    raiz = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="benchmarks_") as temporario:
+        os.chdir(temporario)  # log.txt, índice e marca d'água do alocador ficam no temporário
+        try:
+            resultados = executar(opcoes.filtro, opcoes.repeticoes)
+        finally:
+            os.chdir(raiz)
+
+    documento = {
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "maquina": platform.machine(),
+        "processadores": os.cpu_count(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "ns_por_operacao": resultados,
+    }
+    if opcoes.saida:
+        with open(opcoes.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(documento, arquivo, indent=2)
+
+    if opcoes.comparar:
+        with open(opcoes.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)["ns_por_operacao"]
+        regressoes = comparar(resultados, base, opcoes.tolerancia)
+        if regressoes:
+            print(f"\nREGRESSÕES (acima de {opcoes.tolerancia:.0%}):")
+            for nome, anterior, atual, variacao in regressoes:
+                print(f"  {nome:<43} {anterior:>12.1f} -> {atual:>12.1f} ns/op ({variacao:+.0%})")
+            return 1
+        print(f"\nSem regressões acima de {opcoes.tolerancia:.0%} em relação a {opcoes.comparar}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
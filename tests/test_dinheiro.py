@@ -0,0 +1,30 @@
+from decimal import Decimal
+
+import pytest
+
+from banco.dinheiro import CENTAVOS_MAXIMO, para_centavos
+
+
+def test_converte_valores_comuns():
+    assert para_centavos(10) == 1000
+    assert para_centavos(0.1) == 10
+    assert para_centavos("12,34") == 1234
+    assert para_centavos(Decimal("-5.5")) == -550
+
+
+def test_aceita_os_limites_do_int64():
+    maximo = Decimal(CENTAVOS_MAXIMO) / 100
+    assert para_centavos(maximo) == CENTAVOS_MAXIMO
+    assert para_centavos(-maximo) == -CENTAVOS_MAXIMO
+
+
+@pytest.mark.parametrize("valor", [
+    CENTAVOS_MAXIMO // 100 + 1,
+    -(CENTAVOS_MAXIMO // 100 + 1),
+    1e300,
+    str(10 ** 30),
+    Decimal(CENTAVOS_MAXIMO + 1) / 100,
+])
+def test_recusa_valores_fora_do_int64(valor):
+    with pytest.raises(ValueError):
+        para_centavos(valor)
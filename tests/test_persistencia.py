@@ -0,0 +1,108 @@
+import os
+
+from banco.persistencia import Armazenamento, DiarioWAL
+
+
+class Estado:
+    """Estado mínimo para o Armazenamento: uma lista de valores."""
+
+    def __init__(self):
+        self.valores = []
+
+    def capturar(self):
+        return list(self.valores)
+
+    def restaurar(self, estado):
+        self.valores = list(estado)
+
+    def aplicar(self, registro):
+        if registro == "invalido":
+            raise ValueError("registro que não se aplica")
+        self.valores.append(registro)
+
+
+def abrir(diretorio, estado=None):
+    estado = estado or Estado()
+    armazenamento = Armazenamento(str(diretorio), estado.capturar, estado.restaurar, estado.aplicar,
+                                  registros_por_snapshot=1000, fsync=False)
+    armazenamento.recuperar()
+    return armazenamento, estado
+
+
+def efetivar(armazenamento, estado, registro):
+    armazenamento.registrar(registro)
+    estado.aplicar(registro)
+
+
+def test_recupera_ate_o_registro_cortado_e_continua_depois_dele(tmp_path):
+    armazenamento, estado = abrir(tmp_path)
+    for valor in range(5):
+        efetivar(armazenamento, estado, valor)
+    armazenamento.fechar(com_snapshot=False)
+
+    # queda no meio da gravação do último registro
+    (_, caminho), = armazenamento.wal.segmentos()
+    os.truncate(caminho, os.path.getsize(caminho) - 3)
+
+    armazenamento, estado = abrir(tmp_path)
+    assert estado.valores == [0, 1, 2, 3]
+    efetivar(armazenamento, estado, 10)
+    armazenamento.fechar(com_snapshot=False)
+
+    # o registro novo não ficou preso atrás do lixo do segmento antigo
+    armazenamento, estado = abrir(tmp_path)
+    assert estado.valores == [0, 1, 2, 3, 10]
+    armazenamento.fechar(com_snapshot=False)
+
+
+def test_segmento_sem_registro_valido_e_descartado(tmp_path):
+    armazenamento, estado = abrir(tmp_path)
+    efetivar(armazenamento, estado, 1)
+    armazenamento.fechar(com_snapshot=False)
+    (_, caminho), = armazenamento.wal.segmentos()
+    os.truncate(caminho, 5)
+
+    armazenamento, estado = abrir(tmp_path)
+    assert estado.valores == []
+    assert os.path.exists(caminho + ".descartado")
+    armazenamento.fechar(com_snapshot=False)
+
+
+def test_reaplica_so_o_wal_posterior_ao_snapshot(tmp_path):
+    armazenamento, estado = abrir(tmp_path)
+    for valor in range(3):
+        efetivar(armazenamento, estado, valor)
+    armazenamento.snapshot(em_fundo=False)
+    for valor in range(3, 5):
+        efetivar(armazenamento, estado, valor)
+    armazenamento.fechar(com_snapshot=False)
+
+    novo = Estado()
+    armazenamento = Armazenamento(str(tmp_path), novo.capturar, novo.restaurar, novo.aplicar, fsync=False)
+    assert armazenamento.recuperar() == 2
+    assert novo.valores == [0, 1, 2, 3, 4]
+    armazenamento.fechar(com_snapshot=False)
+
+
+def test_registro_que_nao_se_aplica_e_ignorado_na_recuperacao(tmp_path):
+    armazenamento, estado = abrir(tmp_path)
+    efetivar(armazenamento, estado, 1)
+    armazenamento.registrar("invalido")  # gravado, mas falharia ao aplicar
+    efetivar(armazenamento, estado, 2)
+    armazenamento.fechar(com_snapshot=False)
+
+    armazenamento, estado = abrir(tmp_path)
+    assert estado.valores == [1, 2]
+    assert armazenamento.ignorados == 1
+    armazenamento.fechar(com_snapshot=False)
+
+
+def test_ler_segmento_para_no_registro_incompleto(tmp_path):
+    armazenamento, estado = abrir(tmp_path)
+    for valor in range(3):
+        efetivar(armazenamento, estado, valor)
+    armazenamento.fechar(com_snapshot=False)
+    (_, caminho), = armazenamento.wal.segmentos()
+    os.truncate(caminho, os.path.getsize(caminho) - 1)
+
+    assert [registro for _, registro in DiarioWAL.ler_segmento(caminho)] == [0, 1]
@@ -0,0 +1,35 @@
+import pytest
+
+from banco.dinheiro import CENTAVOS_MAXIMO
+from banco.eventos import DestinoNulo, eventos
+from SistemBancarioPOO.servidor import BancoServidor
+
+
+@pytest.fixture(autouse=True)
+def sem_eventos():
+    with eventos.redirecionar(DestinoNulo()):
+        yield
+
+
+def abrir_conta(banco, cpf):
+    banco.executar({"op": "criar_cliente", "cpf": cpf, "nome": "Ana",
+                    "data_nascimento": "01-01-2000", "endereco": "Rua A"})
+    return banco.executar({"op": "criar_conta", "cpf": cpf})["numero"]
+
+
+@pytest.mark.parametrize("valor", [CENTAVOS_MAXIMO, 1e300, "1" + "0" * 30])
+def test_valor_fora_do_intervalo_e_recusado_antes_do_wal(tmp_path, valor):
+    banco = BancoServidor(str(tmp_path))
+    numero = abrir_conta(banco, "1")
+    assert banco.executar({"op": "deposito", "numero": numero, "valor": 10})["ok"]
+    lsn = banco.armazenamento.wal.ultimo_lsn
+
+    resposta = banco.executar({"op": "deposito", "numero": numero, "valor": valor})
+    assert not resposta["ok"]
+    assert banco.armazenamento.wal.ultimo_lsn == lsn  # nada foi gravado
+    banco.fechar()
+
+    banco = BancoServidor(str(tmp_path))
+    assert banco.armazenamento.ignorados == 0
+    assert banco.contas[numero].saldo_centavos == 1000
+    banco.fechar()